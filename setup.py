@@ -63,10 +63,11 @@ setuptools.setup(
         'httpx>=0.28.1',
         'requests>=2.32.3',
         'niquests>=3.14.0',
+        'aiohttp>=3.9.0',
+        'yarl>=1.9.0',
         'exejs>=0.0.7',
         'lxml>=5.4.0',
         'tqdm>=4.67.1',
-        'pathos>=0.3.4',
         'cloudscraper>=1.2.71',
         'cryptography>=42.0.4',
     ],
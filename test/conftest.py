@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Set before `translators` is imported: no region lookup over the network, and no writes to ~/.cache.
+os.environ.setdefault('translators_default_region', 'EN')
+os.environ.setdefault('translators_cache_dir', tempfile.mkdtemp(prefix='translators-test-'))
+
+collect_ignore = ['test_async.py']  # calls live translators at import, run it by hand.
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from translators import base, cache
+from translators.providers.alibaba import AlibabaV2
+from translators.providers.lingvanex import LingvanexV1
+from translators.providers.mirai import Mirai
+
+
+def test_session_ready_needs_provider_secrets():
+    translator = AlibabaV2()
+    translator.session, translator.language_map = object(), {'en': ['zh']}
+    translator.begin_time, translator.query_count = time.time(), 1
+    assert not translator.is_session_ready()
+
+    translator.csrf_token = 'token'
+    assert translator.is_session_ready()
+
+    translator.async_session = object()
+    assert translator.is_async_session_ready()
+
+
+def test_session_ready_follows_api_kwargs():
+    translator = LingvanexV1()
+    translator.session, translator.language_map = object(), {'en': ['zh']}
+    translator.begin_time, translator.query_count = time.time(), 1
+    translator.auth_info, translator.mode = {'token': 'token'}, 'B2C'
+    assert translator.is_session_ready()
+    assert not translator.is_session_ready(lingvanex_mode='B2B')
+
+
+class FakeResponse:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code, self.text, self.headers = status_code, text, headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses, self.requests = list(responses), []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+def test_resource_text_is_revalidated(tmp_path, monkeypatch):
+    resource_cache = cache.ResourceCache()
+    resource_cache.configure(cache_dir=str(tmp_path))
+    monkeypatch.setattr(base, 'resource_cache', resource_cache)
+    session = FakeSession([FakeResponse(200, '<html>', {'ETag': '"v1"'}), FakeResponse(304)])
+    translator = AlibabaV2()
+    assert translator.get_resource_text(session, 'https://example.com/', {}, None) == '<html>'
+    assert translator.get_resource_text(session, 'https://example.com/', {}, None) == '<html>'
+    assert session.requests[1] == {'If-None-Match': '"v1"'}
+
+    session = FakeSession([FakeResponse(200, 'bundle', {'ETag': '"v1"'})])
+    assert translator.get_resource_text(session, 'https://example.com/app.3f2a9c1b.js', {}, None) == 'bundle'
+    assert translator.get_resource_text(session, 'https://example.com/app.3f2a9c1b.js', {}, None) == 'bundle'
+    assert len(session.requests) == 1
+    assert resource_cache.info()['hits'] == 1
+    assert resource_cache.info()['revalidations'] == 1
+
+
+def test_uncertified_apis_keep_their_wrapper(monkeypatch):
+    translator = Mirai()
+
+    def renew_session(*args, **kwargs):
+        raise ValueError('offline')
+
+    monkeypatch.setattr(translator, 'renew_session', renew_session)
+    with pytest.raises(base.TranslatorError, match='has been not certified'):
+        translator.mirai_api('hello', if_print_warning=False)
@@ -0,0 +1,390 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from translators import cache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1e9):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(cache, 'time', fake_clock)
+    return fake_clock
+
+
+def test_cache_key_normalizes_languages_and_text():
+    key = cache.get_cache_key('bing', ' hello ', 'auto-detect', 'zh-CN')
+    assert key[:3] == ('bing', 'auto', 'zh')
+    assert key == cache.get_cache_key('bing', 'hello', 'auto', 'zh')
+    assert key != cache.get_cache_key('bing', 'hello', 'auto', 'zh', professional_field='medicine')
+
+
+def test_translation_memory_round_trip(tmp_path):
+    memory = cache.TranslationMemory(db_path=str(tmp_path / 'tm.sqlite3'))
+    key = cache.get_cache_key('bing', 'hello', 'en', 'zh')
+    assert memory.get(key) is None
+    memory.set(key, '你好')
+    memory.set(cache.get_cache_key('bing', 'bye', 'en', 'zh'), {'not': 'a string'})
+
+    reopened = cache.TranslationMemory(db_path=memory.db_path)
+    assert reopened.get(key) == '你好'
+    assert reopened.info()['size'] == 1
+    assert (memory.info()['hits'], memory.info()['misses']) == (0, 1)
+
+
+def test_translation_memory_ttl_and_max_size(tmp_path, clock):
+    memory = cache.TranslationMemory(db_path=str(tmp_path / 'tm.sqlite3'), ttl_seconds=10, max_size=2)
+    memory.prune_interval = 1
+    keys = [cache.get_cache_key('bing', f'text {i}', 'en', 'zh') for i in range(3)]
+    for i, key in enumerate(keys):
+        clock.now += 1
+        memory.set(key, f'result {i}')
+
+    assert memory.get(keys[0]) is None  # the oldest one is evicted beyond max_size.
+    assert memory.get(keys[2]) == 'result 2'
+    clock.now += 11
+    assert memory.get(keys[2]) is None
+
+
+def test_translation_memory_clear_by_translator(tmp_path):
+    memory = cache.TranslationMemory(db_path=str(tmp_path / 'tm.sqlite3'))
+    bing_key, google_key = cache.get_cache_key('bing', 'a', 'en', 'zh'), cache.get_cache_key('google', 'a', 'en', 'zh')
+    memory.set(bing_key, 'A')
+    memory.set(google_key, 'A')
+    memory.clear('bing')
+    assert memory.get(bing_key) is None
+    assert memory.get(google_key) == 'A'
+    memory.close()
+    assert os.path.exists(memory.db_path)
+
+
+def test_result_cache_lru_by_bytes():
+    key_a, key_b, key_c = (cache.get_cache_key('bing', text, 'en', 'zh') for text in 'abc')
+    result_cache = cache.ResultCache(max_bytes=2 * cache.ResultCache.get_size(key_a, 'A') + 1)
+    result_cache.set(key_a, 'A')
+    result_cache.set(key_b, 'B')
+    assert result_cache.get(key_a) == 'A'  # a is now the most recently used.
+    result_cache.set(key_c, 'C')
+    assert result_cache.get(key_b) is None
+    assert (result_cache.get(key_a), result_cache.get(key_c)) == ('A', 'C')
+
+
+def test_result_cache_ttl(clock):
+    result_cache = cache.ResultCache(ttl_seconds=5)
+    key = cache.get_cache_key('bing', 'a', 'en', 'zh')
+    result_cache.set(key, 'A')
+    clock.now += 4
+    assert result_cache.get(key) == 'A'
+    clock.now += 2
+    assert result_cache.get(key) is None
+    assert result_cache.info()['current_bytes'] == 0
+
+
+def test_result_cache_namespaces_translators():
+    result_cache = cache.ResultCache()
+    result_cache.set_many('bing', {'a': 'A', 'b': 'B'}, 'en', 'zh')
+    result_cache.set_many('google', {'a': 'A!'}, 'en', 'zh')
+    assert result_cache.get_many('google', ['a', 'b'], 'en', 'zh') == {'a': 'A!'}
+    assert result_cache.get_many('bing', ['a'], 'en', 'zh', professional_field='medicine') == {}
+
+    result_cache.clear('bing')
+    assert result_cache.info('bing')['size'] == 0
+    assert result_cache.info('google')['size'] == 1
+
+
+def test_result_cache_wrapper():
+    calls = []
+
+    def api(query_text, from_language='auto', to_language='en', **kwargs):
+        calls.append(query_text)
+        return {'detail': query_text} if kwargs.get('is_detail_result') else query_text.upper()
+
+    result_cache = cache.ResultCache()
+    cached_api = result_cache.cached('bing', api)
+    assert cached_api('hi', to_language='zh') == 'HI'
+    assert cached_api(query_text='hi', to_language='zh') == 'HI'
+    assert cached_api('hi', to_language='zh', if_use_cache=False) == 'HI'
+    assert cached_api('hi', to_language='zh', is_detail_result=True) == {'detail': 'hi'}
+    assert len(calls) == 3
+    assert cache.ResultCache(max_bytes=0).cached('bing', api)('hi') == 'HI'
+    assert len(calls) == 4
+
+
+def test_fuzzy_memory_match_is_never_rewritten():
+    namespace = ('bing', 'en', 'zh', '')
+    fuzzy_memory = cache.FuzzyMemory(threshold=0.8)
+    fuzzy_memory.set(namespace, 'I have 3 apples today.', '我今天有3个苹果。')
+    match = fuzzy_memory.get(namespace, 'I have 5 apples today.')
+    assert match['query_text'] == 'I have 3 apples today.'
+    assert match['translation'] == '我今天有3个苹果。'
+    assert 0.8 <= match['score'] < 1
+    assert fuzzy_memory.get(('bing', 'en', 'ja', ''), 'I have 5 apples today.') is None
+
+
+def test_fuzzy_memory_keeps_punctuation():
+    namespace = ('bing', 'en', 'zh', '')
+    fuzzy_memory = cache.FuzzyMemory(threshold=1.0)
+    fuzzy_memory.set(namespace, 'Stop.', '停。')
+    assert fuzzy_memory.get(namespace, 'Stop?') is None
+    assert fuzzy_memory.get(namespace, 'Stop.')['score'] == 1.0
+
+
+def test_fuzzy_memory_is_asked_by_fuzzy_lookup_only():
+    calls = []
+
+    def api(query_text, from_language='auto', to_language='en', **kwargs):
+        calls.append(query_text)
+        return {'detail': query_text} if kwargs.get('is_detail_result') else query_text.upper()
+
+    result_cache = cache.ResultCache(max_bytes=0, fuzzy_memory=cache.FuzzyMemory(threshold=0.8))
+    cached_api = result_cache.cached('bing', api)
+    assert cached_api('hello world 1', to_language='zh') == 'HELLO WORLD 1'
+    assert cached_api('hello world 2', to_language='zh') == 'HELLO WORLD 2'
+    assert cached_api('hello world 3', to_language='zh') == 'HELLO WORLD 3'
+    assert cached_api('hello world 1', to_language='zh', is_detail_result=True) == {'detail': 'hello world 1'}
+    assert calls == ['hello world 1', 'hello world 2', 'hello world 3', 'hello world 1']
+
+    match = result_cache.fuzzy_lookup('bing', 'hello world 4', 'auto', 'zh')
+    assert match['query_text'].startswith('hello world ') and match['translation'].startswith('HELLO WORLD ')
+    assert result_cache.fuzzy_lookup('bing', 'hello world 4', 'auto', 'ja') is None
+    assert result_cache.fuzzy_lookup('bing', 'goodbye', 'auto', 'zh') is None
+
+
+def test_shared_store_round_trip(tmp_path):
+    store = cache.SharedStore(db_path=str(tmp_path / 'shared.sqlite3'))
+    store.set('token_vault', 'Bing', {'token': 't'})
+    store.set('token_vault', 'Bing#1', {'token': 'u'})
+    store.set('language_map', 'Bing', {'en': ['zh']})
+    assert store.get('token_vault', 'Bing') == {'token': 't'}
+    assert set(store.get_all('token_vault')) == {'Bing', 'Bing#1'}
+
+    store.delete('token_vault', 'Bing#1')
+    assert store.get('token_vault', 'Bing#1') is None
+    store.delete('token_vault')
+    assert store.get_all('token_vault') == {}
+    assert store.get('language_map', 'Bing') == {'en': ['zh']}
+
+
+def test_shared_store_across_processes(tmp_path):
+    db_path = str(tmp_path / 'shared.sqlite3')
+    code = ('import sys; from translators.cache import SharedStore; '
+            'SharedStore(db_path=sys.argv[1]).set("language_map", "Bing", {"en": ["zh"]})')
+    subprocess.run([sys.executable, '-c', code, db_path], check=True, env=os.environ.copy())
+    assert cache.SharedStore(db_path=db_path).get('language_map', 'Bing') == {'en': ['zh']}
+
+
+def test_shared_store_backs_snapshot_and_vault(tmp_path):
+    store = cache.SharedStore(db_path=str(tmp_path / 'shared.sqlite3'))
+    writer, reader = cache.TokenVault(), cache.TokenVault()
+    for vault in (writer, reader):
+        vault.configure(vault_path=str(tmp_path / 'unused.json'))
+        vault.shared_store = store
+    writer.set('Bing', {'token': 't'})
+    assert reader.get('Bing')['secrets'] == {'token': 't'}
+
+    snapshot = cache.LanguageMapSnapshot()
+    snapshot.configure(snapshot_path=str(tmp_path / 'unused.json'))
+    snapshot.shared_store = store
+    snapshot.set('Bing', {'en': ['zh']})
+    assert store.get('language_map', 'Bing')['language_map'] == {'en': ['zh']}
+    assert not os.path.exists(tmp_path / 'unused.json')
+
+
+def test_language_map_snapshot_is_opt_in(tmp_path):
+    snapshot = cache.LanguageMapSnapshot(snapshot_path=str(tmp_path / 'snapshot.json'))
+    snapshot.set('Bing', {'en': ['zh']})
+    assert snapshot.get('Bing') is None
+    assert not os.path.exists(snapshot.snapshot_path)
+
+
+def test_language_map_snapshot_round_trip_and_ttl(tmp_path, clock):
+    path = str(tmp_path / 'snapshot.json')
+    snapshot = cache.LanguageMapSnapshot()
+    snapshot.configure(snapshot_path=path, ttl_seconds=100)
+    snapshot.set('Bing', {'en': ['zh']})
+
+    reloaded = cache.LanguageMapSnapshot()
+    reloaded.configure(snapshot_path=path, ttl_seconds=100)
+    assert reloaded.get('Bing') == {'en': ['zh']}
+    clock.now += 101
+    assert reloaded.get('Bing') is None
+
+
+def test_language_map_snapshot_ignores_other_versions(tmp_path):
+    path = tmp_path / 'snapshot.json'
+    path.write_text('{"version": 0, "language_maps": {"Bing": {"language_map": {"en": ["zh"]}, "updated_at": 0}}}')
+    assert cache.LanguageMapSnapshot.load(str(path)) == {}
+    path.write_text('not json')
+    assert cache.LanguageMapSnapshot.load(str(path)) == {}
+
+
+def test_token_vault_is_opt_in(tmp_path):
+    vault = cache.TokenVault(vault_path=str(tmp_path / 'vault.json'))
+    vault.set('Bing', {'token': 't'})
+    vault.invalidate('Bing')
+    assert vault.get('Bing') is None
+    assert not os.path.exists(vault.vault_path)
+
+
+def test_token_vault_round_trip_and_expiry(tmp_path, clock):
+    path = str(tmp_path / 'vault.json')
+    vault = cache.TokenVault()
+    vault.configure(vault_path=path)
+    vault.set('Bing', {'token': 't'}, cookies={'MUID': 'm'}, ttl_seconds=60)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    reloaded = cache.TokenVault()
+    reloaded.configure(vault_path=path)
+    assert reloaded.get('Bing')['secrets'] == {'token': 't'}
+    assert reloaded.get('Bing')['cookies'] == {'MUID': 'm'}
+    clock.now += 61
+    assert reloaded.get('Bing') is None
+    assert reloaded.info()['secrets']['Bing']['is_expired']
+
+
+def test_token_vault_invalidate_identity(tmp_path):
+    vault = cache.TokenVault()
+    vault.configure(vault_path=str(tmp_path / 'vault.json'))
+    vault.set('Bing', {'token': 'a'})
+    vault.set('Bing#1', {'token': 'b'})
+    vault.invalidate('Bing#1')
+    assert vault.get('Bing#1') is None
+    assert vault.get('Bing')['secrets'] == {'token': 'a'}
+
+
+def test_resource_cache_is_opt_in(tmp_path):
+    resource_cache = cache.ResourceCache(cache_dir=str(tmp_path / 'resources'))
+    resource_cache.set('https://example.com/', '<html>', etag='"v1"')
+    assert resource_cache.get('https://example.com/') is None
+    assert not os.path.exists(tmp_path / 'resources')
+
+
+def test_resource_cache_round_trip(tmp_path):
+    resource_cache = cache.ResourceCache()
+    resource_cache.configure(cache_dir=str(tmp_path / 'resources'))
+    resource_cache.set('https://example.com/a', '<html>', etag='"v1"')
+    resource_cache.set('https://example.com/b', '<html>', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    resource_cache.set('https://example.com/c', '<html>')  # neither validator nor immutable url, not cached.
+    assert len(os.listdir(tmp_path / 'resources' / 'content')) == 1  # content-addressed.
+    assert resource_cache.get('https://example.com/c') is None
+
+    reloaded = cache.ResourceCache()
+    reloaded.configure(cache_dir=str(tmp_path / 'resources'))
+    cached = reloaded.get('https://example.com/a')
+    assert cached['text'] == '<html>'
+    assert reloaded.get_conditional_headers(cached) == {'If-None-Match': '"v1"'}
+    assert reloaded.get_conditional_headers(reloaded.get('https://example.com/b')) == {
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+
+
+def test_resource_cache_immutable_urls():
+    assert cache.ResourceCache.is_immutable_url('https://example.com/static/index.3f2a9c1b.js')
+    assert cache.ResourceCache.is_immutable_url('https://example.com/v1.2.3/app.js')
+    assert not cache.ResourceCache.is_immutable_url('https://example.com/static/app.js')
+    assert not cache.ResourceCache.is_immutable_url('https://example.com/translate')
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f'status {status}')
+        self.status = status
+
+
+def test_provider_errors():
+    assert cache.is_provider_error(FakeHttpError(503))
+    assert cache.is_provider_error(ConnectionResetError())
+    assert cache.is_provider_error(TimeoutError())
+    assert not cache.is_provider_error(TypeError('unexpected keyword argument'))
+    assert not cache.is_provider_error(ValueError('bad argument'))
+
+
+def test_negative_cache_fails_translator_per_transport(clock):
+    negative_cache = cache.NegativeCache(failure_threshold=2, failure_ttl_seconds=60)
+
+    def api(query_text, from_language='auto', to_language='en', **kwargs):
+        if kwargs.get('proxies'):
+            raise FakeHttpError(502)
+        return query_text
+
+    guarded_api = negative_cache.guarded('Bing', api, error_type=LookupError)
+    proxies = {'https': 'http://127.0.0.1:1'}
+    for _ in range(2):
+        with pytest.raises(FakeHttpError):
+            guarded_api('hi', proxies=proxies)
+    with pytest.raises(LookupError, match='FakeHttpError'):
+        guarded_api('hi', proxies=proxies)
+    assert guarded_api('hi') == 'hi'  # not through the failing proxy.
+    assert list(negative_cache.info()['failed_translators']) == [f"Bing(proxies={sorted(proxies.items())})"]
+
+    clock.now += 61
+    with pytest.raises(FakeHttpError):
+        guarded_api('hi', proxies=proxies)
+
+
+def test_negative_cache_ignores_caller_errors():
+    negative_cache = cache.NegativeCache(failure_threshold=1)
+
+    def api(query_text, from_language='auto', to_language='en', **kwargs):
+        raise TypeError('unexpected keyword argument')
+
+    guarded_api = negative_cache.guarded('Bing', api, error_type=LookupError)
+    for _ in range(3):
+        with pytest.raises(TypeError):
+            guarded_api('hi')
+    assert negative_cache.info()['failed_translators'] == {}
+
+
+def test_negative_cache_unsupported_pairs(clock):
+    negative_cache = cache.NegativeCache(pair_ttl_seconds=60)
+    negative_cache.set_unsupported('Bing', 'auto', 'xx', 'Unsupported to_language: xx')
+    assert negative_cache.get_reason('Bing', 'detect', 'xx', 'proxies=...') == 'Unsupported to_language: xx'
+    assert negative_cache.get_reason('Bing', 'auto', 'en') is None
+    assert negative_cache.get_reason('Google', 'auto', 'xx') is None
+
+    negative_cache.clear('Bing')
+    assert negative_cache.get_reason('Bing', 'auto', 'xx') is None
+
+
+class FakeSessionTranslator:
+    def __init__(self, begin_time):
+        self.begin_time, self.query_count = begin_time, 0
+
+
+def test_session_lifetime_shrinks_on_rejection(clock):
+    session_lifetime = cache.SessionLifetime(default_freq=1000, default_seconds=1000)
+    translator = FakeSessionTranslator(clock.now)
+    clock.now += 500
+    translator.query_count = 10
+    session_lifetime.record_rejection(translator)
+    assert session_lifetime.get('FakeSessionTranslator') == (1000, 400)
+
+
+def test_session_lifetime_grows_only_past_thresholds(clock):
+    session_lifetime = cache.SessionLifetime(default_freq=1000, default_seconds=1000, max_growth=2)
+    translator = FakeSessionTranslator(clock.now)
+    for _ in range(3):  # sessions rolled over at the thresholds prove nothing beyond them.
+        session_lifetime.record_success(translator)
+        clock.now += 999
+        translator.query_count += 10
+        session_lifetime.record_success(translator)
+        translator.begin_time = clock.now
+    assert session_lifetime.get('FakeSessionTranslator') == (1000, 1000)
+
+    session_lifetime.record_success(translator)
+    clock.now += 1500  # served a request past the threshold, eg: with explicit update_session_after_seconds.
+    session_lifetime.record_success(translator)
+    assert session_lifetime.get('FakeSessionTranslator') == (1000, 1500)
+    clock.now += 1500
+    session_lifetime.record_success(translator)
+    assert session_lifetime.get('FakeSessionTranslator') == (1000, 2000)
+    assert session_lifetime.info()['growths'] == 2
@@ -0,0 +1,351 @@
+import asyncio
+import threading
+import concurrent.futures
+
+import pytest
+
+from translators import concurrency
+
+
+def test_flight_key_covers_every_kwarg():
+    key = concurrency.get_flight_key('bing', 'hi', 'en', 'zh', timeout=5)
+    assert key == concurrency.get_flight_key('bing', 'hi', 'en', 'zh', timeout=5)
+    assert key != concurrency.get_flight_key('bing', 'hi', 'en', 'zh', timeout=5, proxies={'https': 'http://p:1'})
+    assert key != concurrency.get_flight_key('bing', 'hi', 'en', 'zh', timeout=5, if_use_cache=False)
+
+
+def test_single_flight_shares_one_call():
+    single_flight, started, release = concurrency.SingleFlight(), threading.Event(), threading.Event()
+    calls = []
+
+    def func():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(single_flight.do('key', func)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(single_flight.do('key', func)))
+    follower.start()
+    while single_flight.info()['shared'] < 1:
+        pass
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert results == ['result', 'result']
+    assert len(calls) == 1
+
+
+def test_async_single_flight_shares_result_and_error():
+    async def main():
+        single_flight, calls = concurrency.AsyncSingleFlight(), []
+
+        async def func(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            if value == 'error':
+                raise ValueError(value)
+            return value
+
+        results = await asyncio.gather(*[single_flight.do('a', func, 'a') for _ in range(3)])
+        errors = await asyncio.gather(*[single_flight.do('e', func, 'error') for _ in range(2)],
+                                      return_exceptions=True)
+        return results, errors, calls, single_flight.info()
+
+    results, errors, calls, info = asyncio.run(main())
+    assert results == ['a', 'a', 'a']
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert calls == ['a', 'error']
+    assert info == {'in_flight': 0, 'shared': 3}
+
+
+def test_async_single_flight_survives_cancelled_leader():
+    async def main():
+        single_flight, release = concurrency.AsyncSingleFlight(), asyncio.Event()
+
+        async def func():
+            await release.wait()
+            return 'result'
+
+        leader = asyncio.ensure_future(single_flight.do('key', func))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(single_flight.do('key', func))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return leader, await follower
+
+    leader, result = asyncio.run(main())
+    assert leader.cancelled()
+    assert result == 'result'
+
+
+def test_async_single_flight_cancels_call_without_waiters():
+    async def main():
+        single_flight, cancelled = concurrency.AsyncSingleFlight(), asyncio.Event()
+
+        async def func():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.ensure_future(single_flight.do('key', func)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return single_flight.info()
+
+    assert asyncio.run(main())['in_flight'] == 0
+
+
+def test_async_single_flight_new_call_after_cancellation():
+    async def main():
+        single_flight = concurrency.AsyncSingleFlight()
+
+        async def func(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        waiter = asyncio.ensure_future(single_flight.do('key', func, 'old'))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await single_flight.do('key', func, 'new')
+
+    assert asyncio.run(main()) == 'new'
+
+
+def test_async_refresh_gate_keeps_state_per_loop():
+    gate, started, release = concurrency.AsyncRefreshGate(), threading.Event(), threading.Event()
+
+    async def hold():
+        started.set()
+        await asyncio.get_running_loop().run_in_executor(None, release.wait, 5)
+
+    async def run_hold():
+        return await gate.run(lambda: True, hold)
+
+    thread = threading.Thread(target=asyncio.run, args=(run_hold(),))
+    thread.start()
+    started.wait(5)
+
+    async def echo():
+        return 'echo'
+
+    async def main():
+        is_ready = iter([False, False])  # not ready: the refresh waits for requests of this loop only.
+        return await asyncio.wait_for(gate.run(lambda: next(is_ready), echo), 1), gate.n_running
+
+    result, n_running = asyncio.run(main())
+    release.set()
+    thread.join(5)
+    assert result == 'echo'
+    assert n_running == 1  # the request still running on the other loop.
+    assert gate.n_running == 0
+    assert gate.n_refreshes == 1
+
+
+def test_async_refresh_gate_refreshes_once():
+    async def main():
+        gate, refreshes, state = concurrency.AsyncRefreshGate(), [], {'ready': False}
+
+        async def func():
+            if not state['ready']:
+                refreshes.append(1)
+                await asyncio.sleep(0.01)
+                state['ready'] = True
+            return state['ready']
+
+        results = await asyncio.gather(*[gate.run(lambda: state['ready'], func) for _ in range(5)])
+        return results, refreshes, gate.n_refreshes
+
+    results, refreshes, n_refreshes = asyncio.run(main())
+    assert results == [True] * 5
+    assert refreshes == [1]
+    assert n_refreshes == 1
+
+
+def test_refresh_gate_refreshes_once_after_running_requests():
+    gate, state, events = concurrency.RefreshGate(), {'ready': True}, []
+    started, release = threading.Event(), threading.Event()
+
+    def request():
+        events.append('request')
+        started.set()
+        release.wait(5)
+
+    def refresh():
+        if not state['ready']:
+            events.append('refresh')
+            state['ready'] = True
+
+    running = threading.Thread(target=gate.run, args=(lambda: state['ready'], request))
+    running.start()
+    started.wait(5)
+    state['ready'] = False
+    refreshers = [threading.Thread(target=gate.run, args=(lambda: state['ready'], refresh)) for _ in range(4)]
+    for thread in refreshers:
+        thread.start()
+    assert 'refresh' not in events  # waits for the request running on the old session.
+    release.set()
+    for thread in [running, *refreshers]:
+        thread.join(5)
+    assert events == ['request', 'refresh']
+    assert gate.info() == {'running': 0, 'refreshes': 1}
+
+
+class FakeTranslator:
+    def __init__(self, name):
+        self.name = name
+
+    def trans_api(self, query_text, release=None):
+        if release is not None:
+            release.wait(5)
+        return f'{self.name}:{query_text}'
+
+    async def trans_api_async(self, query_text):
+        await asyncio.sleep(0)
+        return f'{self.name}:{query_text}'
+
+
+def test_identity_pool_round_robin():
+    pool = concurrency.IdentityPool([FakeTranslator('a'), FakeTranslator('b')])
+    api = pool.dispatch('trans_api')
+    assert [api('hi') for _ in range(3)] == ['a:hi', 'b:hi', 'a:hi']
+
+    async def main():
+        return await asyncio.gather(*[pool.dispatch_async('trans_api_async')('hi') for _ in range(2)])
+
+    assert asyncio.run(main()) == ['b:hi', 'a:hi']
+    assert pool.info() == {'size': 2, 'strategy': 'round_robin', 'running': [0, 0], 'dispatched': [3, 2]}
+
+
+def test_identity_pool_least_loaded():
+    pool = concurrency.IdentityPool([FakeTranslator('a'), FakeTranslator('b'), FakeTranslator('c')],
+                                    strategy='least_loaded')
+    api, release = pool.dispatch('trans_api'), threading.Event()
+    busy = threading.Thread(target=api, args=('busy',), kwargs={'release': release})
+    busy.start()
+    while pool.info()['running'] != [1, 0, 0]:
+        pass
+    assert [api('hi') for _ in range(3)] == ['b:hi', 'c:hi', 'b:hi']
+    release.set()
+    busy.join(5)
+
+
+def test_identity_pool_replace_and_strategy():
+    pool = concurrency.IdentityPool([FakeTranslator('a'), FakeTranslator('b')])
+    assert pool.replace(1, FakeTranslator('c')).name == 'b'
+    assert [pool.dispatch('trans_api')('hi') for _ in range(2)] == ['a:hi', 'c:hi']
+    with pytest.raises(ValueError):
+        concurrency.IdentityPool([FakeTranslator('a')], strategy='random')
+
+
+def test_refresh_gate_swap_waits_for_running_requests():
+    gate, started, release, events = concurrency.RefreshGate(), threading.Event(), threading.Event(), []
+
+    def request():
+        started.set()
+        release.wait(5)
+        events.append('request')
+
+    running = threading.Thread(target=gate.run, args=(lambda: True, request))
+    running.start()
+    started.wait(5)
+    assert not gate.swap(lambda: events.append('swap'), timeout=0.05)
+
+    swapping = threading.Thread(target=gate.swap, args=(lambda: events.append('swap'),))
+    swapping.start()
+    release.set()
+    for thread in (running, swapping):
+        thread.join(5)
+    assert events == ['request', 'swap']
+    assert gate.info() == {'running': 0, 'refreshes': 0}
+
+
+def test_async_refresh_gate_swap_waits_for_running_requests():
+    async def main():
+        gate, release, events = concurrency.AsyncRefreshGate(), asyncio.Event(), []
+
+        async def request():
+            await release.wait()
+            events.append('request')
+
+        running = asyncio.ensure_future(gate.run(lambda: True, request))
+        await asyncio.sleep(0)
+        is_swapped = await gate.swap(lambda: events.append('swap'), timeout=0.01)
+        swapping = asyncio.ensure_future(gate.swap(lambda: events.append('swap')))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(running, swapping)
+        return is_swapped, events
+
+    assert asyncio.run(main()) == (False, ['request', 'swap'])
+
+
+def test_event_loop_thread_runs_coroutines_of_many_threads_on_one_loop():
+    loop_thread = concurrency.EventLoopThread()
+
+    async def get_loop(i):
+        await asyncio.sleep(0.01)
+        return i, asyncio.get_running_loop()
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda i: loop_thread.run(get_loop(i), timeout=5), range(16)))
+    assert [i for i, _ in results] == list(range(16))
+    assert {loop for _, loop in results} == {loop_thread.get_loop()}
+    assert loop_thread.info() == {'running': True, 'submitted': 16}
+    loop_thread.stop(timeout=5)
+    assert not loop_thread.is_running()
+
+
+def test_event_loop_thread_cancels_timed_out_and_stopped_coroutines():
+    loop_thread = concurrency.EventLoopThread()
+    cancelled = []
+
+    async def wait_forever():
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        loop_thread.run(wait_forever(), timeout=0.05)
+    future = loop_thread.submit(wait_forever())
+    loop_thread.stop(timeout=5)
+    assert future.cancelled() and len(cancelled) == 2
+
+    assert loop_thread.run(asyncio.sleep(0, 'restarted'), timeout=5) == 'restarted'
+    loop_thread.stop(timeout=5)
+
+
+def test_event_loop_thread_refuses_to_wait_for_itself():
+    loop_thread = concurrency.EventLoopThread()
+
+    async def run_inside():
+        coro = asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            loop_thread.run(coro)
+        return True
+
+    assert loop_thread.run(run_inside(), timeout=5)
+    loop_thread.stop(timeout=5)
+
+
+def test_event_loop_thread_starts_new_loop_after_fork(monkeypatch):
+    loop_thread = concurrency.EventLoopThread()
+    parent_loop = loop_thread.get_loop()
+    pid = concurrency.os.getpid()
+    monkeypatch.setattr(concurrency.os, 'getpid', lambda: pid + 1)
+    assert loop_thread.get_loop() is not parent_loop
+    loop_thread.stop(timeout=5)
+    parent_loop.call_soon_threadsafe(parent_loop.stop)
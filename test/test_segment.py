@@ -0,0 +1,66 @@
+import pytest
+
+from translators import segment
+
+
+@pytest.fixture
+def packer():
+    return segment.SegmentPacker()
+
+
+def test_segment_packer_joins_with_numbered_markers(packer):
+    assert packer.join([' Hello ', 'World']) == '[1] Hello\n[2] World'
+    assert not packer.is_packable('see [2] below')
+    assert not packer.is_packable('two\nlines')
+    assert not packer.is_packable('  ')
+
+
+def test_segment_packer_packs_markers_within_limit(packer):
+    segments = ['abcd'] * 5
+    groups = packer.pack('bing', segments, limit=len(packer.join(['abcd'] * 2)))
+    assert groups == [['abcd'] * 2, ['abcd'] * 2, ['abcd']]
+    assert all(len(packer.join(group)) <= len(packer.join(['abcd'] * 2)) for group in groups)
+    assert packer.pack('bing', ['x' * 100, 'ab'], limit=50) == [['x' * 100], ['ab']]
+
+
+def test_segment_packer_splits_by_markers(packer):
+    assert packer.split('bing', '[1] 你好\n【2】世界\n', 2) == ['你好', '世界']
+    assert packer.split('bing', '[1] Hello [2] World', 2) == ['Hello', 'World']  # lines merged, markers kept.
+    assert packer.info('bing') == {'packs': 2, 'segments': 4, 'fallbacks': 0}
+
+
+@pytest.mark.parametrize('translated_text', [
+    '[1] Hello\nWorld',  # a marker lost.
+    '[2] World\n[1] Hello',  # reordered.
+    '[1] Hello\n[1] World',  # repeated.
+    '[1] Hello\n[2]\n',  # a segment translated into nothing.
+    'Hi\n[1] Hello\n[2] World',  # text before the first marker.
+    '[1] Hello\n[2] World\n[3] !',  # one more segment.
+])
+def test_segment_packer_rejects_misaligned_translations(packer, translated_text):
+    assert packer.split('bing', translated_text, 2) is None
+    assert packer.info('bing')['fallbacks'] == 1
+
+
+def test_segment_packer_strips_custom_delimiter():
+    packer = segment.SegmentPacker(delimiter=' ||| ')
+    text = packer.join(['Hello', 'World'])
+    assert text == '[1] Hello ||| [2] World'
+    assert packer.split('bing', text.replace('Hello', 'Bonjour'), 2) == ['Bonjour', 'World']
+
+
+def test_text_chunker_is_opt_in():
+    chunker = segment.TextChunker()
+    assert not chunker.is_enabled
+    chunker.configure()
+    assert chunker.is_enabled
+
+
+def test_text_chunker_keeps_separators_exactly():
+    chunker = segment.TextChunker()
+    text = '  第一句。第二句。\n\n第三句。 '
+    chunks = chunker.split(text, limit=4, length_unit='code_point')
+    assert ''.join(chunks) == text and len(chunks) > 1
+    translated_dict = {chunk.strip(): chunk.strip().replace('句', ' sentence') for chunk in chunks if chunk.strip()}
+    assert chunker.join(chunks, translated_dict) == '  第一 sentence。第二 sentence。\n\n第三 sentence。 '
+    assert chunker.join(['Hello.', ' ', 'World.'], {'Hello.': 'Bonjour.', 'World.': 'Monde.'}) == 'Bonjour. Monde.'
@@ -0,0 +1,269 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from translators import cache, server
+
+
+class FakeSession:
+    def __init__(self):
+        self.cookies = {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncSession(FakeSession):
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    token_vault = cache.TokenVault()
+    token_vault.configure(vault_path=str(tmp_path / 'vault.json'))
+    monkeypatch.setattr(server, 'token_vault', token_vault)
+    return token_vault
+
+
+def test_background_refresh_swaps_inside_the_instance(vault, monkeypatch):
+    tss = server.TranslatorsServer()
+    old_translator, old_session = tss._bing, FakeSession()
+    old_translator.session, old_translator.language_map = old_session, {'en': ['zh']}
+    old_translator.begin_time = time.time() - old_translator.default_session_seconds
+    gate = old_translator.refresh_gate
+    vault.set('Bing', {'token': 'old'})
+
+    def new_translator(translator, identity=0):
+        translator = server.Bing()
+
+        def bing_api(*args, **kwargs):
+            assert vault.get('Bing')['secrets'] == {'token': 'old'}  # kept until the new secrets work.
+            translator.session, translator.language_map = FakeSession(), {'en': ['ja']}
+            translator.begin_time = time.time()
+            translator.set_vault_secrets({'token': 'new'}, translator.session)
+            return 'ok'
+
+        translator.bing_api = bing_api
+        return translator
+
+    monkeypatch.setattr(tss, '_new_translator', new_translator)
+    assert tss.refresh_expiring_sessions(('bing',)) == 1
+    assert tss._bing is old_translator
+    assert tss.identity_pools['bing'].translators[0] is old_translator
+    assert old_translator.language_map == {'en': ['ja']}
+    assert old_translator.refresh_gate is gate
+    assert not old_translator.is_vault_deferred
+    assert old_session.closed
+    assert vault.get('Bing')['secrets'] == {'token': 'new'}
+
+
+def test_background_refresh_keeps_vault_after_failed_warm_up(vault, monkeypatch):
+    tss = server.TranslatorsServer()
+    old_translator = tss._bing
+    old_translator.session, old_translator.language_map = FakeSession(), {'en': ['zh']}
+    old_translator.begin_time = time.time() - old_translator.default_session_seconds
+    vault.set('Bing', {'token': 'old'})
+
+    def new_translator(translator, identity=0):
+        translator = server.Bing()
+        translator.bing_api = lambda *args, **kwargs: 1 / 0
+        return translator
+
+    monkeypatch.setattr(tss, '_new_translator', new_translator)
+    assert tss.refresh_expiring_sessions(('bing',)) == 0
+    assert not old_translator.session.closed
+    assert vault.get('Bing')['secrets'] == {'token': 'old'}
+
+
+def test_async_background_refresh_swaps_inside_the_instance(vault, monkeypatch):
+    from translators import base, server_async
+
+    monkeypatch.setattr(base, 'token_vault', vault)
+    async_tss = server_async.TranslatorsServer()
+    old_translator, old_session = async_tss._bing, FakeAsyncSession()
+    old_translator.async_session, old_translator.language_map = old_session, {'en': ['zh']}
+    old_translator.begin_time = time.time() - old_translator.default_session_seconds
+    vault.set('Bing', {'token': 'old'})
+
+    def new_translator(translator, identity=0):
+        translator = type(old_translator)()
+
+        async def trans_api_async(*args, **kwargs):
+            assert vault.get('Bing')['secrets'] == {'token': 'old'}
+            translator.async_session, translator.language_map = FakeAsyncSession(), {'en': ['ja']}
+            translator.begin_time = time.time()
+            translator.deferred_vault_item = ({'token': 'new'}, {}, None)
+            return 'ok'
+
+        translator.trans_api_async = trans_api_async
+        return translator
+
+    async def main():
+        n_swapped = await async_tss.refresh_expiring_sessions(('bing',))
+        await asyncio.sleep(0)
+        return n_swapped
+
+    monkeypatch.setattr(async_tss, '_new_translator', new_translator)
+    assert asyncio.run(main()) == 1
+    assert async_tss._bing is old_translator
+    assert old_translator.language_map == {'en': ['ja']}
+    assert old_session.closed
+    assert vault.get('Bing')['secrets'] == {'token': 'new'}
+
+
+def test_warm_up_bypasses_caches(monkeypatch):
+    tss = server.TranslatorsServer()
+    tss.set_result_cache()
+    tss.negative_cache.set_failed('Bing', 'failed before')
+    calls = []
+    monkeypatch.setattr(tss._bing, 'bing_api', lambda *args, **kwargs: calls.append(kwargs) or 'warm')
+    assert tss._test_translate('bing') == 'warm'
+    assert tss._test_translate('bing') == 'warm'
+    assert len(calls) == 2
+    tss.negative_cache.clear('Bing')
+
+
+def test_async_warm_up_bypasses_caches(monkeypatch):
+    from translators import server_async
+
+    async_tss = server_async.TranslatorsServer()
+    async_tss.set_result_cache()
+    async_tss.negative_cache.set_failed('Bing', 'failed before')
+    calls = []
+
+    async def trans_api_async(*args, **kwargs):
+        calls.append(kwargs)
+        return 'warm'
+
+    monkeypatch.setattr(async_tss._bing, 'trans_api_async', trans_api_async)
+    assert asyncio.run(async_tss.warmup(('bing',)))['success'] == ['bing']
+    assert asyncio.run(async_tss.warmup(('bing',)))['success'] == ['bing']
+    assert len(calls) == 2
+    async_tss.negative_cache.clear('Bing')
+
+
+def test_async_batch_serves_cached_texts_without_packing(monkeypatch):
+    from translators import server_async
+
+    async_tss = server_async.TranslatorsServer()
+    async_tss.set_result_cache()
+    async_tss.result_cache.set_many('bing', {'hello': 'cached'}, 'auto', 'en')
+    calls = []
+
+    async def translate_text(query_text, **kwargs):
+        calls.append(query_text)
+        return query_text.upper()
+
+    monkeypatch.setattr(async_tss, 'translate_text', translate_text)
+    results = asyncio.run(async_tss.translate_batch(['hello', 'world', 'hello'], translator='bing',
+                                                    if_use_packing=False))
+    assert results == ['cached', 'WORLD', 'cached']
+    assert calls == ['world']
+
+
+def test_fuzzy_lookup_leaves_translator_calls_alone(monkeypatch):
+    tss = server.TranslatorsServer()
+    tss.set_fuzzy_memory(threshold=0.8)
+
+    def bing_api(query_text, from_language='auto', to_language='en', **kwargs):
+        return {'detail': query_text} if kwargs.get('is_detail_result') else query_text.upper()
+
+    monkeypatch.setitem(tss.translators_dict, 'bing', tss.result_cache.cached('bing', bing_api))
+    assert tss.translate_text('hello world 1', translator='bing', to_language='zh') == 'HELLO WORLD 1'
+    detail = tss.translate_text('hello world 2', translator='bing', to_language='zh', is_detail_result=True)
+    assert detail == {'detail': 'hello world 2'}
+
+    match = tss.fuzzy_lookup('hello world 2', translator='bing', to_language='zh')
+    assert match['translation'] == 'HELLO WORLD 1' and match['score'] < 1
+    assert tss.fuzzy_lookup('hello world 2', translator='bing', to_language='ja') is None
+    with pytest.raises(server.TranslatorError):
+        tss.fuzzy_lookup('hello world 2', translator='nope')
+
+
+def test_long_texts_are_chunked_one_by_one_after_opting_in(monkeypatch):
+    tss = server.TranslatorsServer()
+    text = 'First sentence. Second sentence. Third sentence.'
+    threads = []
+
+    def bing_api(query_text, **kwargs):
+        threads.append(threading.current_thread())
+        if len(query_text) > 20:
+            raise server.TranslatorError('too long')
+        return query_text.upper()
+
+    monkeypatch.setattr(tss._bing, 'input_limit', 20)
+    monkeypatch.setitem(tss.translators_dict, 'bing', bing_api)
+    with pytest.raises(server.TranslatorError):
+        tss.translate_text(text, translator='bing')
+
+    monkeypatch.setattr(tss.text_chunker, 'is_enabled', True)
+    assert tss.translate_text(text, translator='bing') == text.upper()
+    assert set(threads) == {threading.current_thread()}
+
+
+@pytest.fixture(params=['server', 'providers'])
+def yandex_module(request):
+    if request.param == 'server':
+        return server
+    from translators.providers import yandex
+    return yandex
+
+
+def test_yandex_sends_a_plain_query_as_one_text(yandex_module):
+    yandex_v2 = yandex_module.YandexV2
+    assert yandex_v2.get_translate_params('Hello\n\nWorld', 'en', 'zh') == {'text': 'Hello\n\nWorld', 'lang': 'en-zh'}
+    assert yandex_v2.join_lines('Hello\n\nWorld', ['你好\n\n世界']) == '你好\n\n世界'
+
+
+def test_yandex_checks_lines_of_packed_segments(yandex_module):
+    yandex_v2 = yandex_module.YandexV2
+    params = yandex_v2.get_translate_params('[1] Hello\n\n[2] World', 'en', 'zh', if_split_lines=True)
+    assert params == [('lang', 'en-zh'), ('text', '[1] Hello'), ('text', '[2] World')]
+    assert yandex_v2.join_lines('[1] Hello\n\n[2] World', ['[1] 你好', '[2] 世界'], True) == '[1] 你好\n\n[2] 世界'
+    with pytest.raises(yandex_module.TranslatorError):
+        yandex_v2.join_lines('[1] Hello\n\n[2] World', ['[1] 你好 [2] 世界'], True)
+
+
+def test_segments_are_not_packed_by_default(monkeypatch):
+    tss = server.TranslatorsServer()
+    calls = []
+    monkeypatch.setitem(tss.translators_dict, 'yandex', lambda query_text, **kwargs: calls.append(kwargs) or 'ok')
+    assert tss.translate_segments(['Hello', 'World'], translator='yandex') == ['ok', 'ok']
+    assert len(calls) == 2 and not any(kwargs.get('if_split_lines') for kwargs in calls)
+
+    calls.clear()
+    monkeypatch.setitem(tss.translators_dict, 'yandex', lambda query_text, **kwargs: calls.append(kwargs) or query_text)
+    assert tss.translate_segments(['Hello', 'World'], translator='yandex', if_use_packing=None) == ['Hello', 'World']
+    assert len(calls) == 1 and calls[0]['if_split_lines']
+
+
+def test_servers_share_configuration_but_not_result_caches():
+    from translators import config, server_async
+
+    tss, async_tss = server.TranslatorsServer(), server_async.TranslatorsServer()
+    assert isinstance(tss, config.ConfigMixin) and isinstance(async_tss, config.ConfigMixin)
+    assert tss.set_segment_packing(max_segments=10) is async_tss.segment_packer
+    assert async_tss.segment_packer.max_segments == 10
+    tss.set_segment_packing()
+    assert tss.result_cache is not async_tss.result_cache
+
+    with pytest.raises(server.TranslatorError):
+        tss.set_text_chunking(concurrency=0)
+    with pytest.raises(server_async.TranslatorError):
+        async_tss.set_text_chunking(concurrency=0)
+
+
+@pytest.mark.parametrize('name', ['mirai', 'niutrans', 'qqFanyi'])
+def test_uncertified_apis_keep_their_wrapper(monkeypatch, name):
+    translator = getattr(server.TranslatorsServer(), f'_{name}')
+
+    def renew_session(*args, **kwargs):
+        raise ValueError('offline')
+
+    monkeypatch.setattr(translator, 'renew_session', renew_session, raising=False)
+    with pytest.raises(server.TranslatorError, match='has been not certified'):
+        getattr(translator, f'{name}_api')('hello', if_print_warning=False)
@@ -0,0 +1,312 @@
+import socket
+import asyncio
+import threading
+import http.server
+
+import httpx
+import niquests
+import pytest
+import requests
+
+from translators import transport
+
+
+def test_async_transport_reuses_connector_across_sessions():
+    async def main():
+        async_transport = transport.AsyncTransport()
+        old_session = async_transport.get_session('Bing')
+        connector = old_session.connector
+        async_transport.discard(old_session)
+        await asyncio.sleep(0)
+        new_session = async_transport.get_session('Bing')
+        other_session = async_transport.get_session('GoogleV2')
+        connectors = new_session.connector, other_session.connector
+        info = async_transport.info()
+        await async_transport.aclose()
+        return old_session, new_session, connectors, connector, info, async_transport.info()
+
+    old_session, new_session, connectors, connector, info, closed_info = asyncio.run(main())
+    assert old_session.closed
+    assert connectors[0] is connector
+    assert connectors[1] is not connector
+    assert info['connectors'] == 2
+    assert info['sessions'] == 2
+    assert connector.closed and new_session.closed
+    assert closed_info['connectors'] == 0
+    assert closed_info['sessions_created'] == 3
+
+
+def test_async_transport_connector_per_event_loop():
+    async_transport = transport.AsyncTransport()
+
+    async def main():
+        connector = async_transport.get_connector('Bing')
+        assert async_transport.get_connector('Bing') is connector
+        await async_transport.aclose()
+        return connector
+
+    assert asyncio.run(main()) is not asyncio.run(main())
+    assert async_transport.info()['connectors_created'] == 2
+
+
+def test_async_transport_proxy():
+    assert transport.AsyncTransport.get_proxy_url(None) is None
+    assert transport.AsyncTransport.get_proxy_url({'http': 'http://p:1', 'https': 'http://p:2'}) == 'http://p:2'
+
+
+def test_transport_sizes_pools_of_sync_sessions():
+    sync_transport = transport.Transport(pool_connections=4, pool_maxsize=32, max_retries=3)
+    session = sync_transport.get_session('requests', proxies={'https': 'http://p:1'})
+    adapter = session.get_adapter('https://www.bing.com')
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == 32
+    assert adapter.max_retries.total == 3
+    assert session.proxies == {'https': 'http://p:1'}
+    assert sync_transport.info()['sessions_created'] == 1
+
+
+def test_http2_mode_by_translator(monkeypatch):
+    monkeypatch.setattr(transport, 'is_http2_available', lambda: True)
+    sync_transport = transport.Transport()
+    sync_transport.set_http2(['GoogleV2', 'Bing'])
+    sync_transport.set_http2(['Bing'], is_enabled=False)
+    assert sync_transport.info()['http2'] == ['GoogleV2']
+    assert isinstance(sync_transport.get_session('niquests', name='GoogleV2'), niquests.Session)
+    assert isinstance(sync_transport.get_session('requests', name='Bing'), requests.Session)
+    assert not isinstance(sync_transport.get_session('cloudscraper', name='GoogleV2'), (httpx.Client, niquests.Session))
+
+
+def test_http2_mode_falls_back_without_h2(monkeypatch):
+    monkeypatch.setattr(transport, 'is_http2_available', lambda: False)
+    sync_transport = transport.Transport()
+    sync_transport.set_http2(['GoogleV2'])
+    with pytest.warns(UserWarning, match='niquests'):
+        assert isinstance(sync_transport.get_session('requests', name='GoogleV2'), niquests.Session)
+
+    async def main():
+        async_transport = transport.AsyncTransport()
+        async_transport.set_http2(['GoogleV2'])
+        with pytest.warns(UserWarning, match='aiohttp'):
+            session = async_transport.get_session('GoogleV2')
+        await async_transport.aclose()
+        return session, async_transport.info()['http2']
+
+    session, http2_names = asyncio.run(main())
+    assert not isinstance(session, transport.Http2AsyncSession)
+    assert http2_names == []
+
+
+def test_http2_async_session_speaks_like_aiohttp():
+    def handler(request):
+        assert request.content == b'q=hi'
+        return httpx.Response(200, json={'text': 'hi'}, headers={'set-cookie': 'sid=1; Domain=example.com'})
+
+    async def main():
+        versions = []
+        session = transport.Http2AsyncSession(httpx.MockTransport(handler), on_response=versions.append)
+        async with session.post('https://api.example.com/t', data='q=hi') as r:
+            data = await r.json()
+        session.cookie_jar.update_cookies({'lang': 'en'})
+        cookies = session.cookie_jar.filter_cookies('https://www.example.com/')
+        await session.close()
+        return r.status, data, versions, cookies, session.closed
+
+    status, data, versions, cookies, is_closed = asyncio.run(main())
+    assert (status, data) == (200, {'text': 'hi'})
+    assert len(versions) == 1
+    assert cookies['sid'].value == '1' and cookies['lang'].value == 'en'
+    assert is_closed
+
+
+def test_endpoint_selector_prefers_fast_healthy_hosts():
+    selector = transport.EndpointSelector(probe_interval_seconds=float('inf'), ewma_alpha=0.5)
+    assert selector.select('Bing', 'https://www.bing.com') == 'https://www.bing.com'
+
+    selector.set_candidates('Bing', ['https://www.bing.com/', 'https://cn.bing.com'])
+    assert selector.select('Bing', 'https://www.bing.com') == 'https://www.bing.com'  # unmeasured, default first.
+    selector.record('https://cn.bing.com', 0.1, True)
+    selector.record('https://www.bing.com', 0.3, True)
+    assert selector.select('Bing', 'https://www.bing.com') == 'https://cn.bing.com'
+
+    for _ in range(2):
+        selector.record('https://cn.bing.com', None, False)
+    assert selector.select('Bing', 'https://www.bing.com') == 'https://www.bing.com'
+    assert selector.info()['failovers'] == 2
+    assert selector.info()['hosts']['https://cn.bing.com']['success_rate'] == 0.25
+
+    selector.set_candidates('Bing', None)
+    assert selector.select('Bing', 'https://www.bing.com') == 'https://www.bing.com'
+
+
+def test_endpoint_selector_probes(monkeypatch):
+    class FakeProbeSession:
+        def head(self, url, timeout=None, allow_redirects=True):
+            if 'cn.' in url:
+                raise ConnectionError(url)
+            return type('Response', (), {'status_code': 200})()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(transport.requests, 'Session', FakeProbeSession)
+    selector = transport.EndpointSelector()
+    selector.set_candidates('Bing', ['https://www.bing.com', 'https://cn.bing.com'])
+    selector.probe('Bing')
+    hosts = selector.info()['hosts']
+    assert hosts['https://www.bing.com']['success_rate'] == 1.0
+    assert hosts['https://cn.bing.com']['success_rate'] == 0.0
+    assert not selector._is_probe_due('Bing')
+
+
+def test_endpoint_selector_observes_real_requests():
+    selector = transport.EndpointSelector(probe_interval_seconds=float('inf'))
+    selector.set_candidates('Bing', ['https://www.bing.com', 'https://cn.bing.com'])
+    translator = type('Bing', (), {'host_url': 'https://cn.bing.com'})()
+    selector.observe(translator, 0.2, True)
+    selector.observe(type('Bing', (), {'host_url': 'https://other.example.com'})(), 0.2, True)
+    assert list(selector.info()['hosts']) == ['https://cn.bing.com']
+
+
+def test_text_scanner_stops_once_every_pattern_is_found():
+    scanner = transport.TextScanner((r'IG:"(\w+)"', r'token="(\w+)"'))
+    assert not scanner.feed(b'<html>IG:"abc"')
+    assert not scanner.feed('中'.encode('utf-8')[:2])  # a character cut between chunks is decoded whole.
+    assert scanner.feed('中'.encode('utf-8')[2:] + b' token="xyz"')
+    assert scanner.text == '<html>IG:"abc"中 token="xyz"'
+    assert scanner.n_bytes == len('<html>IG:"abc"中 token="xyz"'.encode('utf-8'))
+
+    assert transport.TextScanner(()).is_done()
+    scanner = transport.TextScanner(None)
+    assert not scanner.feed(b'IG:"abc"')
+    assert scanner.close() == 'IG:"abc"'
+
+
+def test_stream_stats_counts_bytes_saved():
+    stats = transport.StreamStats()
+    stats.record('Bing', 'https://www.bing.com/translator', 30000, is_stopped=True)
+    assert stats.info('Bing') == {'requests': 1, 'stopped': 1, 'bytes_read': 30000, 'bytes_saved': 0}
+
+    stats.record('Bing', 'https://www.bing.com/translator', 100000, is_stopped=False)
+    stats.record('Bing', 'https://www.bing.com/translator', 20000, is_stopped=True)
+    stats.record('Bing', 'https://www.bing.com/other', 20000, is_stopped=True, full_size=50000)
+    assert stats.info('Bing') == {'requests': 4, 'stopped': 3, 'bytes_read': 170000, 'bytes_saved': 110000}
+
+    stats.clear()
+    assert stats.info() == {}
+
+
+def test_read_text_until_closes_once_tokens_are_found():
+    body = b'<script>IG:"abc"</script>' + b'x' * 100000
+    sent_headers = []
+
+    def handler(request):
+        sent_headers.append(request.headers)
+        return httpx.Response(200, content=body, headers={'Content-Type': 'text/html; charset=utf-8'})
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        text, n_bytes, is_stopped, full_size = transport.read_text_until(
+            client, 'https://www.bing.com/translator', {}, None, patterns=(r'IG:"(\w+)"',), chunk_size=1024)
+        assert is_stopped and 'IG:"abc"' in text and n_bytes < len(body)
+        assert full_size == len(body)
+        assert 'gzip' in sent_headers[0]['Accept-Encoding']
+
+        text, n_bytes, is_stopped, _ = transport.read_text_until(
+            client, 'https://www.bing.com/translator', {}, None, patterns=None, chunk_size=1024)
+        assert not is_stopped and n_bytes == len(body) and text == body.decode()
+
+
+def get_result(host, address, family=socket.AF_INET, port=0):
+    return {'hostname': host, 'host': address, 'port': port, 'family': family, 'proto': 0, 'flags': 0}
+
+
+def test_dns_cache_orders_by_address_preference():
+    cache = transport.DnsCache(address_preference='ipv6')
+    results = [get_result('h', '1.1.1.1'), get_result('h', '::1', socket.AF_INET6), get_result('h', '2.2.2.2')]
+    cache.set(('h', 443, socket.AF_UNSPEC), results)
+    assert [r['host'] for r in cache.resolve('h', 443)] == ['::1', '1.1.1.1', '2.2.2.2']
+
+    cache.configure(address_preference='ipv4_only')
+    assert cache.get_family() == socket.AF_INET
+    cache.set(('h', 443, socket.AF_INET), results[::2])
+    assert [r['host'] for r in cache.resolve('h', 443)] == ['1.1.1.1', '2.2.2.2']
+    assert cache.info()['hits'] == 2
+
+    cache.invalidate('h')
+    assert cache.get(('h', 443, socket.AF_INET)) is None
+
+
+@pytest.fixture
+def http_server():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = self.headers['Host'].encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_sessions_connect_by_dns_cache_and_fail_over(monkeypatch, http_server):
+    cache = transport.DnsCache()
+    monkeypatch.setattr(transport, 'dns_cache', cache)
+    key = ('translate.example', http_server, socket.AF_UNSPEC)
+    cache.set(key, [get_result('translate.example', '127.0.0.2'), get_result('translate.example', '127.0.0.1')])
+    session = transport.Transport(max_retries=0).get_session('requests')
+    assert isinstance(session.get_adapter('https://www.bing.com'), transport.DnsCachedHTTPAdapter)
+
+    r = session.get(f'http://translate.example:{http_server}/')
+    assert r.text == f'translate.example:{http_server}'  # server bound to 127.0.0.1 only, 127.0.0.2 refused.
+    assert cache.info()['hits'] == 1
+
+    cache.set(key, [get_result('translate.example', '127.0.0.2')])
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get(f'http://translate.example:{http_server}/')
+    assert cache.info()['entries'] == 0  # invalidated, resolved again next time.
+    session.close()
+
+
+def test_sessions_send_the_host_of_each_redirect(monkeypatch, http_server):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(302)
+            self.send_header('Location', f'http://other.example:{http_server}/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    redirect_server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=redirect_server.serve_forever, daemon=True).start()
+    port = redirect_server.server_address[1]
+    cache = transport.DnsCache()
+    monkeypatch.setattr(transport, 'dns_cache', cache)
+    cache.set(('translate.example', port, socket.AF_UNSPEC), [get_result('translate.example', '127.0.0.1')])
+    cache.set(('other.example', http_server, socket.AF_UNSPEC), [get_result('other.example', '127.0.0.1')])
+    session = transport.Transport(max_retries=0).get_session('requests')
+    try:
+        r = session.get(f'http://translate.example:{port}/')
+        assert r.history[0].status_code == 302
+        assert r.text == f'other.example:{http_server}'
+        assert 'Host' not in r.request.headers
+    finally:
+        session.close()
+        redirect_server.shutdown()
+        redirect_server.server_close()
+
+
+def test_cloudscraper_sessions_keep_cipher_suite():
+    session = transport.Transport(pool_maxsize=16).get_session('cloudscraper')
+    adapter = session.get_adapter('https://www.bing.com')
+    assert isinstance(adapter, transport.DnsCachedCipherSuiteAdapter)
+    assert adapter.poolmanager.connection_pool_kw['ssl_context'] is adapter.ssl_context
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == 16
+    session.close()
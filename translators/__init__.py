@@ -4,19 +4,28 @@ __author__ = "UlionTse"
 from translators.server import (
     translate_text,
     translate_html,
+    translate_many,
+    translate_text_future,
     translators_pool,
     get_languages,
     get_region_of_server,
     preaccelerate_and_speedtest,
 )
 
-import translators.server_async as server_async
+
+def __getattr__(name: str):
+    if name == 'server_async':  # imported on first use, it starts nothing until then.
+        import translators.server_async as server_async
+        return server_async
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 __all__ = (
     "__version__",
     "__author__",
     "translate_text",
     "translate_html",
+    "translate_many",
+    "translate_text_future",
     "translators_pool",
     "get_languages",
     "get_region_of_server",
@@ -2,6 +2,7 @@ import sys
 import time
 import random
 import warnings
+import threading
 import functools
 import urllib.parse
 from typing import Optional, Union, Tuple
@@ -11,11 +12,17 @@ import niquests
 import cloudscraper
 import aiohttp
 
+from translators.cache import language_map_snapshot, token_vault, resource_cache, negative_cache
+from translators.cache import session_lifetime, is_rejection_error
+from translators.concurrency import RefreshGate, AsyncRefreshGate
+from translators.transport import transport, async_transport, endpoint_selector, stream_stats, Http2AsyncSession
+from translators.transport import read_text_until, read_text_until_async
+
 LangMapKwargsType = Union[str, bool]
 ApiKwargsType = Union[str, int, float, bool, dict]
 SessionType = Union[requests.sessions.Session, niquests.sessions.Session, httpx.Client]
 ResponseType = Union[requests.models.Response, niquests.models.Response, httpx.Response]
-AsyncSessionType = aiohttp.ClientSession
+AsyncSessionType = Union[aiohttp.ClientSession, Http2AsyncSession]
 AsyncResponseType = aiohttp.ClientResponse
 
 
@@ -36,6 +43,15 @@ class Tse:
         self.auto_pool = ('auto', 'detect', 'auto-detect', 'all')
         self.zh_pool = ('zh', 'zh-CN', 'zh-cn', 'zh-CHS', 'zh-Hans', 'zh-Hans_CN', 'cn', 'chi', 'Chinese')
         self.session: Optional[SessionType] = None
+        self.is_vault_restored = False
+        self.is_vault_deferred = False  # warming up in the background, see `take_over`.
+        self.deferred_vault_item: Optional[tuple] = None
+        self.is_temp_language_map = False
+        self.identity = 0
+        self.is_line_native = False  # lines of a query go as a list on the wire, and come back line for line.
+        self.refresh_gate = RefreshGate()
+        self.async_refresh_gate = AsyncRefreshGate()
+        self.query_count_lock = threading.Lock()
 
     @staticmethod
     def time_stat(func):
@@ -145,6 +161,7 @@ class Tse:
                        if_check_lang_reverse: bool = True,
                        ) -> Tuple[str, str]:
 
+        raw_from_language, raw_to_language = from_language, to_language
         if output_en_translator:
             from_language, to_language = self.check_en_lang(from_language, to_language, output_en_translator, output_en)
 
@@ -153,15 +170,19 @@ class Tse:
         to_language = output_zh if to_language in self.zh_pool else to_language
 
         if from_language != output_auto and from_language not in language_map:
-            raise TranslatorError(
-                'Unsupported from_language[{}] in {}.'.format(from_language, sorted(language_map.keys())))
+            error = 'Unsupported from_language[{}] in {}.'.format(from_language, sorted(language_map.keys()))
         elif to_language not in language_map and if_check_lang_reverse:
-            raise TranslatorError('Unsupported to_language[{}] in {}.'.format(to_language, sorted(language_map.keys())))
+            error = 'Unsupported to_language[{}] in {}.'.format(to_language, sorted(language_map.keys()))
         elif from_language != output_auto and to_language not in language_map[from_language]:
-            raise TranslatorError('Unsupported translation: from [{0}] to [{1}]!'.format(from_language, to_language))
+            error = 'Unsupported translation: from [{0}] to [{1}]!'.format(from_language, to_language)
         elif from_language == to_language:
-            raise TranslatorError(f'from_language[{from_language}] and to_language[{to_language}] should not be same.')
-        return from_language, to_language
+            error = f'from_language[{from_language}] and to_language[{to_language}] should not be same.'
+        else:
+            return from_language, to_language
+
+        if not self.is_temp_language_map:
+            negative_cache.set_unsupported(type(self).__name__, raw_from_language, raw_to_language, error)
+        raise TranslatorError(error)
 
     @staticmethod
     def warning_auto_lang(translator: str, default_from_language: str, if_print_warning: bool = True) -> str:
@@ -197,12 +218,26 @@ class Tse:
 
         @functools.wraps(func)
         def _wrapper(*args, **kwargs):
+            snapshot_name = type(args[0]).__name__
+            args[0].is_temp_language_map = False
+            language_map = language_map_snapshot.get(snapshot_name)
+            if language_map:
+                return language_map
+
+            if negative_cache.is_language_map_failed(snapshot_name):
+                args[0].is_temp_language_map = True
+                return make_temp_language_map(kwargs.get('from_language'), kwargs.get('to_language'),
+                                              kwargs.get('default_from_language'))
+
             try:
                 language_map = func(*args, **kwargs)
                 if not language_map:
                     raise TranslatorError
+                language_map_snapshot.set(snapshot_name, language_map)
                 return language_map
             except Exception as e:
+                negative_cache.set_language_map_failure(snapshot_name)
+                args[0].is_temp_language_map = True
                 if kwargs.get('if_print_warning', True):
                     warnings.warn(f'GetLanguageMapError: {str(e)}.\nThe function make_temp_language_map() works.')
                 return make_temp_language_map(kwargs.get('from_language'), kwargs.get('to_language'),
@@ -226,12 +261,26 @@ class Tse:
 
         @functools.wraps(func)
         async def _wrapper(*args, **kwargs):
+            snapshot_name = type(args[0]).__name__
+            args[0].is_temp_language_map = False
+            language_map = language_map_snapshot.get(snapshot_name)
+            if language_map:
+                return language_map
+
+            if negative_cache.is_language_map_failed(snapshot_name):
+                args[0].is_temp_language_map = True
+                return make_temp_language_map(kwargs.get('from_language'), kwargs.get('to_language'),
+                                              kwargs.get('default_from_language'))
+
             try:
                 language_map = await func(*args, **kwargs)
                 if not language_map:
                     raise TranslatorError
+                language_map_snapshot.set(snapshot_name, language_map)
                 return language_map
             except Exception as e:
+                negative_cache.set_language_map_failure(snapshot_name)
+                args[0].is_temp_language_map = True
                 if kwargs.get('if_print_warning', True):
                     warnings.warn(f'GetLanguageMapError: {str(e)}.\nThe function make_temp_language_map() works.')
                 return make_temp_language_map(kwargs.get('from_language'), kwargs.get('to_language'),
@@ -354,6 +403,151 @@ class Tse:
 
         return _wrapper
 
+    def add_query_count(self) -> None:
+        with self.query_count_lock:
+            self.query_count += 1
+
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        """Whether the secrets the api needs besides the session(token, sign, key...) are acquired."""
+        return True
+
+    def is_session_ready(self, **kwargs: ApiKwargsType) -> bool:
+        update_session_after_freq = kwargs.get('update_session_after_freq', self.default_session_freq)
+        update_session_after_seconds = kwargs.get('update_session_after_seconds', self.default_session_seconds)
+        return bool(getattr(self, 'session', None) and getattr(self, 'language_map', None)
+                    and self.query_count % update_session_after_freq != 0
+                    and time.time() - self.begin_time < update_session_after_seconds
+                    and self.is_secrets_ready(**kwargs))
+
+    def is_session_expiring(self, lead_ratio: float = 0.8, is_async: bool = False) -> bool:
+        if not getattr(self, 'async_session' if is_async else 'session', None):
+            return False
+        return (time.time() - self.begin_time >= lead_ratio * self.default_session_seconds
+                or self.query_count % self.default_session_freq >= lead_ratio * self.default_session_freq)
+
+    @staticmethod
+    def single_flight_refresh(func):
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            self = args[0]
+            is_learned = 'update_session_after_freq' not in kwargs and 'update_session_after_seconds' not in kwargs
+            if is_learned:
+                session_lifetime.apply(self)
+            is_ready = self.is_session_ready(**kwargs)
+
+            t1 = time.time()
+            try:
+                result = self.refresh_gate.run(lambda: self.is_session_ready(**kwargs), func, *args, **kwargs)
+                endpoint_selector.observe(self, time.time() - t1, True)
+                session_lifetime.record_success(self)
+                return result
+            except Exception as e:
+                if not isinstance(e, TranslatorError):
+                    endpoint_selector.observe(self, time.time() - t1, False)
+                if not (is_ready and self.session and is_rejection_error(e)):
+                    raise
+                if is_learned:
+                    session_lifetime.record_rejection(self)
+                self.reset_rejected_session()
+                return self.refresh_gate.run(lambda: self.is_session_ready(**kwargs), func, *args, **kwargs)
+
+        return _wrapper
+
+    def select_host_url(self, default_host_url: str, is_async: bool = False) -> str:
+        host_url = endpoint_selector.select(type(self).__name__, default_host_url, is_async=is_async)
+        if self.host_url and host_url != self.host_url:  # cookies and tokens belong to the previous host.
+            if is_async:
+                async_transport.discard(getattr(self, 'async_session', None))
+                self.async_session = None
+            else:
+                self.session = None
+        return host_url
+
+    def reset_rejected_session(self, is_async: bool = False) -> None:
+        """
+        Re-acquire only what a rejection invalidates: session, cookies and tokens. `language_map` is kept, and its
+        snapshot spares scraping it again.
+        """
+        token_vault.invalidate(self.get_identity_name())
+        self.is_vault_restored = False
+        setattr(self, 'async_session' if is_async else 'session', None)
+
+    def is_async_session_ready(self, **kwargs: ApiKwargsType) -> bool:
+        update_session_after_freq = kwargs.get('update_session_after_freq', self.default_session_freq)
+        update_session_after_seconds = kwargs.get('update_session_after_seconds', self.default_session_seconds)
+        return bool(getattr(self, 'async_session', None) and getattr(self, 'language_map', None)
+                    and self.query_count % update_session_after_freq != 0
+                    and time.time() - self.begin_time < update_session_after_seconds
+                    and self.is_secrets_ready(**kwargs))
+
+    @staticmethod
+    def single_flight_refresh_async(func):
+        @functools.wraps(func)
+        async def _wrapper(*args, **kwargs):
+            self = args[0]
+            is_learned = 'update_session_after_freq' not in kwargs and 'update_session_after_seconds' not in kwargs
+            if is_learned:
+                session_lifetime.apply(self)
+            is_ready = self.is_async_session_ready(**kwargs)
+
+            t1 = time.time()
+            try:
+                result = await self.async_refresh_gate.run(lambda: self.is_async_session_ready(**kwargs), func,
+                                                           *args, **kwargs)
+                endpoint_selector.observe(self, time.time() - t1, True)
+                session_lifetime.record_success(self)
+                return result
+            except Exception as e:
+                if not isinstance(e, TranslatorError):
+                    endpoint_selector.observe(self, time.time() - t1, False)
+                if not (is_ready and getattr(self, 'async_session', None) and is_rejection_error(e)):
+                    raise
+                if is_learned:
+                    session_lifetime.record_rejection(self)
+                self.reset_rejected_session(is_async=True)
+                return await self.async_refresh_gate.run(lambda: self.is_async_session_ready(**kwargs), func,
+                                                         *args, **kwargs)
+
+        return _wrapper
+
+    @staticmethod
+    def reacquire_secrets(func):
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except TranslatorError:
+                raise
+            except Exception:
+                self = args[0]
+                if not self.is_vault_restored:
+                    raise
+                token_vault.invalidate(self.get_identity_name())
+                self.is_vault_restored = False
+                self.session = None
+                return func(*args, **kwargs)
+
+        return _wrapper
+
+    @staticmethod
+    def reacquire_secrets_async(func):
+        @functools.wraps(func)
+        async def _wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except TranslatorError:
+                raise
+            except Exception:
+                self = args[0]
+                if not self.is_vault_restored:
+                    raise
+                token_vault.invalidate(self.get_identity_name())
+                self.is_vault_restored = False
+                self.async_session = None
+                return await func(*args, **kwargs)
+
+        return _wrapper
+
     # @staticmethod
     # def certified(func):
     #     @functools.wraps(func)
@@ -365,32 +559,127 @@ class Tse:
     #     return _wrapper
 
     @staticmethod
-    def get_client_session(http_client: str = 'requests', proxies: Optional[dict] = None) -> SessionType:
+    def get_client_session(http_client: str = 'requests', proxies: Optional[dict] = None,
+                           name: Optional[str] = None) -> SessionType:
         if http_client not in ('requests', 'niquests', 'httpx', 'cloudscraper'):
             raise TranslatorError
 
-        if proxies is None:
-            proxies = {}
-
-        if http_client == 'requests':
-            session = requests.Session()
-            session.proxies = proxies
-        elif http_client == 'niquests':
-            session = niquests.Session(happy_eyeballs=True)
-            session.proxies = proxies
-        elif http_client == 'httpx':
-            proxy_url = proxies.get('http') or proxies.get('https')
-            session = httpx.Client(follow_redirects=True, proxy=proxy_url)
-        else:
-            session = cloudscraper.create_scraper()
-            session.proxies = proxies
-        return session
+        return transport.get_session(http_client, proxies, name)
+
+    def renew_session(self, http_client: str = 'requests', proxies: Optional[dict] = None) -> SessionType:
+        return self.get_client_session(http_client, proxies, name=type(self).__name__)
+
+    @staticmethod
+    def get_async_client_session(proxies: Optional[dict] = None, name: str = 'default') -> AsyncSessionType:
+        return async_transport.get_session(name, proxies)
+
+    def renew_async_session(self, proxies: Optional[dict] = None) -> AsyncSessionType:
+        async_transport.discard(getattr(self, 'async_session', None))
+        return self.get_async_client_session(proxies, name=type(self).__name__)
+
+    @staticmethod
+    def get_session_cookies(session: Union[SessionType, AsyncSessionType]) -> dict:
+        if isinstance(session, (aiohttp.ClientSession, Http2AsyncSession)):
+            return {morsel.key: morsel.value for morsel in session.cookie_jar}
+        if isinstance(session, httpx.Client):
+            return {cookie.name: cookie.value for cookie in session.cookies.jar}
+        return {cookie.name: cookie.value for cookie in session.cookies}
 
     @staticmethod
-    def get_async_client_session(proxies: Optional[dict] = None) -> AsyncSessionType:
-        if proxies is None:
-            proxies = {}
-        # TODO: Add proxies
-        session = aiohttp.ClientSession()
-        return session
+    def set_session_cookies(session: Union[SessionType, AsyncSessionType], cookies: dict) -> None:
+        if isinstance(session, (aiohttp.ClientSession, Http2AsyncSession)):
+            session.cookie_jar.update_cookies(cookies)
+        else:
+            session.cookies.update(cookies)
+
+    def get_identity_name(self) -> str:
+        return f'{type(self).__name__}#{self.identity}' if self.identity else type(self).__name__
+
+    def get_vault_secrets(self, session: Union[SessionType, AsyncSessionType]) -> Optional[dict]:
+        item = None if self.is_vault_deferred else token_vault.get(self.get_identity_name())
+        self.is_vault_restored = bool(item)
+        if not item:
+            return None
+
+        self.set_session_cookies(session, item['cookies'])
+        return item['secrets']
+
+    def set_vault_secrets(self, secrets: dict, session: Union[SessionType, AsyncSessionType],
+                          ttl_seconds: Optional[float] = None) -> None:
+        if self.is_vault_deferred:
+            self.deferred_vault_item = (secrets, self.get_session_cookies(session), ttl_seconds)
+            return
+        token_vault.set(self.get_identity_name(), secrets, self.get_session_cookies(session), ttl_seconds)
+
+    def take_over(self, translator: 'Tse') -> None:
+        """
+        Take the session, secrets and language map of `translator`, a new instance of the same identity warmed up in
+        the background with `is_vault_deferred`, keeping the gates of this instance. Only then are the secrets of the
+        vault replaced by the new ones. Called while no request runs on this instance.
+        """
+        self.__dict__.update({k: v for k, v in translator.__dict__.items()
+                              if k not in ('refresh_gate', 'async_refresh_gate', 'query_count_lock')})
+        self.is_vault_deferred, deferred_vault_item, self.deferred_vault_item = False, self.deferred_vault_item, None
+        token_vault.invalidate(self.get_identity_name())
+        if deferred_vault_item:
+            token_vault.set(self.get_identity_name(), *deferred_vault_item)
+
+    def get_resource_text(self, session: SessionType, url: str, headers: dict, timeout: Optional[float],
+                          if_raise_for_status: bool = False) -> str:
+        cached = resource_cache.get(url)
+        if cached and resource_cache.is_immutable_url(url):
+            resource_cache.record(cached, 'hit')
+            return cached['text']
+
+        r = session.get(url, headers={**headers, **resource_cache.get_conditional_headers(cached)}, timeout=timeout)
+        if r.status_code == 304 and cached:
+            resource_cache.record(cached, 'revalidated')
+            return cached['text']
+        if if_raise_for_status:
+            r.raise_for_status()
+
+        resource_cache.record(cached, 'miss')
+        if r.status_code == 200:
+            resource_cache.set(url, r.text, r.headers.get('ETag'), r.headers.get('Last-Modified'))
+        return r.text
+
+    async def get_resource_text_async(self, session: AsyncSessionType, url: str, headers: dict,
+                                      timeout: Optional[float], if_raise_for_status: bool = False) -> str:
+        cached = resource_cache.get(url)
+        if cached and resource_cache.is_immutable_url(url):
+            resource_cache.record(cached, 'hit')
+            return cached['text']
+
+        r = await session.get(url, headers={**headers, **resource_cache.get_conditional_headers(cached)},
+                              timeout=timeout)
+        if r.status == 304 and cached:
+            resource_cache.record(cached, 'revalidated')
+            return cached['text']
+        if if_raise_for_status:
+            r.raise_for_status()
+
+        resource_cache.record(cached, 'miss')
+        text = await r.text()
+        if r.status == 200:
+            resource_cache.set(url, text, r.headers.get('ETag'), r.headers.get('Last-Modified'))
+        return text
+
+    def is_language_map_cached(self) -> bool:
+        return bool(language_map_snapshot.get(type(self).__name__))
+
+    def get_host_text(self, session: SessionType, url: str, headers: dict, timeout: Optional[float],
+                      patterns: Optional[Tuple[str, ...]] = None) -> str:
+        """
+        GET a host page only until every one of `patterns`(the tokens needed) is found, then close the connection.
+        None means reading all of it, eg: its language map is needed, and () means reading none of it.
+        """
+        text, n_bytes, is_stopped, full_size = read_text_until(session, url, headers, timeout, patterns)
+        stream_stats.record(type(self).__name__, url, n_bytes, is_stopped, full_size)
+        return text
+
+    async def get_host_text_async(self, session: AsyncSessionType, url: str, headers: dict, timeout: Optional[float],
+                                  patterns: Optional[Tuple[str, ...]] = None) -> str:
+        text, n_bytes, is_stopped, full_size = await read_text_until_async(session, url, headers, timeout, patterns)
+        stream_stats.record(type(self).__name__, url, n_bytes, is_stopped, full_size)
+        return text
 
@@ -0,0 +1,1267 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import difflib
+import hashlib
+import inspect
+import functools
+import threading
+import unicodedata
+import collections
+from typing import Optional, Tuple, Callable, Dict, List
+
+
+CacheKeyType = Tuple[str, str, str, str]
+
+AUTO_POOL = ('auto', 'detect', 'auto-detect', 'all')
+ZH_POOL = ('zh', 'zh-CN', 'zh-cn', 'zh-CHS', 'zh-Hans', 'zh-Hans_CN', 'cn', 'chi', 'Chinese')
+RESULT_KWARGS = ('professional_field', 'lingvanex_model', 'myMemory_mode')
+TRANSPORT_KWARGS = ('http_client', 'proxies')
+HTTP_CLIENT_MODULES = ('requests', 'niquests', 'urllib3', 'cloudscraper', 'httpx', 'httpcore', 'aiohttp')
+SNAPSHOT_VERSION = 1
+TOKEN_VAULT_VERSION = 1
+IMMUTABLE_URL_PATTERN = re.compile(r'[._-](?=[\w-]*\d)[\w-]{7,}\.(js|css)(\?|$)|/v\d+(\.\d+)+/')  # hashed or versioned
+REJECTION_STATUS_CODES = (401, 403, 419)
+MIN_SESSION_LIFETIME_RATIO = 0.01
+CAPTCHA_PATTERN = re.compile(r'captcha|unusual traffic|are you a robot|verify you are human', re.I)
+
+
+def get_cache_dir() -> str:
+    cache_dir = os.environ.get('translators_cache_dir', None)
+    if not cache_dir:
+        xdg_cache_home = os.environ.get('XDG_CACHE_HOME', None) or os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(xdg_cache_home, 'translators')
+    return cache_dir
+
+
+def normalize_language(language: str) -> str:
+    if language in AUTO_POOL:
+        return 'auto'
+    if language in ZH_POOL:
+        return 'zh'
+    return language
+
+
+def normalize_text(query_text: str) -> str:
+    return unicodedata.normalize('NFC', query_text.strip())
+
+
+def get_cache_key(translator: str, query_text: str, from_language: str, to_language: str,
+                  **kwargs) -> CacheKeyType:
+    """
+    Key of one translation: (translator, from_language, to_language, text_hash).
+    Kwargs which change the result (eg: professional_field) are hashed together with the text.
+    """
+    variant = get_cache_variant(**kwargs)
+    text_hash = hashlib.sha256(f'{variant}\x00{normalize_text(query_text)}'.encode('utf-8')).hexdigest()
+    return translator, normalize_language(from_language), normalize_language(to_language), text_hash
+
+
+def get_cache_variant(**kwargs) -> str:
+    return '&'.join(f'{k}={kwargs[k]}' for k in RESULT_KWARGS if kwargs.get(k) is not None)
+
+
+def get_transport_variant(**kwargs) -> str:
+    """Transport a request goes through, as far as it changes whether the translator can be reached."""
+    return '&'.join(f'{k}={sorted(kwargs[k].items()) if isinstance(kwargs[k], dict) else kwargs[k]}'
+                    for k in TRANSPORT_KWARGS if kwargs.get(k))
+
+
+def get_cache_namespace(translator: str, from_language: str, to_language: str, **kwargs) -> Tuple[str, str, str, str]:
+    return translator, normalize_language(from_language), normalize_language(to_language), get_cache_variant(**kwargs)
+
+
+def get_sqlite_connection(db_path: str, busy_timeout_seconds: float = 5.0) -> sqlite3.Connection:
+    """
+    Connection in WAL mode, so that many processes on one host can read while one of them writes.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=busy_timeout_seconds, check_same_thread=False, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+class TranslationMemory:
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[float] = None, max_size: int = int(1e6)):
+        """
+        Persistent translation memory based on sqlite.
+        :param db_path: Optional[str], default None. None means `{get_cache_dir()}/translation_memory.sqlite3`.
+        :param ttl_seconds: Optional[float], default None. None means never expired.
+        :param max_size: int, default 1000000. The oldest translations are evicted beyond it.
+        """
+        self.db_path = db_path or os.path.join(get_cache_dir(), 'translation_memory.sqlite3')
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.prune_interval = max(1, min(int(1e3), self.max_size // 100))
+        self.hits = 0
+        self.misses = 0
+        self._set_count = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_lock': None, '_conn': None, '_conn_pid': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None or self._conn_pid != os.getpid():  # never reuse a connection across fork.
+            conn = get_sqlite_connection(self.db_path)
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS translation_memory ('
+                'translator TEXT NOT NULL, from_language TEXT NOT NULL, to_language TEXT NOT NULL, '
+                'text_hash TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL, '
+                'PRIMARY KEY (translator, from_language, to_language, text_hash))'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON translation_memory (created_at)')
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, key: CacheKeyType) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT result, created_at FROM translation_memory '
+                'WHERE translator=? AND from_language=? AND to_language=? AND text_hash=?', key
+            ).fetchone()
+
+            if row is None or (self.ttl_seconds is not None and time.time() - row[1] > self.ttl_seconds):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: CacheKeyType, result: str) -> None:
+        if not isinstance(result, str):
+            return
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute('INSERT OR REPLACE INTO translation_memory VALUES (?, ?, ?, ?, ?, ?)',
+                         (*key, result, time.time()))
+            self._set_count += 1
+            if self._set_count % self.prune_interval == 0:
+                self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        if self.ttl_seconds is not None:
+            conn.execute('DELETE FROM translation_memory WHERE created_at < ?', (time.time() - self.ttl_seconds,))
+
+        size = conn.execute('SELECT COUNT(*) FROM translation_memory').fetchone()[0]
+        if size > self.max_size:
+            conn.execute('DELETE FROM translation_memory WHERE rowid IN '
+                         '(SELECT rowid FROM translation_memory ORDER BY created_at LIMIT ?)', (size - self.max_size,))
+
+    def clear(self, translator: Optional[str] = None) -> None:
+        with self._lock:
+            if translator is None:
+                self._connect().execute('DELETE FROM translation_memory')
+            else:
+                self._connect().execute('DELETE FROM translation_memory WHERE translator=?', (translator,))
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            size = self._connect().execute('SELECT COUNT(*) FROM translation_memory').fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': size,
+            'max_size': self.max_size,
+            'ttl_seconds': self.ttl_seconds,
+            'db_path': self.db_path,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+class SharedStore:
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Key-value store of json values based on sqlite in WAL mode, which processes on one host share safely.
+        Used by LanguageMapSnapshot and TokenVault instead of their json files, so that the warm-up of one process
+        benefits all the others.
+        :param db_path: Optional[str], default None. None means `{get_cache_dir()}/shared_cache.sqlite3`.
+        """
+        self.db_path = db_path or os.path.join(get_cache_dir(), 'shared_cache.sqlite3')
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_lock': None, '_conn': None, '_conn_pid': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = get_sqlite_connection(self.db_path)
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS shared_store ('
+                'namespace TEXT NOT NULL, name TEXT NOT NULL, value TEXT NOT NULL, updated_at REAL NOT NULL, '
+                'PRIMARY KEY (namespace, name))'
+            )
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, namespace: str, name: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connect().execute('SELECT value FROM shared_store WHERE namespace=? AND name=?',
+                                          (namespace, name)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_all(self, namespace: str) -> Dict[str, dict]:
+        with self._lock:
+            rows = self._connect().execute('SELECT name, value FROM shared_store WHERE namespace=?',
+                                           (namespace,)).fetchall()
+        return {name: json.loads(value) for name, value in rows}
+
+    def set(self, namespace: str, name: str, value: dict) -> None:
+        value = json.dumps(value, ensure_ascii=False, sort_keys=True, default=sorted)
+        with self._lock:
+            self._connect().execute('INSERT OR REPLACE INTO shared_store VALUES (?, ?, ?, ?)',
+                                    (namespace, name, value, time.time()))
+
+    def delete(self, namespace: str, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._connect().execute('DELETE FROM shared_store WHERE namespace=?', (namespace,))
+            else:
+                self._connect().execute('DELETE FROM shared_store WHERE namespace=? AND name=?', (namespace, name))
+
+
+class FuzzyMemory:
+    def __init__(self, threshold: float = 0.9, ngram_size: int = 3, max_size: int = int(1e5), n_candidates: int = 5):
+        """
+        In-process fuzzy translation memory, which finds near-duplicate texts by a character n-gram index.
+        A near-duplicate is not the same text, so its translation is never served in place of a translation: a match
+        is only returned as it is, with its similarity, by `ResultCache.fuzzy_lookup()`.
+        :param threshold: float, default 0.9. Minimum similarity(difflib ratio of the texts, punctuation and numbers
+                included) between the new and the stored text.
+        :param ngram_size: int, default 3.
+        :param max_size: int, default 100000. The oldest texts are evicted beyond it.
+        :param n_candidates: int, default 5. Number of candidates found by the index to be compared with the text.
+        """
+        self.threshold = threshold
+        self.ngram_size = ngram_size
+        self.max_size = max_size
+        self.n_candidates = n_candidates
+        self.hits = 0
+        self.misses = 0
+        self._next_id = 0
+        self._entries = collections.OrderedDict()  # id: (namespace, query_text, result, ngrams)
+        self._index: Dict[tuple, Dict[str, set]] = collections.defaultdict(lambda: collections.defaultdict(set))
+        self._texts: Dict[tuple, Dict[str, int]] = collections.defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_entries': collections.OrderedDict(), '_index': None, '_texts': None, '_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._index = collections.defaultdict(lambda: collections.defaultdict(set))
+        self._texts = collections.defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def get_ngrams(self, query_text: str) -> set:
+        text = f' {normalize_text(query_text).lower()} '
+        if len(text) <= self.ngram_size:
+            return {text}
+        return {text[i:i + self.ngram_size] for i in range(len(text) - self.ngram_size + 1)}
+
+    def get(self, namespace: tuple, query_text: str) -> Optional[dict]:
+        """
+        The most similar stored text at or above `threshold`, as {'query_text', 'translation', 'score'}, or None.
+        The stored translation is returned unchanged.
+        """
+        query_text = normalize_text(query_text)
+        ngrams = self.get_ngrams(query_text)
+        with self._lock:
+            index = self._index.get(namespace)
+            counter = collections.Counter()
+            if index:
+                for ngram in ngrams:
+                    counter.update(index.get(ngram, ()))
+            candidates = [self._entries[entry_id] for entry_id, _ in counter.most_common(self.n_candidates)]
+
+        best = None
+        for _, stored_text, stored_result, _ in candidates:
+            ratio = difflib.SequenceMatcher(None, stored_text, query_text, autojunk=False).ratio()
+            if ratio >= self.threshold and (best is None or ratio > best['score']):
+                best = {'query_text': stored_text, 'translation': stored_result, 'score': ratio}
+
+        with self._lock:
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return best
+
+    def set(self, namespace: tuple, query_text: str, result: str) -> None:
+        if not (isinstance(result, str) and result):
+            return
+
+        query_text = normalize_text(query_text)
+        ngrams = self.get_ngrams(query_text)
+        with self._lock:
+            old_id = self._texts[namespace].get(query_text)
+            if old_id is not None:
+                self._remove(old_id)
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (namespace, query_text, result, ngrams)
+            self._texts[namespace][query_text] = entry_id
+            index = self._index[namespace]
+            for ngram in ngrams:
+                index[ngram].add(entry_id)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int) -> None:
+        namespace, query_text, _, ngrams = self._entries.pop(entry_id)
+        self._texts[namespace].pop(query_text, None)
+        index = self._index[namespace]
+        for ngram in ngrams:
+            ids = index.get(ngram)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del index[ngram]
+
+    def clear(self, translator: Optional[str] = None) -> None:
+        with self._lock:
+            for entry_id in [k for k, v in self._entries.items() if translator is None or v[0][0] == translator]:
+                self._remove(entry_id)
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'threshold': self.threshold,
+            }
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int = int(64 * 2 ** 20), ttl_seconds: Optional[float] = None,
+                 backend: Optional[TranslationMemory] = None, fuzzy_memory: Optional[FuzzyMemory] = None):
+        """
+        In-process LRU cache of translations, namespaced by translator, optionally on top of a TranslationMemory.
+        :param max_bytes: int, default 64MiB. 0 means only the backend is used.
+        :param ttl_seconds: Optional[float], default None. None means never expired.
+        :param backend: Optional[TranslationMemory], default None.
+        :param fuzzy_memory: Optional[FuzzyMemory], default None. Learns every new translation, asked for
+                near-duplicates by `fuzzy_lookup()` only.
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.fuzzy_memory = fuzzy_memory
+        self.current_bytes = 0
+        self._data = collections.OrderedDict()  # key: (result, expire_at, n_bytes)
+        self._stats: Dict[str, Dict[str, int]] = collections.defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_data': collections.OrderedDict(), 'current_bytes': 0, '_stats': None, '_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._stats = collections.defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self._lock = threading.Lock()
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.max_bytes > 0 or self.backend is not None or self.fuzzy_memory is not None
+
+    def configure(self, max_bytes: int, ttl_seconds: Optional[float] = None) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.ttl_seconds = ttl_seconds
+            self._evict()
+
+    @staticmethod
+    def get_size(key: CacheKeyType, result: str) -> int:
+        return sys.getsizeof(result) + sum(sys.getsizeof(k) for k in key)
+
+    def _evict(self) -> None:
+        while self._data and self.current_bytes > self.max_bytes:
+            _, (_, _, n_bytes) = self._data.popitem(last=False)
+            self.current_bytes -= n_bytes
+
+    def _get_memory(self, key: CacheKeyType) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] < time.time():
+            self.current_bytes -= self._data.pop(key)[2]
+            return None
+        self._data.move_to_end(key)
+        return item[0]
+
+    def _set_memory(self, key: CacheKeyType, result: str) -> None:
+        n_bytes = self.get_size(key, result)
+        if n_bytes > self.max_bytes:
+            return
+        if key in self._data:
+            self.current_bytes -= self._data.pop(key)[2]
+        expire_at = time.time() + self.ttl_seconds if self.ttl_seconds is not None else None
+        self._data[key] = (result, expire_at, n_bytes)
+        self.current_bytes += n_bytes
+        self._evict()
+
+    def get(self, key: CacheKeyType) -> Optional[str]:
+        with self._lock:
+            result = self._get_memory(key)
+        if result is None and self.backend is not None:
+            result = self.backend.get(key)
+            if result is not None:
+                with self._lock:
+                    self._set_memory(key, result)
+
+        with self._lock:
+            self._stats[key[0]]['hits' if result is not None else 'misses'] += 1
+        return result
+
+    def set(self, key: CacheKeyType, result: str) -> None:
+        if not (isinstance(result, str) and result):
+            return
+
+        with self._lock:
+            self._set_memory(key, result)
+        if self.backend is not None:
+            self.backend.set(key, result)
+
+    def store(self, key: CacheKeyType, namespace: tuple, query_text: str, result: str) -> None:
+        self.set(key, result)
+        if self.fuzzy_memory is not None:
+            self.fuzzy_memory.set(namespace, query_text, result)
+
+    def get_many(self, translator: str, query_texts: List[str], from_language: str, to_language: str,
+                 **kwargs) -> Dict[str, str]:
+        results = {}
+        for query_text in query_texts:
+            key = get_cache_key(translator, query_text, from_language, to_language, **kwargs)
+            result = self.get(key)
+            if result is not None:
+                results[query_text] = result
+        return results
+
+    def set_many(self, translator: str, results: Dict[str, str], from_language: str, to_language: str,
+                 **kwargs) -> None:
+        namespace = get_cache_namespace(translator, from_language, to_language, **kwargs)
+        for query_text, result in results.items():
+            key = get_cache_key(translator, query_text, from_language, to_language, **kwargs)
+            self.store(key, namespace, query_text, result)
+
+    def fuzzy_lookup(self, translator: str, query_text: str, from_language: str, to_language: str,
+                     **kwargs) -> Optional[dict]:
+        if self.fuzzy_memory is None:
+            return None
+        namespace = get_cache_namespace(translator, from_language, to_language, **kwargs)
+        return self.fuzzy_memory.get(namespace, query_text)
+
+    def info(self, translator: Optional[str] = None) -> dict:
+        with self._lock:
+            if translator is None:
+                hits = sum(v['hits'] for v in self._stats.values())
+                misses = sum(v['misses'] for v in self._stats.values())
+                size = len(self._data)
+            else:
+                hits, misses = self._stats[translator]['hits'], self._stats[translator]['misses']
+                size = sum(1 for k in self._data if k[0] == translator)
+            info = {
+                'hits': hits,
+                'misses': misses,
+                'size': size,
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+            }
+        if self.backend is not None:
+            info['translation_memory'] = self.backend.info()
+        if self.fuzzy_memory is not None:
+            info['fuzzy_memory'] = self.fuzzy_memory.info()
+        return info
+
+    def clear(self, translator: Optional[str] = None) -> None:
+        with self._lock:
+            if translator is None:
+                self._data.clear()
+                self._stats.clear()
+                self.current_bytes = 0
+            else:
+                for key in [k for k in self._data if k[0] == translator]:
+                    self.current_bytes -= self._data.pop(key)[2]
+                self._stats.pop(translator, None)
+        if self.backend is not None:
+            self.backend.clear(translator)
+        if self.fuzzy_memory is not None:
+            self.fuzzy_memory.clear(translator)
+
+    def _get_lookup(self, translator: str, signature: inspect.Signature, args: tuple,
+                    kwargs: dict) -> Optional[Tuple[CacheKeyType, tuple, str]]:
+        if not (self.is_enabled and kwargs.get('if_use_cache', True) and not kwargs.get('is_detail_result', False)):
+            return None
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        api_kwargs = {k: v for k, v in bound.arguments.items() if k not in ('self', 'query_text')}
+        api_kwargs.update(api_kwargs.pop('kwargs', {}))
+        query_text = bound.arguments.get('query_text')
+        if not isinstance(query_text, str):
+            return None
+        return (get_cache_key(translator, query_text, **api_kwargs),
+                get_cache_namespace(translator, **api_kwargs), query_text)
+
+    def cached(self, translator: str, api_func: Callable) -> Callable:
+        signature = inspect.signature(api_func)
+
+        @functools.wraps(api_func)
+        def _wrapper(*args, **kwargs):
+            lookup = self._get_lookup(translator, signature, args, kwargs)
+            if lookup is None:
+                return api_func(*args, **kwargs)
+
+            result = self.get(lookup[0])
+            if result is None:
+                result = api_func(*args, **kwargs)
+                self.store(*lookup, result)
+            return result
+
+        return _wrapper
+
+    def cached_async(self, translator: str, api_func: Callable) -> Callable:
+        signature = inspect.signature(api_func)
+
+        @functools.wraps(api_func)
+        async def _wrapper(*args, **kwargs):
+            lookup = self._get_lookup(translator, signature, args, kwargs)
+            if lookup is None:
+                return await api_func(*args, **kwargs)
+
+            result = self.get(lookup[0])
+            if result is None:
+                result = await api_func(*args, **kwargs)
+                self.store(*lookup, result)
+            return result
+
+        return _wrapper
+
+
+class LanguageMapSnapshot:
+    def __init__(self, snapshot_path: Optional[str] = None, ttl_seconds: Optional[float] = 7 * 24 * 3600.0):
+        """
+        Versioned on-disk snapshot of `language_map` of translators, keyed by class name of translator.
+        Disabled until configured, it writes nothing to disk before.
+        :param snapshot_path: Optional[str], default None. None means `{get_cache_dir()}/language_map_snapshot.json`.
+        :param ttl_seconds: Optional[float], default 7 days. None means never expired.
+        """
+        self.snapshot_path = snapshot_path or os.path.join(get_cache_dir(), 'language_map_snapshot.json')
+        self.ttl_seconds = ttl_seconds
+        self.is_enabled = False
+        self.shared_store: Optional[SharedStore] = None
+        self._data: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def configure(self, snapshot_path: Optional[str] = None, ttl_seconds: Optional[float] = 7 * 24 * 3600.0,
+                  is_enabled: bool = True) -> None:
+        with self._lock:
+            self.snapshot_path = snapshot_path or os.path.join(get_cache_dir(), 'language_map_snapshot.json')
+            self.ttl_seconds = ttl_seconds
+            self.is_enabled = is_enabled
+            self._data = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_data': None, '_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load(snapshot_path: str) -> dict:
+        try:
+            with open(snapshot_path, 'r', encoding='utf-8') as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+            return {}
+        return snapshot.get('language_maps', {})
+
+    def save(self, snapshot_path: Optional[str] = None) -> None:
+        snapshot_path = snapshot_path or self.snapshot_path
+        with self._lock:
+            snapshot = {'version': SNAPSHOT_VERSION, 'language_maps': dict(self._data or {})}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(snapshot_path)), exist_ok=True)
+            temp_path = f'{snapshot_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(snapshot, file, ensure_ascii=False, sort_keys=True, default=sorted)
+            os.replace(temp_path, snapshot_path)
+        except OSError:
+            pass
+
+    def get(self, name: str) -> Optional[dict]:
+        if not self.is_enabled:
+            return None
+
+        with self._lock:
+            if self.shared_store is not None:
+                item = self.shared_store.get('language_map', name)
+            else:
+                if self._data is None:
+                    self._data = self.load(self.snapshot_path)
+                item = self._data.get(name)
+            if item and (self.ttl_seconds is None or time.time() - item['updated_at'] < self.ttl_seconds):
+                return item['language_map']
+        return None
+
+    def set(self, name: str, language_map: dict) -> None:
+        if not (self.is_enabled and language_map):
+            return
+
+        item = {'language_map': language_map, 'updated_at': time.time()}
+        if self.shared_store is not None:
+            self.shared_store.set('language_map', name, item)
+            return
+
+        with self._lock:
+            if self._data is None:
+                self._data = self.load(self.snapshot_path)
+            self._data[name] = item
+        self.save()
+
+    def clear(self, name: Optional[str] = None) -> None:
+        if self.shared_store is not None:
+            self.shared_store.delete('language_map', name)
+            return
+
+        with self._lock:
+            if self._data is None:
+                self._data = self.load(self.snapshot_path)
+            if name is None:
+                self._data.clear()
+            else:
+                self._data.pop(name, None)
+        self.save()
+
+
+language_map_snapshot = LanguageMapSnapshot()
+
+
+class TokenVault:
+    def __init__(self, vault_path: Optional[str] = None, default_ttl_seconds: float = 1.5e3):
+        """
+        On-disk vault of scraped secrets(tokens, keys, cookies) of translators, keyed by class name of translator.
+        Disabled until configured, it writes nothing to disk before.
+        :param vault_path: Optional[str], default None. None means `{get_cache_dir()}/token_vault.json`.
+        :param default_ttl_seconds: float, default 1500. Used when the translator does not know its own expiry.
+        """
+        self.vault_path = vault_path or os.path.join(get_cache_dir(), 'token_vault.json')
+        self.default_ttl_seconds = default_ttl_seconds
+        self.is_enabled = False
+        self.shared_store: Optional[SharedStore] = None
+        self._data: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def configure(self, vault_path: Optional[str] = None, default_ttl_seconds: float = 1.5e3,
+                  is_enabled: bool = True) -> None:
+        with self._lock:
+            self.vault_path = vault_path or os.path.join(get_cache_dir(), 'token_vault.json')
+            self.default_ttl_seconds = default_ttl_seconds
+            self.is_enabled = is_enabled
+            self._data = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_data': None, '_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load(vault_path: str) -> dict:
+        try:
+            with open(vault_path, 'r', encoding='utf-8') as file:
+                vault = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(vault, dict) or vault.get('version') != TOKEN_VAULT_VERSION:
+            return {}
+        return vault.get('secrets', {})
+
+    def save(self, vault_path: Optional[str] = None) -> None:
+        vault_path = vault_path or self.vault_path
+        with self._lock:
+            vault = {'version': TOKEN_VAULT_VERSION, 'secrets': dict(self._data or {})}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(vault_path)), exist_ok=True)
+            temp_path = f'{vault_path}.{os.getpid()}.tmp'
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(vault, file, ensure_ascii=False, sort_keys=True)
+            os.replace(temp_path, vault_path)
+        except OSError:
+            pass
+
+    def get(self, name: str) -> Optional[dict]:
+        if not self.is_enabled:
+            return None
+
+        with self._lock:
+            if self.shared_store is not None:
+                item = self.shared_store.get('token_vault', name)
+            else:
+                if self._data is None:
+                    self._data = self.load(self.vault_path)
+                item = self._data.get(name)
+            if item and time.time() < item['expire_at']:
+                return item
+        return None
+
+    def set(self, name: str, secrets: dict, cookies: Optional[dict] = None, ttl_seconds: Optional[float] = None) -> None:
+        if not (self.is_enabled and secrets):
+            return
+
+        ttl_seconds = self.default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        acquired_at = time.time()
+        item = {
+            'secrets': secrets,
+            'cookies': cookies or {},
+            'acquired_at': acquired_at,
+            'expire_at': acquired_at + ttl_seconds,
+        }
+        if self.shared_store is not None:
+            self.shared_store.set('token_vault', name, item)
+            return
+
+        with self._lock:
+            if self._data is None:
+                self._data = self.load(self.vault_path)
+            self._data[name] = item
+        self.save()
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        if not self.is_enabled:
+            return
+
+        if self.shared_store is not None:
+            self.shared_store.delete('token_vault', name)
+            return
+
+        with self._lock:
+            if self._data is None:
+                self._data = self.load(self.vault_path)
+            if name is None:
+                self._data.clear()
+            else:
+                self._data.pop(name, None)
+        self.save()
+
+    def info(self) -> dict:
+        if self.shared_store is not None:
+            path, data = self.shared_store.db_path, self.shared_store.get_all('token_vault')
+        else:
+            with self._lock:
+                if self._data is None:
+                    self._data = self.load(self.vault_path)
+                path, data = self.vault_path, dict(self._data)
+
+        now = time.time()
+        return {
+            'path': path,
+            'is_enabled': self.is_enabled,
+            'secrets': {name: {'acquired_at': item['acquired_at'], 'expire_at': item['expire_at'],
+                               'is_expired': now >= item['expire_at']} for name, item in data.items()},
+        }
+
+
+token_vault = TokenVault()
+
+
+class ResourceCache:
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Content-addressed on-disk cache of host pages and js bundles fetched when sessions refresh.
+        Cached resources are revalidated by conditional requests(ETag, Last-Modified), and resources of hashed bundle
+        urls(eg: `index.3f2a9c1b.js`) are treated as immutable and never fetched again.
+        Disabled until configured, it writes nothing to disk before.
+        :param cache_dir: Optional[str], default None. None means `{get_cache_dir()}/resources`.
+        """
+        self.cache_dir = cache_dir or os.path.join(get_cache_dir(), 'resources')
+        self.is_enabled = False
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._meta: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, cache_dir: Optional[str] = None, is_enabled: bool = True) -> None:
+        with self._lock:
+            self.cache_dir = cache_dir or os.path.join(get_cache_dir(), 'resources')
+            self.is_enabled = is_enabled
+            self._meta = {}
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_meta': {}, '_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_immutable_url(url: str) -> bool:
+        return bool(IMMUTABLE_URL_PATTERN.search(url))
+
+    def _get_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temp_path, path)
+
+    def get(self, url: str) -> Optional[dict]:
+        """
+        :return: {'text', 'etag', 'last_modified', 'sha256'} or None.
+        """
+        if not self.is_enabled:
+            return None
+
+        url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        with self._lock:
+            meta = self._meta.get(url_hash)
+        try:
+            if meta is None:
+                with open(self._get_path(f'meta/{url_hash}.json'), 'r', encoding='utf-8') as file:
+                    meta = json.load(file)
+            with open(self._get_path(f'content/{meta["sha256"]}'), 'r', encoding='utf-8') as file:
+                text = file.read()
+        except (OSError, ValueError, KeyError):
+            return None
+
+        with self._lock:
+            self._meta[url_hash] = meta
+        return {**meta, 'text': text}
+
+    def set(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        if not (self.is_enabled and text and (etag or last_modified or self.is_immutable_url(url))):
+            return
+
+        url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        meta = {'url': url, 'etag': etag, 'last_modified': last_modified, 'sha256': content_hash,
+                'fetched_at': time.time()}
+        try:
+            content_path = self._get_path(f'content/{content_hash}')
+            if not os.path.exists(content_path):
+                self._write(content_path, text)
+            self._write(self._get_path(f'meta/{url_hash}.json'), json.dumps(meta))
+        except OSError:
+            return
+
+        with self._lock:
+            self._meta[url_hash] = meta
+
+    @staticmethod
+    def get_conditional_headers(cached: Optional[dict]) -> dict:
+        if not cached:
+            return {}
+
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def record(self, cached: Optional[dict], status: str) -> None:
+        with self._lock:
+            if status == 'hit':
+                self.hits += 1
+            elif status == 'revalidated':
+                self.revalidations += 1
+            else:
+                self.misses += 1
+            if status != 'miss' and cached:
+                self.bytes_saved += len(cached['text'].encode('utf-8'))
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'revalidations': self.revalidations,
+                'misses': self.misses,
+                'bytes_saved': self.bytes_saved,
+                'cache_dir': self.cache_dir,
+            }
+
+
+resource_cache = ResourceCache()
+
+
+class NegativeCache:
+    def __init__(self, pair_ttl_seconds: float = 24 * 3600.0, failure_ttl_seconds: float = 60.0,
+                 failure_threshold: int = 3, language_map_failure_ttl_seconds: float = 600.0):
+        """
+        Remember what is certain to fail, so that such requests fail immediately instead of costing a timeout:
+        unsupported (translator, from_language, to_language) pairs, translators in a failed state after consecutive
+        errors or a failed preacceleration, and translators whose `language_map` could not be scraped.
+        Keyed by class name of translator. The failed state is also keyed by transport(`http_client`, `proxies`), as a
+        bad proxy does not make the translator fail through another one, and only errors of the translator or of the
+        network count towards it(see `is_provider_error`), not errors of the caller.
+        :param pair_ttl_seconds: float, default 1 day.
+        :param failure_ttl_seconds: float, default 60.
+        :param failure_threshold: int, default 3. Number of consecutive errors before a translator is failed.
+        :param language_map_failure_ttl_seconds: float, default 600.
+        """
+        self.pair_ttl_seconds = pair_ttl_seconds
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self.failure_threshold = failure_threshold
+        self.language_map_failure_ttl_seconds = language_map_failure_ttl_seconds
+        self.is_enabled = True
+        self.hits = 0
+        self._pairs: Dict[tuple, Tuple[str, float]] = {}
+        self._failures: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._error_counts: Dict[Tuple[str, str], int] = collections.defaultdict(int)
+        self._language_map_failures: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, pair_ttl_seconds: float = 24 * 3600.0, failure_ttl_seconds: float = 60.0,
+                  failure_threshold: int = 3, language_map_failure_ttl_seconds: float = 600.0,
+                  is_enabled: bool = True) -> None:
+        with self._lock:
+            self.pair_ttl_seconds = pair_ttl_seconds
+            self.failure_ttl_seconds = failure_ttl_seconds
+            self.failure_threshold = failure_threshold
+            self.language_map_failure_ttl_seconds = language_map_failure_ttl_seconds
+            self.is_enabled = is_enabled
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_error_counts': dict(self._error_counts), '_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._error_counts = collections.defaultdict(int, self._error_counts)
+        self._lock = threading.Lock()
+
+    def set_unsupported(self, name: str, from_language: str, to_language: str, reason: str) -> None:
+        if not self.is_enabled:
+            return
+
+        key = (name, normalize_language(from_language), normalize_language(to_language))
+        with self._lock:
+            self._pairs[key] = (reason, time.time() + self.pair_ttl_seconds)
+
+    def set_failed(self, name: str, reason: str, ttl_seconds: Optional[float] = None, transport: str = '') -> None:
+        if not self.is_enabled:
+            return
+
+        ttl_seconds = self.failure_ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._failures[(name, transport)] = (reason, time.time() + ttl_seconds)
+
+    def record_error(self, name: str, error: BaseException, transport: str = '') -> None:
+        if not is_provider_error(error):
+            return
+
+        with self._lock:
+            self._error_counts[(name, transport)] += 1
+            is_failed = self._error_counts[(name, transport)] >= self.failure_threshold
+        if is_failed:
+            self.set_failed(name, f'{type(error).__name__}: {error}', transport=transport)
+
+    def record_success(self, name: str, transport: str = '') -> None:
+        with self._lock:
+            self._error_counts.pop((name, transport), None)
+
+    def get_reason(self, name: str, from_language: str, to_language: str, transport: str = '') -> Optional[str]:
+        """
+        :return: why the request is certain to fail, or None.
+        """
+        if not self.is_enabled:
+            return None
+
+        now = time.time()
+        key = (name, normalize_language(from_language), normalize_language(to_language))
+        with self._lock:
+            for data, k in ((self._failures, (name, transport)), (self._pairs, key)):
+                item = data.get(k)
+                if item is not None and item[1] <= now:
+                    del data[k]
+                elif item is not None:
+                    self.hits += 1
+                    return item[0]
+        return None
+
+    def set_language_map_failure(self, name: str) -> None:
+        if self.is_enabled:
+            with self._lock:
+                self._language_map_failures[name] = time.time() + self.language_map_failure_ttl_seconds
+
+    def is_language_map_failed(self, name: str) -> bool:
+        if not self.is_enabled:
+            return False
+
+        with self._lock:
+            expire_at = self._language_map_failures.get(name)
+            if expire_at is not None and expire_at <= time.time():
+                del self._language_map_failures[name]
+                return False
+            return expire_at is not None
+
+    def clear(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._language_map_failures.clear()
+            else:
+                self._language_map_failures.pop(name, None)
+            for data in (self._failures, self._error_counts, self._pairs):
+                for key in [k for k in data if name is None or k[0] == name]:
+                    del data[key]
+
+    def info(self) -> dict:
+        now = time.time()
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'unsupported_pairs': [k for k, v in self._pairs.items() if v[1] > now],
+                'failed_translators': {f'{k[0]}({k[1]})' if k[1] else k[0]: v[0]
+                                       for k, v in self._failures.items() if v[1] > now},
+                'language_map_failures': [k for k, v in self._language_map_failures.items() if v > now],
+            }
+
+    def _guard(self, name: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> Optional[str]:
+        if not (self.is_enabled and kwargs.get('if_use_negative_cache', True)):
+            return None
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return self.get_reason(name, bound.arguments['from_language'], bound.arguments['to_language'],
+                               get_transport_variant(**kwargs))
+
+    def guarded(self, name: str, api_func: Callable, error_type: type = Exception) -> Callable:
+        """
+        :param error_type: type, default Exception. Raised with the reason when the request is certain to fail, its
+                instances raised by api_func are not counted as errors of the translator.
+        """
+        signature = inspect.signature(api_func)
+
+        @functools.wraps(api_func)
+        def _wrapper(*args, **kwargs):
+            reason = self._guard(name, signature, args, kwargs)
+            if reason is not None:
+                raise error_type(reason)
+
+            transport = get_transport_variant(**kwargs)
+            try:
+                result = api_func(*args, **kwargs)
+            except error_type:
+                raise
+            except Exception as e:
+                self.record_error(name, e, transport)
+                raise
+            self.record_success(name, transport)
+            return result
+
+        return _wrapper
+
+    def guarded_async(self, name: str, api_func: Callable, error_type: type = Exception) -> Callable:
+        signature = inspect.signature(api_func)
+
+        @functools.wraps(api_func)
+        async def _wrapper(*args, **kwargs):
+            reason = self._guard(name, signature, args, kwargs)
+            if reason is not None:
+                raise error_type(reason)
+
+            transport = get_transport_variant(**kwargs)
+            try:
+                result = await api_func(*args, **kwargs)
+            except error_type:
+                raise
+            except Exception as e:
+                self.record_error(name, e, transport)
+                raise
+            self.record_success(name, transport)
+            return result
+
+        return _wrapper
+
+
+negative_cache = NegativeCache()
+
+
+def is_rejection_error(error: Exception) -> bool:
+    """
+    Whether a request failed because the session or token was rejected by the server: status 401/403/419, or a
+    captcha page instead of the expected response, duck-typed over requests, niquests, httpx and aiohttp errors.
+    """
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status', None) or getattr(response, 'status_code', None)
+    if status in REJECTION_STATUS_CODES:
+        return True
+
+    try:
+        text = getattr(error, 'doc', None) or (getattr(response, 'text', None) if response is not None else None)
+    except Exception:
+        text = None
+    return bool(isinstance(text, str) and CAPTCHA_PATTERN.search(text[:int(1e5)]))
+
+
+def is_provider_error(error: BaseException) -> bool:
+    """
+    Whether an error comes from the translator or the network on the way to it: an http status, a connection error or
+    timeout, an error of the http client, or a response which is not the expected json. Errors of the caller(eg: a
+    wrong argument) do not say anything about the translator.
+    """
+    response = getattr(error, 'response', None)
+    if getattr(error, 'status', None) or getattr(response, 'status_code', None):
+        return True
+    if isinstance(error, (OSError, json.JSONDecodeError)):  # ConnectionError, TimeoutError, requests errors...
+        return True
+    return any(cls.__module__.split('.')[0] in HTTP_CLIENT_MODULES for cls in type(error).__mro__)
+
+
+class SessionLifetime:
+    def __init__(self, default_freq: int = int(1e3), default_seconds: float = 1.5e3, safety_ratio: float = 0.8,
+                 max_growth: float = 8.0):
+        """
+        Learn per translator how long its session and token stay valid, instead of refreshing after fixed thresholds.
+        A rejected session shrinks them to `safety_ratio` of its observed lifetime. They grow only on evidence: a
+        session which served a request after running past them(eg: by explicit thresholds) raises them to its age or
+        number of requests, up to `max_growth` times the defaults. A session rolled over by the thresholds proves
+        nothing beyond them, so it leaves them as they are.
+        Keyed by class name of translator. Explicit `update_session_after_freq`/`update_session_after_seconds` win.
+        :param default_freq: int, default 1000.
+        :param default_seconds: float, default 1500.
+        :param safety_ratio: float, default 0.8.
+        :param max_growth: float, default 8.0.
+        """
+        self.default_freq = default_freq
+        self.default_seconds = default_seconds
+        self.safety_ratio = safety_ratio
+        self.max_growth = max_growth
+        self.is_enabled = True
+        self.rejections = 0
+        self.growths = 0
+        self._thresholds: Dict[str, List[float]] = {}
+        self._sessions: Dict[str, tuple] = {}  # name: ((id of translator, begin_time), query_count at first request)
+        self._lock = threading.Lock()
+
+    def configure(self, safety_ratio: float = 0.8, max_growth: float = 8.0, is_enabled: bool = True) -> None:
+        with self._lock:
+            self.safety_ratio = safety_ratio
+            self.max_growth = max_growth
+            self.is_enabled = is_enabled
+            self._thresholds = {}
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Tuple[int, float]:
+        freq, seconds = self._thresholds.get(name, (self.default_freq, self.default_seconds))
+        return max(1, int(freq)), seconds
+
+    def apply(self, translator) -> None:
+        if self.is_enabled:
+            translator.default_session_freq, translator.default_session_seconds = self.get(type(translator).__name__)
+
+    def record_success(self, translator) -> None:
+        if not self.is_enabled:
+            return
+
+        name = type(translator).__name__
+        session_key = (id(translator), translator.begin_time)
+        with self._lock:
+            session = self._sessions.get(name)
+            if session is None or session[0] != session_key:
+                self._sessions[name] = (session_key, translator.query_count)
+                return
+
+            freq, seconds = self.get(name)
+            age_seconds = time.time() - translator.begin_time
+            n_queries = translator.query_count - session[1]
+            if age_seconds <= seconds and n_queries <= freq:
+                return
+            self._thresholds[name] = [min(max(freq, n_queries), self.default_freq * self.max_growth),
+                                      min(max(seconds, age_seconds), self.default_seconds * self.max_growth)]
+            self.growths += 1
+
+    def record_rejection(self, translator) -> None:
+        if not self.is_enabled:
+            return
+
+        name = type(translator).__name__
+        with self._lock:
+            freq, seconds = self.get(name)
+            age_seconds = time.time() - translator.begin_time
+            n_queries = translator.query_count % freq
+            if n_queries / freq >= age_seconds / seconds:  # the count, not the age, came closer to its threshold.
+                freq = max(self.default_freq * MIN_SESSION_LIFETIME_RATIO, n_queries * self.safety_ratio)
+            else:
+                seconds = max(self.default_seconds * MIN_SESSION_LIFETIME_RATIO, age_seconds * self.safety_ratio)
+            self._thresholds[name] = [freq, seconds]
+            self.rejections += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._thresholds = {}
+            self._sessions = {}
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                'thresholds': {name: {'freq': max(1, int(freq)), 'seconds': round(seconds, 1)}
+                               for name, (freq, seconds) in self._thresholds.items()},
+                'rejections': self.rejections,
+                'growths': self.growths,
+            }
+
+
+session_lifetime = SessionLifetime()
@@ -30,7 +30,7 @@ import sys
 import argparse
 
 from translators import __version__, __author__
-from translators import translate_text, translate_html
+from translators import translate_text, translate_html, translate_many
 
 
 def translate_cli() -> None:
@@ -83,6 +83,22 @@ def translate_cli() -> None:
         dest='is_html',
         help='is_html, default `0`.',
     )
+    parser.add_argument(
+        '--is_batch',
+        action='store',
+        default=0,
+        type=int,
+        dest='is_batch',
+        help='is_batch, default `0`. Translate each non-empty line separately and concurrently.',
+    )
+    parser.add_argument(
+        '--concurrency',
+        action='store',
+        default=32,
+        type=int,
+        dest='concurrency',
+        help='number of lines translated at a time with `--is_batch 1`, default `32`.',
+    )
     parser.add_argument(
         '--version',
         action='version',
@@ -101,6 +117,24 @@ def translate_cli() -> None:
     else:
         query_text = args.input.strip()
 
+    if bool(args.is_batch):
+        try:
+            query_texts = [line for line in query_text.splitlines() if line.strip()]
+            result_list = translate_many(
+                query_texts=query_texts,
+                translator=args.translator,
+                from_language=args.from_language,
+                to_language=args.to_language,
+                concurrency=args.concurrency,
+            )
+        except Exception as e:
+            print(str(e))
+            sys.exit(1)
+
+        for result in result_list:
+            print(str(result).replace('\n', ' '))
+        sys.exit(int(any(isinstance(result, Exception) for result in result_list)))
+
     try:
         translate_fn = translate_html if bool(args.is_html) else translate_text
         result = translate_fn(
@@ -0,0 +1,492 @@
+import os
+import asyncio
+import weakref
+import functools
+import threading
+import concurrent.futures
+from typing import Any, Callable, Coroutine, Hashable, Optional, List
+
+
+def get_flight_key(*args, **kwargs) -> tuple:
+    """Key of a call by all of its arguments, so that only calls certain to behave the same are coalesced."""
+    return args, tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+
+
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncFlight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.n_waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesce concurrent calls with the same key, made from different threads, into one call.
+        Callers arriving while the call is in flight wait for it and share its result or exception.
+        """
+        self.n_shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_flights': {}, '_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.n_shared += 1
+
+        if not is_leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func(*args, **kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def info(self) -> dict:
+        with self._lock:
+            return {'in_flight': len(self._flights), 'shared': self.n_shared}
+
+
+class RefreshGate:
+    def __init__(self):
+        """
+        Let threads share one translator instance, but let only one thread refresh its session and secrets, and only
+        after the requests already running on the old ones have finished.
+        Threads arriving during the refresh wait for it, then use the new session and secrets as a whole.
+        """
+        self.n_running = 0
+        self.n_refreshes = 0
+        self.is_refreshing = False
+        self._cond = threading.Condition()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'n_running': 0, 'is_refreshing': False, '_cond': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._cond = threading.Condition()
+
+    def run(self, is_ready: Callable[[], bool], func: Callable, *args, **kwargs) -> Any:
+        with self._cond:
+            self._cond.wait_for(lambda: not self.is_refreshing)
+            is_refresher = not is_ready()
+            if is_refresher:
+                self.is_refreshing = True
+                self.n_refreshes += 1
+                self._cond.wait_for(lambda: self.n_running == 0)
+            else:
+                self.n_running += 1
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._cond:
+                if is_refresher:
+                    self.is_refreshing = False
+                else:
+                    self.n_running -= 1
+                self._cond.notify_all()
+
+    def swap(self, func: Callable, timeout: Optional[float] = None) -> bool:
+        """
+        Run `func` alone, once the requests already running have finished, holding back the new ones meanwhile.
+        :return: bool, False if the running requests did not finish within `timeout`, `func` is not run then.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: not self.is_refreshing, timeout):
+                return False
+
+            self.is_refreshing = True
+            try:
+                if not self._cond.wait_for(lambda: self.n_running == 0, timeout):
+                    return False
+                func()
+                return True
+            finally:
+                self.is_refreshing = False
+                self._cond.notify_all()
+
+    def info(self) -> dict:
+        return {'running': self.n_running, 'refreshes': self.n_refreshes}
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        """
+        Coalesce concurrent coroutines with the same key, running on the same event loop, into one call.
+        The call runs in a task of its own, which coroutines arriving while it is in flight await too, sharing its
+        result or exception. A cancelled coroutine only stops waiting, the call is cancelled when nobody waits for it.
+        """
+        self.n_shared = 0
+        self._flights = {}
+
+    def _discard(self, loop_key: tuple, flight: _AsyncFlight) -> None:
+        if self._flights.get(loop_key) is flight:
+            del self._flights[loop_key]
+
+    async def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        flight = self._flights.get(loop_key)
+        if flight is None:
+            flight = self._flights[loop_key] = _AsyncFlight(loop.create_task(func(*args, **kwargs)))
+            flight.task.add_done_callback(lambda _: self._discard(loop_key, flight))
+        else:
+            self.n_shared += 1
+
+        flight.n_waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.n_waiters -= 1
+            if flight.n_waiters == 0 and not flight.task.done():
+                self._discard(loop_key, flight)
+                flight.task.cancel()
+
+    def info(self) -> dict:
+        return {'in_flight': len(self._flights), 'shared': self.n_shared}
+
+
+class _AsyncGateState:
+    def __init__(self):
+        self.n_running = 0
+        self.lock = asyncio.Lock()
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+
+class AsyncRefreshGate:
+    def __init__(self):
+        """
+        Let requests of one translator instance run concurrently, but let only one coroutine refresh its session and
+        secrets, and only after the requests already running on the old ones have finished.
+        Coroutines arriving during the refresh wait for it, then use the new session and secrets as a whole.
+        Asyncio primitives belong to one event loop, so each loop using the instance gets its own lock and counter.
+        """
+        self.n_refreshes = 0
+        self._states = weakref.WeakKeyDictionary()
+        self._states_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_states': None, '_states_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._states = weakref.WeakKeyDictionary()
+        self._states_lock = threading.Lock()
+
+    @property
+    def n_running(self) -> int:
+        with self._states_lock:
+            return sum(state.n_running for state in self._states.values())
+
+    def _get_state(self) -> _AsyncGateState:
+        loop = asyncio.get_running_loop()
+        with self._states_lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = self._states[loop] = _AsyncGateState()
+            return state
+
+    @staticmethod
+    async def _run_shared(state: _AsyncGateState, func: Callable, *args, **kwargs) -> Any:
+        state.n_running += 1
+        state.idle.clear()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            state.n_running -= 1
+            if state.n_running == 0:
+                state.idle.set()
+
+    async def run(self, is_ready: Callable[[], bool], func: Callable, *args, **kwargs) -> Any:
+        state = self._get_state()
+        if is_ready() and not state.lock.locked():
+            return await self._run_shared(state, func, *args, **kwargs)
+
+        async with state.lock:
+            if not is_ready():
+                await state.idle.wait()
+                self.n_refreshes += 1
+                return await self._run_shared(state, func, *args, **kwargs)
+        return await self._run_shared(state, func, *args, **kwargs)
+
+    async def swap(self, func: Callable, timeout: Optional[float] = None) -> bool:
+        """
+        Run `func` alone, once the requests already running on this event loop have finished, holding back the new
+        ones meanwhile.
+        :return: bool, False if the running requests did not finish within `timeout`, `func` is not run then.
+        """
+        state = self._get_state()
+        async with state.lock:
+            try:
+                await asyncio.wait_for(state.idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+            func()
+            return True
+
+
+class IdentityPool:
+    def __init__(self, translators: List[Any], strategy: str = 'round_robin'):
+        """
+        Independent session identities of one translator, ie: instances with their own session, cookies, tokens and
+        refresh clock. Requests are dispatched to them in turn(`round_robin`) or to the one with the fewest requests
+        running(`least_loaded`).
+        :param translators: List[Tse].
+        :param strategy: str, default 'round_robin'. Union['round_robin', 'least_loaded']
+        """
+        if strategy not in ('round_robin', 'least_loaded'):
+            raise ValueError(f'Unsupported strategy: {strategy}.')
+
+        self.translators = translators
+        self.strategy = strategy
+        self.n_running = [0] * len(translators)
+        self.n_dispatched = [0] * len(translators)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.translators)
+
+    def _acquire(self) -> int:
+        with self._lock:
+            if self.strategy == 'least_loaded':
+                order = [(self._next + i) % len(self) for i in range(len(self))]
+                index = min(order, key=lambda i: self.n_running[i])
+            else:
+                index = self._next
+            self._next = (index + 1) % len(self)
+            self.n_running[index] += 1
+            self.n_dispatched[index] += 1
+            return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self.n_running[index] -= 1
+
+    def replace(self, index: int, translator: Any) -> Any:
+        """Swap in a new instance for an identity. Requests already dispatched to the old one finish on it."""
+        with self._lock:
+            old_translator, self.translators[index] = self.translators[index], translator
+            return old_translator
+
+    def dispatch(self, api_name: str) -> Callable:
+        @functools.wraps(getattr(self.translators[0], api_name))
+        def _wrapper(*args, **kwargs):
+            index = self._acquire()
+            try:
+                return getattr(self.translators[index], api_name)(*args, **kwargs)
+            finally:
+                self._release(index)
+
+        return _wrapper
+
+    def dispatch_async(self, api_name: str) -> Callable:
+        @functools.wraps(getattr(self.translators[0], api_name))
+        async def _wrapper(*args, **kwargs):
+            index = self._acquire()
+            try:
+                return await getattr(self.translators[index], api_name)(*args, **kwargs)
+            finally:
+                self._release(index)
+
+        return _wrapper
+
+    def info(self) -> dict:
+        with self._lock:
+            return {'size': len(self), 'strategy': self.strategy, 'running': list(self.n_running),
+                    'dispatched': list(self.n_dispatched)}
+
+
+class BackgroundRefresher:
+    def __init__(self, refresh: Callable[[], Any], interval_seconds: float = 10.0):
+        """
+        Call `refresh` every `interval_seconds` in a daemon thread, until `stop()`. Errors of `refresh` are counted,
+        not raised.
+        """
+        self.refresh = refresh
+        self.interval_seconds = interval_seconds
+        self.n_runs = 0
+        self.n_errors = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='translators-refresher', daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.refresh()
+            except Exception:
+                self.n_errors += 1
+            self.n_runs += 1
+
+    def start(self) -> 'BackgroundRefresher':
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive() and not self._stop_event.is_set()
+
+    def info(self) -> dict:
+        return {'running': self.is_running(), 'runs': self.n_runs, 'errors': self.n_errors}
+
+
+class AsyncBackgroundRefresher:
+    def __init__(self, refresh: Callable, interval_seconds: float = 10.0):
+        """
+        Await `refresh()` every `interval_seconds` in a task of the running event loop, until `stop()`. Errors of
+        `refresh` are counted, not raised.
+        """
+        self.refresh = refresh
+        self.interval_seconds = interval_seconds
+        self.n_runs = 0
+        self.n_errors = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.n_errors += 1
+            self.n_runs += 1
+
+    def start(self) -> 'AsyncBackgroundRefresher':
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def stop(self) -> None:
+        if self._task is None or self._task.done():
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def info(self) -> dict:
+        return {'running': self.is_running(), 'runs': self.n_runs, 'errors': self.n_errors}
+
+
+class EventLoopThread:
+    def __init__(self, name: str = 'translators-event-loop'):
+        """
+        An event loop running forever in a daemon thread, started on first use, for blocking callers to run coroutines
+        on and share its sessions and connection pools. A forked child process starts its own loop.
+        """
+        self.name = name
+        self.n_submitted = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _run(self, loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+                loop, started = asyncio.new_event_loop(), threading.Event()
+                thread = threading.Thread(target=self._run, args=(loop, started), name=self.name, daemon=True)
+                thread.start()
+                started.wait()
+                self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            return self._loop
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        future = asyncio.run_coroutine_threadsafe(coro, self.get_loop())
+        self.n_submitted += 1
+        return future
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Block until `coro` is done on the loop. The coroutine is cancelled if not done within `timeout`."""
+        if self._thread is threading.current_thread():
+            coro.close()
+            raise RuntimeError('Cannot wait on the event loop thread for itself.')
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    @staticmethod
+    async def _cancel_tasks() -> None:
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        _ = await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.get_running_loop().shutdown_asyncgens()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Cancel the coroutines still running on the loop, then stop it."""
+        with self._lock:
+            loop, thread, pid = self._loop, self._thread, self._pid
+            self._loop, self._thread, self._pid = None, None, None
+        if loop is None or pid != os.getpid():
+            return
+
+        if thread is not threading.current_thread():
+            try:
+                asyncio.run_coroutine_threadsafe(self._cancel_tasks(), loop).result(timeout)
+            except concurrent.futures.TimeoutError:
+                pass
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def info(self) -> dict:
+        return {'running': self.is_running(), 'submitted': self.n_submitted}
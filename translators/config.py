@@ -0,0 +1,291 @@
+from typing import Optional, Tuple, List
+
+from translators.base import Tse, TranslatorError, ApiKwargsType
+from translators.cache import TranslationMemory, ResultCache, LanguageMapSnapshot, TokenVault, FuzzyMemory, SharedStore
+from translators.cache import ResourceCache, NegativeCache, SessionLifetime, is_provider_error
+from translators.transport import EndpointSelector
+from translators.segment import SegmentPacker, TextChunker, get_segment_limit, get_text_length, LENGTH_UNITS
+
+
+class ConfigMixin:
+    """
+    Configuration methods shared by `server.TranslatorsServer` and `server_async.TranslatorsServer`.
+    Most of the configuration is global: the negative cache, token vault, language map snapshot, resource cache,
+    session lifetime, endpoint selection, segment packing and text chunking are singletons of `cache`, `transport` and
+    `segment`, shared by both servers and all their instances. Only the result cache, translation memory and fuzzy
+    memory belong to each server. Transport settings(`set_dns_cache`, `set_http2`, `set_transport` or
+    `set_async_transport`) stay with each server.
+    """
+    translator_error = TranslatorError
+
+    def set_translation_memory(self, db_path: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                               max_size: int = int(1e6)) -> TranslationMemory:
+        """
+        Enable persistent translation memory in front of translators, under the in-process result cache.
+        :param db_path: Optional[str], default None. None means `~/.cache/translators/translation_memory.sqlite3`.
+        :param ttl_seconds: Optional[float], default None. None means never expired.
+        :param max_size: int, default 1000000.
+        :return: TranslationMemory
+        """
+        if self.translation_memory is not None:
+            self.translation_memory.close()
+        self.translation_memory = TranslationMemory(db_path=db_path, ttl_seconds=ttl_seconds, max_size=max_size)
+        self.result_cache.backend = self.translation_memory
+        return self.translation_memory
+
+    def set_result_cache(self, max_bytes: int = int(64 * 2 ** 20), ttl_seconds: Optional[float] = None) -> ResultCache:
+        """
+        Enable in-process LRU cache of translations, shared by translators, translate_text() and translate_html().
+        :param max_bytes: int, default 64MiB. 0 means disable it.
+        :param ttl_seconds: Optional[float], default None. None means never expired.
+        :return: ResultCache
+        """
+        self.result_cache.configure(max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+        return self.result_cache
+
+    def set_fuzzy_memory(self, threshold: float = 0.9, ngram_size: int = 3, max_size: int = int(1e5),
+                         if_use_fuzzy_memory: bool = True) -> Optional[FuzzyMemory]:
+        """
+        Keep an in-process fuzzy memory, which learns every new translation. It never answers translator calls, ask
+        it by `fuzzy_lookup()`.
+        :param threshold: float, default 0.9. Minimum similarity between the new and the stored text.
+        :param ngram_size: int, default 3.
+        :param max_size: int, default 100000.
+        :param if_use_fuzzy_memory: bool, default True. False means remove the fuzzy memory.
+        :return: Optional[FuzzyMemory]
+        """
+        if not if_use_fuzzy_memory:
+            self.result_cache.fuzzy_memory = None
+            return None
+
+        self.result_cache.fuzzy_memory = FuzzyMemory(threshold=threshold, ngram_size=ngram_size, max_size=max_size)
+        return self.result_cache.fuzzy_memory
+
+    def fuzzy_lookup(self, query_text: str, translator: str = 'alibaba', from_language: str = 'auto',
+                     to_language: str = 'en', **kwargs: ApiKwargsType) -> Optional[dict]:
+        """
+        Most similar text translated before by the same translator and languages, without any request.
+        :param query_text: str, must.
+        :param translator: str, default 'alibaba'.
+        :param from_language: str, default 'auto'.
+        :param to_language: str, default 'en'.
+        :param **kwargs: kwargs which change the result(eg: professional_field), as the translation was asked with.
+        :return: Optional[dict], {'query_text', 'translation', 'score'}, or None without a match or fuzzy memory.
+        """
+        if translator not in self.translators_pool:
+            raise self.translator_error(f'Unsupported translator: {translator}.')
+        return self.result_cache.fuzzy_lookup(translator, query_text, from_language, to_language, **kwargs)
+
+    def set_shared_cache(self, db_path: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                         max_size: int = int(1e6), if_use_shared_cache: bool = True) -> Optional[SharedStore]:
+        """
+        Share translations, `language_map` and scraped tokens between processes on one host(eg: gunicorn or celery
+        workers), by one sqlite file in WAL mode.
+        :param db_path: Optional[str], default None. None means `~/.cache/translators/shared_cache.sqlite3`.
+        :param ttl_seconds: Optional[float], default None. TTL of translations, None means never expired.
+        :param max_size: int, default 1000000. Max number of translations.
+        :param if_use_shared_cache: bool, default True. False means go back to the json files of `language_map` and
+                tokens.
+        :return: Optional[SharedStore]
+        """
+        if not if_use_shared_cache:
+            self.language_map_snapshot.shared_store = None
+            self.token_vault.shared_store = None
+            return None
+
+        shared_store = SharedStore(db_path=db_path)
+        self.set_translation_memory(db_path=shared_store.db_path, ttl_seconds=ttl_seconds, max_size=max_size)
+        self.language_map_snapshot.shared_store = shared_store
+        self.language_map_snapshot.is_enabled = True
+        self.token_vault.shared_store = shared_store
+        self.token_vault.is_enabled = True
+        return shared_store
+
+    def set_language_map_snapshot(self, snapshot_path: Optional[str] = None,
+                                  ttl_seconds: Optional[float] = 7 * 24 * 3600.0,
+                                  if_use_snapshot: bool = True) -> LanguageMapSnapshot:
+        """
+        Enable the on-disk snapshot of `language_map`, so that refreshes and new processes do not scrape it again.
+        Disabled by default.
+        :param snapshot_path: Optional[str], default None. None means `~/.cache/translators/language_map_snapshot.json`.
+        :param ttl_seconds: Optional[float], default 7 days. None means never expired.
+        :param if_use_snapshot: bool, default True. False means always get `language_map` from the website.
+        :return: LanguageMapSnapshot
+        """
+        self.language_map_snapshot.configure(snapshot_path=snapshot_path, ttl_seconds=ttl_seconds,
+                                             is_enabled=if_use_snapshot)
+        return self.language_map_snapshot
+
+    def set_token_vault(self, vault_path: Optional[str] = None, default_ttl_seconds: float = 1.5e3,
+                        if_use_vault: bool = True) -> TokenVault:
+        """
+        Enable the on-disk vault of scraped tokens and cookies, disabled by default. Translators restore their secrets
+        from it instead of scraping the website again, until the secrets expire or a request made with them fails.
+        :param vault_path: Optional[str], default None. None means `~/.cache/translators/token_vault.json`.
+        :param default_ttl_seconds: float, default 1500.
+        :param if_use_vault: bool, default True. False means always scrape secrets from the website.
+        :return: TokenVault
+        """
+        self.token_vault.configure(vault_path=vault_path, default_ttl_seconds=default_ttl_seconds,
+                                   is_enabled=if_use_vault)
+        return self.token_vault
+
+    def set_resource_cache(self, cache_dir: Optional[str] = None, if_use_resource_cache: bool = True) -> ResourceCache:
+        """
+        Enable the on-disk cache of host pages and js bundles fetched when sessions refresh, disabled by default.
+        Cached pages are revalidated by ETag or Last-Modified, hashed or versioned bundles are never fetched again.
+        :param cache_dir: Optional[str], default None. None means `~/.cache/translators/resources`.
+        :param if_use_resource_cache: bool, default True. False means always fetch pages and bundles in full.
+        :return: ResourceCache
+        """
+        self.resource_cache.configure(cache_dir=cache_dir, is_enabled=if_use_resource_cache)
+        return self.resource_cache
+
+    def set_negative_cache(self, pair_ttl_seconds: float = 24 * 3600.0, failure_ttl_seconds: float = 60.0,
+                           failure_threshold: int = 3, language_map_failure_ttl_seconds: float = 600.0,
+                           if_use_negative_cache: bool = True) -> NegativeCache:
+        """
+        Configure the negative cache, enabled by default. Requests certain to fail(unsupported language pair, translator
+        failed recently or in preacceleration) raise TranslatorError immediately instead of costing a timeout.
+        :param pair_ttl_seconds: float, default 1 day. TTL of unsupported language pairs.
+        :param failure_ttl_seconds: float, default 60. TTL of the failed state of translators.
+        :param failure_threshold: int, default 3. Number of consecutive errors before a translator is failed.
+        :param language_map_failure_ttl_seconds: float, default 600. During it, `language_map` is not scraped again.
+        :param if_use_negative_cache: bool, default True.
+        :return: NegativeCache
+        """
+        self.negative_cache.configure(pair_ttl_seconds=pair_ttl_seconds, failure_ttl_seconds=failure_ttl_seconds,
+                                      failure_threshold=failure_threshold,
+                                      language_map_failure_ttl_seconds=language_map_failure_ttl_seconds,
+                                      is_enabled=if_use_negative_cache)
+        return self.negative_cache
+
+    def set_session_lifetime(self, safety_ratio: float = 0.8, max_growth: float = 8.0,
+                             if_learn_session_lifetime: bool = True) -> SessionLifetime:
+        """
+        Configure the learning of session lifetime per translator, enabled by default. Rejected sessions(401/403/419,
+        captcha) shrink the rollover thresholds to their observed lifetime, and only the session and tokens of a
+        rejected session are re-acquired, once, within the request. The thresholds grow only when a session served
+        requests past them, eg: by explicit `update_session_after_seconds`, never by a mere rollover.
+        :param safety_ratio: float, default 0.8.
+        :param max_growth: float, default 8.0. Thresholds stay below `max_growth` times the defaults(1000, 1500s).
+        :param if_learn_session_lifetime: bool, default True. False means fixed thresholds.
+        :return: SessionLifetime
+        """
+        self.session_lifetime.configure(safety_ratio=safety_ratio, max_growth=max_growth,
+                                        is_enabled=if_learn_session_lifetime)
+        return self.session_lifetime
+
+    def set_segment_packing(self, delimiter: str = '\n', max_segments: int = 50, length_unit: str = 'utf16',
+                            length_units: Optional[dict] = None) -> SegmentPacker:
+        """
+        Configure how `if_use_packing` packs short texts into requests up to the input limit of a translator, and
+        splits the translation back. Packs that fail to split are translated text by text, see
+        `segment_packer.info()`.
+        :param delimiter: str, default '\\n'.
+        :param max_segments: int, default 50. Max number of texts of a request.
+        :param length_unit: str, default 'utf16'. Union['code_point', 'utf16', 'byte'], unit of `input_limit`.
+        :param length_units: Optional[dict], default None. Unit per translator, eg: {'baidu': 'byte'}.
+        :return: SegmentPacker
+        """
+        if {length_unit, *(length_units or {}).values()} - set(LENGTH_UNITS):
+            raise self.translator_error(f'Unsupported length_unit, choose from {LENGTH_UNITS}.')
+        if not delimiter.strip(' ') or max_segments < 1:
+            raise self.translator_error('`delimiter` must not be blank, and `max_segments` must be positive.')
+
+        self.segment_packer.configure(delimiter=delimiter, max_segments=max_segments, length_unit=length_unit,
+                                      length_units=length_units)
+        return self.segment_packer
+
+    def _is_packing(self, translator: str, if_use_packing: Optional[bool] = None, **kwargs: ApiKwargsType) -> bool:
+        if kwargs.get('is_detail_result', False):
+            return False
+        if if_use_packing is None:
+            is_line_native = getattr(self._translators_dict[translator], 'is_line_native', False)
+            return is_line_native and self.segment_packer.delimiter == '\n'
+        return if_use_packing
+
+    def set_text_chunking(self, concurrency: int = 8, if_use_chunking: bool = True) -> TextChunker:
+        """
+        Translate texts longer than the limit of a translator(`input_limit`, `limit_of_length`) in chunks, split at
+        paragraph, line, sentence, clause or word boundaries and joined back with the original whitespace. Disabled by
+        default. Chunks are translated one by one by `server`, and `concurrency` at a time by `server_async`.
+        :param concurrency: int, default 8. Number of chunks of a text translated at a time by `server_async`.
+        :param if_use_chunking: bool, default True.
+        :return: TextChunker
+        """
+        if concurrency < 1:
+            raise self.translator_error('`concurrency` must be positive.')
+
+        self.text_chunker.configure(concurrency=concurrency, is_enabled=if_use_chunking)
+        return self.text_chunker
+
+    def _get_chunk_limit(self, translator: str, query_text: str, **kwargs: ApiKwargsType) -> Optional[int]:
+        """The limit to chunk `query_text` by, or None if it needs no chunking."""
+        if not (isinstance(query_text, str) and self.text_chunker.is_enabled and kwargs.get('if_use_chunking', True)
+                and not kwargs.get('is_detail_result', False)):
+            return None
+
+        limit = get_segment_limit(getattr(self._translators_dict[translator], 'input_limit', None),
+                                  kwargs.get('limit_of_length', 20000))
+        is_over = get_text_length(query_text.strip(), self.segment_packer.get_length_unit(translator)) > limit
+        return limit if is_over else None
+
+    def _new_translator(self, translator: Tse, identity: int = 0) -> Tse:
+        new_translator = type(translator)(server_region=self.server_region) if hasattr(translator, 'server_region') \
+            else type(translator)()
+        new_translator.identity = identity
+        return new_translator
+
+    def _get_test_languages(self, _ts: str) -> Tuple[str, str]:
+        from_language = self.not_zh_langs[_ts] if _ts in self.not_zh_langs else 'auto'
+        to_language = self.not_en_langs[_ts] if _ts in self.not_en_langs else 'en'
+        return from_language, to_language
+
+    def set_endpoint_selection(self, translator: str = 'bing', host_urls: Optional[List[str]] = None,
+                               probe_interval_seconds: float = 300.0, min_success_rate: float = 0.5,
+                               if_use_endpoint_selection: bool = True) -> EndpointSelector:
+        """
+        Let a translator with several equivalent endpoints use the fastest healthy one. Endpoints are ranked by the
+        moving average of their response times and error rates, measured on real requests and on probes sent in
+        background every `probe_interval_seconds`, so requests never wait for probes. Endpoints succeeding less than
+        `min_success_rate` are skipped, and a switch of endpoint renews the session, as its cookies and tokens belong to
+        the previous one. Takes effect when the translator refreshes.
+        :param translator: str, default 'bing'.
+        :param host_urls: Optional[List[str]], default None. None means the known endpoints of the translator.
+        :param probe_interval_seconds: float, default 300.0.
+        :param min_success_rate: float, default 0.5.
+        :param if_use_endpoint_selection: bool, default True.
+        :return: EndpointSelector
+        """
+        if translator not in self.translators_pool:
+            raise self.translator_error(f'Unsupported translator: {translator}.')
+
+        obj = self._translators_dict[translator]
+        if host_urls is None:
+            host_urls = [url for url in (getattr(obj, 'en_host_url', None), getattr(obj, 'cn_host_url', None))
+                         if url and not url.strip('/').endswith('google.cn')]  # google.cn only redirects.
+        if if_use_endpoint_selection and len(set(host_urls)) < 2:
+            raise self.translator_error(f'{translator} has fewer than 2 endpoints: {host_urls}.')
+
+        self.endpoint_selector.configure(probe_interval_seconds=probe_interval_seconds,
+                                         min_success_rate=min_success_rate)
+        self.endpoint_selector.set_candidates(type(obj).__name__, host_urls if if_use_endpoint_selection else None)
+        return self.endpoint_selector
+
+    def stream_info(self, translator: Optional[str] = None) -> dict:
+        """Bytes of host pages read, and saved by stopping once the needed tokens are found."""
+        if translator is None:
+            return self.stream_stats.info()
+        return self.stream_stats.info(type(self._translators_dict[translator]).__name__)
+
+    def cache_info(self, translator: Optional[str] = None) -> dict:
+        return self.result_cache.info(translator)
+
+    def cache_clear(self, translator: Optional[str] = None) -> None:
+        self.result_cache.clear(translator)
+
+    def _set_readiness(self, _ts: str, error: Optional[BaseException] = None) -> None:
+        self.readiness[_ts] = 'ready' if error is None else 'failed'
+        if error is not None and is_provider_error(error):
+            self.negative_cache.set_failed(type(getattr(self, f'_{_ts}')).__name__, f'Preacceleration failed: {error}')
@@ -82,8 +82,12 @@ class AlibabaV1(Tse):
         language_dict = await (await ss.get(lang_url, params=params, headers=self.host_headers, timeout=timeout)).json()
         return dict(map(lambda x: x, [(x['sourceLuange'], x['targetLanguages']) for x in language_dict['languageMap']]))
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.dmtrack_pageid)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def alibaba_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                     **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -128,7 +132,7 @@ class AlibabaV1(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.dmtrack_pageid):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_response = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             self.dmtrack_pageid = self.get_dmtrack_pageid(host_response)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
@@ -151,11 +155,12 @@ class AlibabaV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['listTargetText'][0]
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -199,7 +204,7 @@ class AlibabaV1(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.dmtrack_pageid):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             host_response = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             # Need to access cookies from response or session. niquests/httpx handles cookies in session usually.
             # get_dmtrack_pageid might need adaptation if it reads cookies from response object structure difference.
@@ -228,7 +233,7 @@ class AlibabaV1(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['listTargetText'][0]
 
 
@@ -271,8 +276,12 @@ class AlibabaV2(Tse):
         lang_items = sorted([(k, v) for k, v in lang_items if _fn_filter(k, v)])
         return {k: v for k, v in lang_items}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.csrf_token)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def alibaba_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                     **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -317,10 +326,10 @@ class AlibabaV2(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.csrf_token):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.get_language_url = f'https:{re.compile(self.get_language_pattern).search(host_html).group()}'
-            lang_html = self.session.get(self.get_language_url, headers=self.host_headers, timeout=timeout).text
+            lang_html = self.get_resource_text(self.session, self.get_language_url, self.host_headers, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
             self.language_map = self.get_language_map(lang_html, **debug_lang_kwargs)
@@ -342,11 +351,12 @@ class AlibabaV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['data']['translateText']
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -388,11 +398,11 @@ class AlibabaV2(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.csrf_token):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             host_html = await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
             self.get_language_url = f'https:{re.compile(self.get_language_pattern).search(host_html).group()}'
-            lang_html = await (
-                await self.async_session.get(self.get_language_url, headers=self.host_headers, timeout=timeout)).text()
+            lang_html = await self.get_resource_text_async(self.async_session, self.get_language_url,
+                                                           self.host_headers, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
             self.language_map = self.get_language_map(lang_html, **debug_lang_kwargs)
@@ -415,5 +425,5 @@ class AlibabaV2(Tse):
         r.raise_for_status()
         data =  await r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['data']['translateText']
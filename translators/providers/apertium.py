@@ -59,6 +59,7 @@ class Apertium(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def apertium_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                      **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -97,7 +98,7 @@ class Apertium(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
@@ -123,11 +124,12 @@ class Apertium(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['responseData']['translatedText']
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -165,7 +167,7 @@ class Apertium(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
@@ -192,5 +194,5 @@ class Apertium(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['responseData']['translatedText']
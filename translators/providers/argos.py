@@ -53,8 +53,13 @@ class Argos(Tse):
         secret = base64.b64decode(api_secret.encode()).decode()
         return secret
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.secret)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.reacquire_secrets
+    @Tse.single_flight_refresh
     def argos_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                   **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -93,9 +98,14 @@ class Argos(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.secret):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
-            self.secret = self.get_secret(self.secret_url, self.session, self.host_headers, timeout)
+            self.session = self.renew_session(http_client, proxies)
+            vault_secrets = self.get_vault_secrets(self.session)
+            if vault_secrets:
+                self.secret = vault_secrets['secret']
+            else:
+                _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
+                self.secret = self.get_secret(self.secret_url, self.session, self.host_headers, timeout)
+                self.set_vault_secrets({'secret': self.secret}, self.session, update_session_after_seconds)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
             self.language_map = self.get_language_map(self.language_url, self.session, self.language_headers, timeout,
@@ -116,11 +126,13 @@ class Argos(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translatedText']
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.reacquire_secrets_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -158,9 +170,15 @@ class Argos(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.secret):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
-            _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
-            self.secret = await self.get_secret_async(self.secret_url, self.async_session, self.host_headers, timeout)
+            self.async_session = self.renew_async_session(proxies)
+            vault_secrets = self.get_vault_secrets(self.async_session)
+            if vault_secrets:
+                self.secret = vault_secrets['secret']
+            else:
+                _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
+                self.secret = await self.get_secret_async(self.secret_url, self.async_session, self.host_headers,
+                                                          timeout)
+                self.set_vault_secrets({'secret': self.secret}, self.async_session, update_session_after_seconds)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
 
@@ -183,5 +201,5 @@ class Argos(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translatedText']
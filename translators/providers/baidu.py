@@ -34,7 +34,7 @@ class BaiduV1(Tse):
     @Tse.debug_language_map
     def get_language_map(self, lang_url: str, ss: SessionType, headers: dict, timeout: Optional[float],
                          **kwargs: LangMapKwargsType) -> dict:
-        js_html = ss.get(lang_url, headers=headers, timeout=timeout).text
+        js_html = self.get_resource_text(ss, lang_url, headers, timeout)
         lang_str = re.compile('exports={auto:(.*?)}}}},').search(js_html).group()[8:-3]
         lang_list = re.compile('(\\w+):{zhName:').findall(lang_str)
         lang_list = sorted(list(set(lang_list)))
@@ -43,7 +43,7 @@ class BaiduV1(Tse):
     @Tse.debug_language_map_async
     async def get_language_map_async(self, lang_url: str, ss: AsyncSessionType, headers: dict, timeout: Optional[float],
                                      **kwargs: LangMapKwargsType) -> dict:
-        js_html = await (await ss.get(lang_url, headers=headers, timeout=timeout)).text()
+        js_html = await self.get_resource_text_async(ss, lang_url, headers, timeout)
         lang_str = re.compile('exports={auto:(.*?)}}}},').search(js_html).group()[8:-3]
         lang_list = re.compile('(\\w+):{zhName:').findall(lang_str)
         lang_list = sorted(list(set(lang_list)))
@@ -52,6 +52,7 @@ class BaiduV1(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def baidu_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                   **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -90,9 +91,11 @@ class BaiduV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)  # must twice, send cookies.
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            # must twice, send cookies.
+            _ = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, ())
+            host_patterns = () if self.get_lang_url else (self.get_lang_url_pattern,)
+            host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, host_patterns)
 
             if not self.get_lang_url:
                 self.get_lang_url = re.compile(self.get_lang_url_pattern).search(host_html).group()
@@ -118,12 +121,13 @@ class BaiduV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([item['dst'] for item in data['data']])
 
     @Tse.uncertified_async
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -161,10 +165,12 @@ class BaiduV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
-            _ = await self.async_session.get(self.host_url, headers=self.host_headers,
-                                             timeout=timeout)  # must twice, send cookies.
-            host_html = await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
+            self.async_session = self.renew_async_session(proxies)
+            _ = await self.get_host_text_async(self.async_session, self.host_url, self.host_headers, timeout,
+                                               ())  # must twice, send cookies.
+            host_patterns = () if self.get_lang_url else (self.get_lang_url_pattern,)
+            host_html = await self.get_host_text_async(self.async_session, self.host_url, self.host_headers, timeout,
+                                                       host_patterns)
 
             if not self.get_lang_url:
                 self.get_lang_url = re.compile(self.get_lang_url_pattern).search(host_html).group()
@@ -190,7 +196,7 @@ class BaiduV1(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([item['dst'] for item in data['data']])
 
 
@@ -213,6 +219,7 @@ class BaiduV2(Tse):
         self.token = None
         self.sign = None
         self.acs_token = None
+        self.host_patterns = ("""window.gtk = '(.*?)';|window.gtk = "(.*?)";""", """token: '(.*?)',|token: "(.*?)",""")
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(5e3)
@@ -221,7 +228,7 @@ class BaiduV2(Tse):
     @Tse.debug_language_map
     def get_language_map(self, lang_url: str, ss: SessionType, headers: dict, timeout: Optional[float],
                          **kwargs: LangMapKwargsType) -> dict:
-        js_html = ss.get(lang_url, headers=headers, timeout=timeout).text
+        js_html = self.get_resource_text(ss, lang_url, headers, timeout)
         lang_str = re.compile('exports={auto:(.*?)}}}},').search(js_html).group()[8:-3]
         lang_list = re.compile('(\\w+):{zhName:').findall(lang_str)
         lang_list = sorted(list(set(lang_list)))
@@ -230,7 +237,7 @@ class BaiduV2(Tse):
     @Tse.debug_language_map_async
     async def get_language_map_async(self, lang_url: str, ss: AsyncSessionType, headers: dict, timeout: Optional[float],
                                      **kwargs: LangMapKwargsType) -> dict:
-        js_html = await (await ss.get(lang_url, headers=headers, timeout=timeout)).text()
+        js_html = await self.get_resource_text_async(ss, lang_url, headers, timeout)
         lang_str = re.compile('exports={auto:(.*?)}}}},').search(js_html).group()[8:-3]
         lang_list = re.compile('(\\w+):{zhName:').findall(lang_str)
         lang_list = sorted(list(set(lang_list)))
@@ -273,9 +280,13 @@ class BaiduV2(Tse):
     # def get_acs_token(self):
     #     pass
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.token and self.sign)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def baidu_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                   **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -320,9 +331,11 @@ class BaiduV2(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.token and self.sign):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)  # must twice, reload token.
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            # must twice, reload token.
+            _ = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, ())
+            host_patterns = self.host_patterns + (() if self.get_lang_url else (self.get_lang_url_pattern,))
+            host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, host_patterns)
             self.token = self.get_tk(host_html)
             self.sign = self.get_sign(query_text, host_html, self.session, self.host_headers, timeout)
 
@@ -363,12 +376,13 @@ class BaiduV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([x['dst'] for x in data['trans_result']['data']])
 
     @Tse.uncertified_async
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -413,10 +427,12 @@ class BaiduV2(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.token and self.sign):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
-            _ = await self.async_session.get(self.host_url, headers=self.host_headers,
-                                             timeout=timeout)  # must twice, reload token.
-            host_html = await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
+            self.async_session = self.renew_async_session(proxies)
+            _ = await self.get_host_text_async(self.async_session, self.host_url, self.host_headers, timeout,
+                                               ())  # must twice, reload token.
+            host_patterns = self.host_patterns + (() if self.get_lang_url else (self.get_lang_url_pattern,))
+            host_html = await self.get_host_text_async(self.async_session, self.host_url, self.host_headers, timeout,
+                                                       host_patterns)
             self.token = self.get_tk(host_html)
             self.sign = await self.get_sign_async(query_text, host_html, self.async_session, self.host_headers, timeout)
 
@@ -459,5 +475,5 @@ class BaiduV2(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([x['dst'] for x in data['trans_result']['data']])
@@ -25,6 +25,8 @@ class Bing(Tse):
         self.session = None
         self.tk = None
         self.ig_iid = None
+        self.host_patterns = ('IG:"(.*?)"', 'var params_AbusePreventionHelper = (.*?);',
+                              '<[^>]*id="tta_outGDCont"[^>]*>')
         self.query_count = 0
         self.output_auto = 'auto-detect'
         self.output_zh = 'zh-Hans'
@@ -54,8 +56,13 @@ class Bing(Tse):
         result = await exejs.evaluate_async(result_str)
         return {'key': result[0], 'token': result[1]}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.tk and self.ig_iid)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.reacquire_secrets
+    @Tse.single_flight_refresh
     def bing_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                  **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -82,7 +89,7 @@ class Bing(Tse):
         """
 
         use_cn_condition = kwargs.get('if_use_cn_host', None) or self.server_region == 'CN'
-        self.host_url = self.cn_host_url if use_cn_condition else self.en_host_url
+        self.host_url = self.select_host_url(self.cn_host_url if use_cn_condition else self.en_host_url)
         self.api_url = self.host_url.replace('Translator', 'ttranslatev3')
         self.host_headers = self.get_headers(self.host_url, if_api=False)
         self.api_headers = self.get_headers(self.host_url, if_api=True)
@@ -102,13 +109,22 @@ class Bing(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.tk and self.ig_iid):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
-            self.tk = self.get_tk(host_html)
-            self.ig_iid = self.get_ig_iid(host_html)
-            debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
-                                                       if_print_warning)
-            self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
+            self.session = self.renew_session(http_client, proxies)
+            vault_secrets = self.get_vault_secrets(self.session)
+            if vault_secrets and vault_secrets['host_url'] == self.host_url:
+                self.tk, self.ig_iid = vault_secrets['tk'], vault_secrets['ig_iid']
+                self.language_map = vault_secrets['language_map']
+            else:
+                host_patterns = self.host_patterns if self.is_language_map_cached() else None
+                host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, host_patterns)
+                self.tk = self.get_tk(host_html)
+                self.ig_iid = self.get_ig_iid(host_html)
+                debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
+                                                           if_print_warning)
+                self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
+                vault_secrets = {'host_url': self.host_url, 'tk': self.tk, 'ig_iid': self.ig_iid,
+                                 'language_map': self.language_map}
+                self.set_vault_secrets(vault_secrets, self.session, update_session_after_seconds)
 
         from_language, to_language = self.check_language(from_language, to_language, self.language_map,
                                                          output_zh=self.output_zh, output_auto=self.output_auto)
@@ -125,7 +141,7 @@ class Bing(Tse):
         r = self.session.post(api_url, headers=self.host_headers, data=payload, timeout=timeout)
         r.raise_for_status()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
 
         try:
             data = r.json()
@@ -138,6 +154,8 @@ class Bing(Tse):
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.reacquire_secrets_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -163,7 +181,7 @@ class Bing(Tse):
         :return: str or dict
         """
         use_cn_condition = kwargs.get('if_use_cn_host', None) or self.server_region == 'CN'
-        self.host_url = self.cn_host_url if use_cn_condition else self.en_host_url
+        self.host_url = self.select_host_url(self.cn_host_url if use_cn_condition else self.en_host_url, is_async=True)
         self.api_url = self.host_url.replace('Translator', 'ttranslatev3')
         self.host_headers = self.get_headers(self.host_url, if_api=False)
         self.api_headers = self.get_headers(self.host_url, if_api=True)
@@ -182,13 +200,23 @@ class Bing(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.tk and self.ig_iid):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
-            host_html = await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
-            self.tk = await self.get_tk_async(host_html)
-            self.ig_iid = self.get_ig_iid(host_html)
-            debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
-                                                       if_print_warning)
-            self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
+            self.async_session = self.renew_async_session(proxies)
+            vault_secrets = self.get_vault_secrets(self.async_session)
+            if vault_secrets and vault_secrets['host_url'] == self.host_url:
+                self.tk, self.ig_iid = vault_secrets['tk'], vault_secrets['ig_iid']
+                self.language_map = vault_secrets['language_map']
+            else:
+                host_patterns = self.host_patterns if self.is_language_map_cached() else None
+                host_html = await self.get_host_text_async(self.async_session, self.host_url, self.host_headers,
+                                                           timeout, host_patterns)
+                self.tk = await self.get_tk_async(host_html)
+                self.ig_iid = self.get_ig_iid(host_html)
+                debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
+                                                           if_print_warning)
+                self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
+                vault_secrets = {'host_url': self.host_url, 'tk': self.tk, 'ig_iid': self.ig_iid,
+                                 'language_map': self.language_map}
+                self.set_vault_secrets(vault_secrets, self.async_session, update_session_after_seconds)
 
         from_language, to_language = self.check_language(from_language, to_language, self.language_map,
                                                          output_zh=self.output_zh, output_auto=self.output_auto)
@@ -205,7 +233,7 @@ class Bing(Tse):
         r = await self.async_session.post(api_url, headers=self.host_headers, data=payload, timeout=timeout)
         r.raise_for_status()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
 
         try:
             data = await r.json()
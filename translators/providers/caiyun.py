@@ -31,6 +31,7 @@ class Caiyun(Tse):
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(5e3)
+        self.is_line_native = True
         self.default_from_language = self.output_zh
 
     # @Tse.debug_language_map
@@ -76,8 +77,13 @@ class Caiyun(Tse):
         _ciphertext = ''.join(list(map(lambda k: self.decrypt_dictionary[k], cipher_text)))
         return base64.b64decode(_ciphertext).decode()
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.tk and self.jwt)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.reacquire_secrets
+    @Tse.single_flight_refresh
     def caiyun_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                    **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -118,12 +124,16 @@ class Caiyun(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.tk and self.jwt):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
-            js_url_path = re.compile(self.get_js_pattern).search(host_html).group()
-            self.get_js_url = ''.join([self.host_url, js_url_path])
-            js_html = self.session.get(self.get_js_url, headers=self.host_headers, timeout=timeout).text
-            # self.tk = self.get_tk(js_html)
+            self.session = self.renew_session(http_client, proxies)
+            vault_secrets = self.get_vault_secrets(self.session)
+            if vault_secrets:
+                self.browser_id = vault_secrets['browser_id']
+            else:
+                host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+                js_url_path = re.compile(self.get_js_pattern).search(host_html).group()
+                self.get_js_url = ''.join([self.host_url, js_url_path])
+                js_html = self.get_resource_text(self.session, self.get_js_url, self.host_headers, timeout)
+                # self.tk = self.get_tk(js_html)
 
             self.api_headers.update({
                 "app-name": "xiaoyi",
@@ -139,9 +149,15 @@ class Caiyun(Tse):
             self.language_map = self.get_language_map(self.get_language_url, self.session, self.api_headers, timeout,
                                                       **debug_lang_kwargs)
 
-            jwt_payload = {'browser_id': self.browser_id}
-            jwt_r = self.session.post(self.get_jwt_url, json=jwt_payload, headers=self.api_headers, timeout=timeout)
-            self.jwt = jwt_r.json()['jwt']
+            if vault_secrets:
+                self.jwt = vault_secrets['jwt']
+            else:
+                jwt_payload = {'browser_id': self.browser_id}
+                jwt_r = self.session.post(self.get_jwt_url, json=jwt_payload, headers=self.api_headers,
+                                          timeout=timeout)
+                self.jwt = jwt_r.json()['jwt']
+                vault_secrets = {'browser_id': self.browser_id, 'jwt': self.jwt}
+                self.set_vault_secrets(vault_secrets, self.session, update_session_after_seconds)
             self.api_headers.update({"T-Authorization": self.jwt})
 
         from_language, to_language = self.check_language(from_language, to_language, self.language_map,
@@ -168,11 +184,13 @@ class Caiyun(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([self.decrypt(item) for item in data['target']])
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.reacquire_secrets_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -210,12 +228,18 @@ class Caiyun(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.tk and self.jwt):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
-            host_html = await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
-            js_url_path = re.compile(self.get_js_pattern).search(host_html).group()
-            self.get_js_url = ''.join([self.host_url, js_url_path])
-            js_html = await (await self.async_session.get(self.get_js_url, headers=self.host_headers, timeout=timeout)).text()
-            # self.tk = self.get_tk(js_html)
+            self.async_session = self.renew_async_session(proxies)
+            vault_secrets = self.get_vault_secrets(self.async_session)
+            if vault_secrets:
+                self.browser_id = vault_secrets['browser_id']
+            else:
+                host_html = await (await self.async_session.get(self.host_url, headers=self.host_headers,
+                                                                timeout=timeout)).text()
+                js_url_path = re.compile(self.get_js_pattern).search(host_html).group()
+                self.get_js_url = ''.join([self.host_url, js_url_path])
+                js_html = await self.get_resource_text_async(self.async_session, self.get_js_url, self.host_headers,
+                                                             timeout)
+                # self.tk = self.get_tk(js_html)
             self.api_headers.update({
                 "app-name": "xiaoyi",
                 "device-id": self.browser_id,
@@ -231,10 +255,15 @@ class Caiyun(Tse):
                                                                   self.api_headers, timeout,
                                                                   **debug_lang_kwargs)
 
-            jwt_payload = {'browser_id': self.browser_id}
-            jwt_r = await self.async_session.post(self.get_jwt_url, json=jwt_payload, headers=self.api_headers,
-                                                  timeout=timeout)
-            self.jwt = (await jwt_r.json())['jwt']
+            if vault_secrets:
+                self.jwt = vault_secrets['jwt']
+            else:
+                jwt_payload = {'browser_id': self.browser_id}
+                jwt_r = await self.async_session.post(self.get_jwt_url, json=jwt_payload, headers=self.api_headers,
+                                                      timeout=timeout)
+                self.jwt = (await jwt_r.json())['jwt']
+                vault_secrets = {'browser_id': self.browser_id, 'jwt': self.jwt}
+                self.set_vault_secrets(vault_secrets, self.async_session, update_session_after_seconds)
             self.api_headers.update({"T-Authorization": self.jwt})
 
         from_language, to_language = self.check_language(from_language, to_language, self.language_map,
@@ -261,5 +290,5 @@ class Caiyun(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([self.decrypt(item) for item in data['target']])
@@ -42,6 +42,7 @@ class cloudTranslationV1(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def cloudTranslation_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                              **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -82,7 +83,7 @@ class cloudTranslationV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = self.session.get(self.get_cookie_url, headers=self.api_headers, timeout=timeout)
             d_lang_map = self.session.get(self.get_lang_url, headers=self.api_headers, timeout=timeout).json()
@@ -119,11 +120,12 @@ class cloudTranslationV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['data']['translation']
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -163,7 +165,7 @@ class cloudTranslationV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = await self.async_session.get(self.get_cookie_url, headers=self.api_headers, timeout=timeout)
             d_lang_map = await (
@@ -202,7 +204,7 @@ class cloudTranslationV1(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['data']['translation']
 
 
@@ -241,6 +243,7 @@ class cloudTranslationV2(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def cloudTranslation_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                              **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -281,7 +284,7 @@ class cloudTranslationV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = self.session.get(self.get_cookie_url, headers=self.api_headers, timeout=timeout)
             d_lang_map = self.session.get(self.get_lang_url, headers=self.api_headers, timeout=timeout).json()
@@ -319,11 +322,12 @@ class cloudTranslationV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else json.loads(data['data']['data'])['translation']
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -363,7 +367,7 @@ class cloudTranslationV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = await self.async_session.get(self.get_cookie_url, headers=self.api_headers, timeout=timeout)
             d_lang_map = await (
@@ -403,5 +407,5 @@ class cloudTranslationV2(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else json.loads(data['data']['data'])['translation']
@@ -23,6 +23,7 @@ class Deepl(Tse):
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(5e3)
+        self.is_line_native = True
         self.default_from_language = self.output_zh
 
     @Tse.debug_language_map
@@ -87,8 +88,15 @@ class Deepl(Tse):
         }
         return {**self.params['handle'], **data}
 
+    @staticmethod
+    def join_lines(data: dict, n_chunks_list: List[int]) -> str:
+        """Translated sentences of a line joined by ' ', and lines(`texts` of LMT_split_text) by '\\n'."""
+        sentences = iter(item['beams'][0]['sentences'][0]['text'] for item in data['result']['translations'])
+        return '\n'.join(' '.join(next(sentences) for _ in range(n_chunks)) for n_chunks in n_chunks_list)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def deepl_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                   **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -127,8 +135,8 @@ class Deepl(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            host_html = self.get_resource_text(self.session, self.host_url, self.host_headers, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
             self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
@@ -146,6 +154,7 @@ class Deepl(Tse):
         s_data = r_s.json()
         from_language = s_data['result']['lang']['detected']
         s_sentences = [it['sentences'][0]['text'] for item in s_data['result']['texts'] for it in item['chunks']]
+        n_chunks_list = [len(item['chunks']) for item in s_data['result']['texts']]
 
         h_data = self.context_sentences_param(s_sentences, from_language, to_language)
         r_cs = self.session.post(self.api_url, params=self.params['handle'], json=h_data, headers=self.api_headers,
@@ -154,12 +163,12 @@ class Deepl(Tse):
         data = r_cs.json()
         time.sleep(sleep_seconds)
         self.request_id += 3
-        self.query_count += 1
-        return data if is_detail_result else ' '.join(
-            item['beams'][0]['sentences'][0]["text"] for item in data['result']['translations'])  # either ' ' or '\n'.
+        self.add_query_count()
+        return data if is_detail_result else self.join_lines(data, n_chunks_list)
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -197,8 +206,9 @@ class Deepl(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
-            host_html = await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
+            self.async_session = self.renew_async_session(proxies)
+            host_html = await self.get_resource_text_async(self.async_session, self.host_url, self.host_headers,
+                                                           timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
             self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
@@ -217,6 +227,7 @@ class Deepl(Tse):
         s_data = await r_s.json()
         from_language = s_data['result']['lang']['detected']
         s_sentences = [it['sentences'][0]['text'] for item in s_data['result']['texts'] for it in item['chunks']]
+        n_chunks_list = [len(item['chunks']) for item in s_data['result']['texts']]
 
         h_data = self.context_sentences_param(s_sentences, from_language, to_language)
         r_cs = await self.async_session.post(self.api_url, params=self.params['handle'], json=h_data,
@@ -226,6 +237,5 @@ class Deepl(Tse):
         data = await r_cs.json()
         await asyncio.sleep(sleep_seconds)
         self.request_id += 3
-        self.query_count += 1
-        return data if is_detail_result else ' '.join(
-            item['beams'][0]['sentences'][0]["text"] for item in data['result']['translations'])  # either ' ' or '\n'.
+        self.add_query_count()
+        return data if is_detail_result else self.join_lines(data, n_chunks_list)
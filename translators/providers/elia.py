@@ -20,6 +20,7 @@ class Elia(Tse):
         self.session = None
         self.language_map = None
         self.professional_field = None
+        self.host_patterns = ('"csrfmiddlewaretoken": "(.*?)"', 'var languagePairs = JSON.parse\\((.*?)\\);')
         self.langpair_domain = None
         self.token = None
         self.query_count = 0
@@ -46,6 +47,7 @@ class Elia(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def elia_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                  **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -86,8 +88,8 @@ class Elia(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, self.host_patterns)
             self.token = re.compile('"csrfmiddlewaretoken": "(.*?)"').search(host_html).group(1)
             d_lang_str = re.compile('var languagePairs = JSON.parse\\((.*?)\\);').search(host_html).group()
             d_lang_map = json.loads(d_lang_str[43:-4].replace('&quot;', '"'))
@@ -127,13 +129,14 @@ class Elia(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translated_text'].replace('</div>', '\n').replace('<div>',
                                                                                                      '').replace(
             '<span>', '').replace('</span>', '')
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -173,8 +176,9 @@ class Elia(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
-            host_html =await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
+            self.async_session = self.renew_async_session(proxies)
+            host_html = await self.get_host_text_async(self.async_session, self.host_url, self.host_headers, timeout,
+                                                       self.host_patterns)
             self.token = re.compile('"csrfmiddlewaretoken": "(.*?)"').search(host_html).group(1)
             d_lang_str = re.compile('var languagePairs = JSON.parse\\((.*?)\\);').search(host_html).group()
             d_lang_map = json.loads(d_lang_str[43:-4].replace('&quot;', '"'))
@@ -215,7 +219,7 @@ class Elia(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translated_text'].replace('</div>', '\n').replace('<div>',
                                                                                                      '').replace(
             '<span>', '').replace('</span>', '')
@@ -49,9 +49,13 @@ class QQFanyi(Tse):
     async def get_qt_async(self, ss: AsyncSessionType, timeout: Optional[float]) -> dict:
         return await (await ss.post(self.get_qt_url, headers=self.qt_headers, json=self.qtv_qtk, timeout=timeout)).json()
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.qtv_qtk)
+
     @Tse.uncertified  # todo: need ticket and randstr of TCaptcha.
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def qqFanyi_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                     **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -90,7 +94,7 @@ class QQFanyi(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.qtv_qtk):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.qtv_qtk = self.get_qt(self.session, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
@@ -114,13 +118,14 @@ class QQFanyi(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join(
             item['targetText'] for item in data['translate']['records'])  # auto whitespace
 
     @Tse.uncertified_async  # todo: need ticket and randstr of TCaptcha.
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -159,7 +164,7 @@ class QQFanyi(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.qtv_qtk):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
             self.qtv_qtk = await self.get_qt_async(self.async_session, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
@@ -184,5 +189,5 @@ class QQFanyi(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join(item['targetText'] for item in data['translate']['records'])
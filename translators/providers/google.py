@@ -102,8 +102,12 @@ class GoogleV1(Tse):
     def get_tkk(self, host_html: str) -> str:
         return re.compile("tkk:'(.*?)'").findall(host_html)[0]
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.api_url)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def google_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                    **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -138,7 +142,7 @@ class GoogleV1(Tse):
             self.host_url = reset_host_url.strip('/')
         else:
             use_cn_condition = kwargs.get('if_use_cn_host', None) or self.server_region == 'CN'
-            self.host_url = self.cn_host_url if use_cn_condition else self.en_host_url
+            self.host_url = self.select_host_url(self.cn_host_url if use_cn_condition else self.en_host_url)
 
         if self.host_url[-2:] == 'cn':
             raise TranslatorError('Google service was offline in inland of China on Oct 2022.')
@@ -159,8 +163,8 @@ class GoogleV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.api_url):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            host_html = self.get_resource_text(self.session, self.host_url, self.host_headers, timeout)
 
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
@@ -182,11 +186,12 @@ class GoogleV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join([item[0] for item in data[0] if isinstance(item[0], str)])
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -221,7 +226,8 @@ class GoogleV1(Tse):
             self.host_url = reset_host_url.strip('/')
         else:
             use_cn_condition = kwargs.get('if_use_cn_host', None) or self.server_region == 'CN'
-            self.host_url = self.cn_host_url if use_cn_condition else self.en_host_url
+            self.host_url = self.select_host_url(self.cn_host_url if use_cn_condition else self.en_host_url,
+                                                 is_async=True)
 
         if self.host_url[-2:] == 'cn':
             raise TranslatorError('Google service was offline in inland of China on Oct 2022.')
@@ -242,8 +248,9 @@ class GoogleV1(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.api_url):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
-            host_html = await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
+            self.async_session = self.renew_async_session(proxies)
+            host_html = await self.get_resource_text_async(self.async_session, self.host_url, self.host_headers,
+                                                           timeout)
 
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
@@ -265,7 +272,7 @@ class GoogleV1(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join([item[0] for item in data[0] if isinstance(item[0], str)])
 
 
@@ -322,6 +329,7 @@ class GoogleV2(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def google_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                    **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -355,7 +363,7 @@ class GoogleV2(Tse):
             self.host_url = reset_host_url.strip('/')
         else:
             use_cn_condition = kwargs.get('if_use_cn_host', None) or self.server_region == 'CN'
-            self.host_url = self.cn_host_url if use_cn_condition else self.en_host_url
+            self.host_url = self.select_host_url(self.cn_host_url if use_cn_condition else self.en_host_url)
 
         if self.host_url[-2:] == 'cn':
             raise TranslatorError('Google service was offline in inland of China on Oct 2022.')
@@ -378,7 +386,7 @@ class GoogleV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             r = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             if urllib.parse.urlparse(self.consent_url).hostname == urllib.parse.urlparse(str(r.url)).hostname:
                 form_data = self.get_consent_data(r.text)
@@ -400,12 +408,13 @@ class GoogleV2(Tse):
         json_data = json.loads(r.text[6:])
         data = json.loads(json_data[0][2])
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return {'data': data} if is_detail_result else ' '.join(
             [x[0] for x in (data[1][0][0][5] or data[1][0]) if x[0]])
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -439,7 +448,8 @@ class GoogleV2(Tse):
             self.host_url = reset_host_url.strip('/')
         else:
             use_cn_condition = kwargs.get('if_use_cn_host', None) or self.server_region == 'CN'
-            self.host_url = self.cn_host_url if use_cn_condition else self.en_host_url
+            self.host_url = self.select_host_url(self.cn_host_url if use_cn_condition else self.en_host_url,
+                                                 is_async=True)
 
         if self.host_url[-2:] == 'cn':
             raise TranslatorError('Google service was offline in inland of China on Oct 2022.')
@@ -461,7 +471,7 @@ class GoogleV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             r = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             if urllib.parse.urlparse(self.consent_url).hostname == urllib.parse.urlparse(str(r.url)).hostname:
                 form_data = self.get_consent_data(await r.text())
@@ -483,6 +493,6 @@ class GoogleV2(Tse):
         json_data = json.loads((await r.text())[6:])
         data = json.loads(json_data[0][2])
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return {'data': data} if is_detail_result else ' '.join(
             [x[0] for x in (data[1][0][0][5] or data[1][0]) if x[0]])
@@ -72,8 +72,12 @@ class LingvanexV1(Tse):
             js_html= await r.text()
         return {k: v for k, v in re.compile(',(.*?)="(.*?)"').findall(js_html)}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.auth_info) and self.mode == kwargs.get('lingvanex_mode', 'B2C')
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def lingvanex_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                       **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -115,7 +119,7 @@ class LingvanexV1(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.auth_info and self.mode == mode):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             self.auth_info = self.get_auth(self.auth_url, self.session, self.host_headers, timeout)
 
@@ -154,7 +158,7 @@ class LingvanexV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['result']
 
     @Tse.time_stat_async
@@ -239,7 +243,7 @@ class LingvanexV1(Tse):
                 r.raise_for_status()
                 data = await r.json()
             await asyncio.sleep(sleep_seconds)
-            self.query_count += 1
+            self.add_query_count()
             return data if is_detail_result else data['result']
 
 
@@ -298,8 +302,12 @@ class LingvanexV2(Tse):
     def get_auth(self, host_html: str) -> str:
         return re.compile('const API_BEARER_TOKEN = "(.*?)"').findall(host_html)[0]
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.auth)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def lingvanex_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                       **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -338,7 +346,7 @@ class LingvanexV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.auth):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.auth = self.get_auth(host_html)
             self.host_headers.update({'authorization': self.auth})
@@ -365,7 +373,7 @@ class LingvanexV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['result']
 
     @Tse.time_stat_async
@@ -428,5 +436,5 @@ class LingvanexV2(Tse):
                 r.raise_for_status()
                 data = await r.json()
             await asyncio.sleep(sleep_seconds)
-            self.query_count += 1
+            self.add_query_count()
             return data if is_detail_result else data['result']
@@ -24,6 +24,7 @@ class Mglip(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def mglip_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'mon',
                   **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -62,7 +63,7 @@ class Mglip(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
         if from_language == 'auto':
@@ -76,12 +77,13 @@ class Mglip(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['datas'][0]['paragraph'] if data['datas'][0]['type'] == 'trans' else \
             data['datas'][0]['data']
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'mon',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -119,7 +121,7 @@ class Mglip(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
         if from_language == 'auto':
@@ -133,6 +135,6 @@ class Mglip(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['datas'][0]['paragraph'] if data['datas'][0]['type'] == 'trans' else \
             data['datas'][0]['data']
@@ -47,9 +47,13 @@ class Mirai(Tse):
         lang_pairs = re.compile('"/trial/(\\w{2})/(\\w{2})"').findall(js_html)
         return {f_lang: [v for k, v in lang_pairs if k == f_lang] for f_lang, t_lang in lang_pairs}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.tran_key)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def mirai_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'ja',
                   **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -88,7 +92,7 @@ class Mirai(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.tran_key):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             # _ = self.session.get(self.home_url, headers=self.host_headers, timeout=timeout)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.tran_key = re.compile('var tran = "(.*?)";').search(host_html).group(1)
@@ -135,11 +139,12 @@ class Mirai(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['ouputs'][0]['output'][0]['translation']
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'ja',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -178,7 +183,7 @@ class Mirai(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.tran_key):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             # _ = await self.async_session.get(self.home_url, headers=self.host_headers, timeout=timeout)
             host_html = await(await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
             self.tran_key = re.compile('var tran = "(.*?)";').search(host_html).group(1)
@@ -228,5 +233,5 @@ class Mirai(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['ouputs'][0]['output'][0]['translation']
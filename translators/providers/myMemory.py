@@ -74,6 +74,7 @@ class MyMemory(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def myMemory_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                      **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -114,7 +115,7 @@ class MyMemory(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
@@ -138,7 +139,7 @@ class MyMemory(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['responseData']['translatedText']
 
     @Tse.time_stat_async
@@ -208,5 +209,5 @@ class MyMemory(Tse):
                 response.raise_for_status()
                 data = await response.json()
             await asyncio.sleep(sleep_seconds)
-            self.query_count += 1
+            self.add_query_count()
             return data if is_detail_result else data['responseData']['translatedText']
@@ -66,9 +66,13 @@ class NiutransV1(Tse):
         )).decode()
         return cipher_text  # TODO
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.account_info and self.api_headers)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def niutrans_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                      **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -108,7 +112,7 @@ class NiutransV1(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.account_info and self.api_headers):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = self.session.options(self.cookie_url, headers=self.host_headers, timeout=timeout)
 
@@ -149,12 +153,13 @@ class NiutransV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(
             [' '.join([it['data'] for it in item['sentences']]) for item in data['data']])
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -193,7 +198,7 @@ class NiutransV1(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.account_info and self.api_headers):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = await self.async_session.options(self.cookie_url, headers=self.host_headers, timeout=timeout)
 
@@ -237,7 +242,7 @@ class NiutransV1(Tse):
         r.raise_for_status()
         data = await  r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(
             [' '.join([it['data'] for it in item['sentences']]) for item in data['data']])
 
@@ -363,9 +368,13 @@ class NiutransV2(Tse):
         self.geetest_verify_data = json.loads((await r_gv.text())[22:-1])['data']['seccode']
         return
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.captcha_id)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def niutrans_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                      **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -405,7 +414,7 @@ class NiutransV2(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.captcha_id):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = self.session.get(self.login_url, headers=self.host_headers, timeout=timeout)
             self.captcha_id = self.get_captcha_id(self.geetest_captcaha_url, self.session, self.host_headers, timeout)
@@ -442,11 +451,12 @@ class NiutransV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['tgt_text']
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -486,7 +496,7 @@ class NiutransV2(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = await self.async_session.get(self.login_url, headers=self.host_headers, timeout=timeout)
             # self.captcha_id = await self.get_captcha_id_async(self.geetest_captcaha_url, self.async_session,
@@ -525,5 +535,5 @@ class NiutransV2(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['tgt_text']
@@ -51,8 +51,12 @@ class Reverso(Tse):
         lang_dict = await exejs.evaluate_async(lang_dict_str)
         return {k: v for v, k in lang_dict.items()}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.decrypt_language_map)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def reverso_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                     **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -92,7 +96,7 @@ class Reverso(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.decrypt_language_map):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
             # self.language_url = re.compile(self.language_pattern).search(host_html).group()
@@ -125,11 +129,12 @@ class Reverso(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join(data['translation'])
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -168,7 +173,7 @@ class Reverso(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.decrypt_language_map):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
             # self.language_url = re.compile(self.language_pattern).search(host_html).group()
@@ -202,5 +207,5 @@ class Reverso(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join(data['translation'])
@@ -29,6 +29,7 @@ class SysTran(Tse):
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(5e3)
+        self.is_line_native = True
         self.default_from_language = self.output_zh
 
     @Tse.debug_language_map
@@ -74,6 +75,7 @@ class SysTran(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def sysTran_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                     **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -114,7 +116,7 @@ class SysTran(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             self.client_data = self.get_client_data(self.get_client_url, self.session, self.host_headers, timeout)
             payload = urllib.parse.urlencode(self.client_data)
@@ -163,13 +165,14 @@ class SysTran(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(' '.join(it['alt_transes'][0]['target']['text'] for it in
                                                                 item['output']['documents'][0]['trans_units'][0][
                                                                     'sentences']) for item in data['outputs'])
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -209,7 +212,7 @@ class SysTran(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             self.client_data = await self.get_client_data_async(self.get_client_url, self.async_session,
                                                                 self.host_headers, timeout)
@@ -261,7 +264,7 @@ class SysTran(Tse):
         r.raise_for_status()
         data =await  r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(' '.join(it['alt_transes'][0]['target']['text'] for it in
                                                                 item['output']['documents'][0]['trans_units'][0][
                                                                     'sentences']) for item in data['outputs'])
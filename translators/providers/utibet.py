@@ -29,6 +29,7 @@ class Utibet(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def utibet_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'ti',
                    **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -67,7 +68,7 @@ class Utibet(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
         if from_language == 'auto':
@@ -84,11 +85,12 @@ class Utibet(Tse):
         r.raise_for_status()
         data_html = r.text
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return {'data_html': data_html} if is_detail_result else self.parse_result(data_html)
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'ti',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -125,7 +127,7 @@ class Utibet(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
         if from_language == 'auto':
@@ -141,5 +143,5 @@ class Utibet(Tse):
         r.raise_for_status()
         data_html =await  r.text()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return {'data_html': data_html} if is_detail_result else self.parse_result(data_html)
@@ -4,7 +4,7 @@ import random
 import re
 import time
 import urllib.parse
-from typing import Optional, Union
+from typing import Optional, Union, List
 
 from yarl import URL
 
@@ -26,6 +26,8 @@ class YandexV1(Tse):
         self.language_map = None
         self.session = None
         self.sid = None
+        self.host_patterns = ("SID: '(.*?)',",)
+        self.lang_pattern = 'TRANSLATOR_LANGS: {(.*?)},'
         self.yu = None
         self.yum = None
         self.sprvk = None
@@ -88,9 +90,13 @@ class YandexV1(Tse):
         lang = (await r.json()).get('lang')
         return lang if lang else 'en'
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.sid and self.yu)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def yandex_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                    **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -138,10 +144,11 @@ class YandexV1(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.sid and self.yu):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            _ = self.session.get(self.home_url, headers=self.host_headers, timeout=timeout)
-            _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            _ = self.get_host_text(self.session, self.home_url, self.host_headers, timeout, ())
+            _ = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, ())
+            host_patterns = self.host_patterns + (() if self.is_language_map_cached() else (self.lang_pattern,))
+            host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, host_patterns)
 
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
@@ -176,11 +183,12 @@ class YandexV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(data['text'])
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -227,10 +235,12 @@ class YandexV1(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.sid and self.yu):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
-            _ = await self.async_session.get(self.home_url, headers=self.host_headers, timeout=timeout)
-            _ = await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)
-            host_html = await (await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
+            self.async_session = self.renew_async_session(proxies)
+            _ = await self.get_host_text_async(self.async_session, self.home_url, self.host_headers, timeout, ())
+            _ = await self.get_host_text_async(self.async_session, self.host_url, self.host_headers, timeout, ())
+            host_patterns = self.host_patterns + (() if self.is_language_map_cached() else (self.lang_pattern,))
+            host_html = await self.get_host_text_async(self.async_session, self.host_url, self.host_headers, timeout,
+                                                       host_patterns)
 
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
@@ -266,7 +276,7 @@ class YandexV1(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(data['text'])
 
 
@@ -287,25 +297,52 @@ class YandexV2(Tse):
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(1e4)  # ten thousand.
+        self.is_line_native = True
         self.default_from_language = self.output_zh
 
-    def get_request_data(self, ss: SessionType, method: str, params: dict, timeout: Optional[float]) -> dict:
+    def get_request_data(self, ss: SessionType, method: str, params: Union[dict, list],
+                         timeout: Optional[float]) -> dict:
         url = f'{self.api_url}/{method}'
-        params = {**{'srv': self.srv}, **params}
+        params = [('srv', self.srv), *(params.items() if isinstance(params, dict) else params)]
         r = ss.post(url=url, params=params, data=self.api_payload, headers=self.api_headers, timeout=timeout)
         r.raise_for_status()
         data = r.json()
         return data
 
-    async def get_request_data_async(self, ss: AsyncSessionType, method: str, params: dict,
+    async def get_request_data_async(self, ss: AsyncSessionType, method: str, params: Union[dict, list],
                                      timeout: Optional[float]) -> dict:
         url = f'{self.api_url}/{method}'
-        params = {**{'srv': self.srv}, **params}
+        params = [('srv', self.srv), *(params.items() if isinstance(params, dict) else params)]
         r = await ss.post(url=url, params=params, data=self.api_payload, headers=self.api_headers, timeout=timeout)
         r.raise_for_status()
         data = await r.json()
         return data
 
+    @staticmethod
+    def get_translate_params(query_text: str, from_language: str, to_language: str,
+                             if_split_lines: bool = False) -> Union[dict, list]:
+        """
+        A query goes as one `text` param. Lines of packed segments(`if_split_lines`) go as repeated `text` params
+        instead, except blank ones, so that they come back line for line.
+        """
+        if not if_split_lines:
+            return {'text': query_text, 'lang': f'{from_language}-{to_language}'}
+        lines = [line for line in query_text.split('\n') if line.strip()]
+        return [('lang', f'{from_language}-{to_language}'), *[('text', line) for line in lines]]
+
+    @staticmethod
+    def join_lines(query_text: str, translated_lines: List[str], if_split_lines: bool = False) -> str:
+        """Put blank lines back in place, after checking that every line sent came back."""
+        if not if_split_lines:
+            return translated_lines[0]
+
+        lines = query_text.split('\n')
+        n_lines = sum(1 for line in lines if line.strip())
+        if len(translated_lines) != n_lines:
+            raise TranslatorError(f'Yandex returned {len(translated_lines)} lines of {n_lines} lines sent.')
+        translated_lines = iter(translated_lines)
+        return '\n'.join(next(translated_lines) if line.strip() else line for line in lines)
+
     @Tse.debug_language_map
     def get_language_map(self, ss: SessionType, timeout: Optional[float], **kwargs: LangMapKwargsType) -> dict:
         lang_map = {}
@@ -325,6 +362,7 @@ class YandexV2(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def yandex_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                    **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -363,7 +401,7 @@ class YandexV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
             self.language_map = self.get_language_map(ss=self.session, timeout=timeout, **debug_lang_kwargs)
@@ -379,14 +417,16 @@ class YandexV2(Tse):
             if not from_language:
                 from_language = self.warning_auto_lang('yandex', self.default_from_language, if_print_warning)
 
-        params = {'text': query_text, 'lang': f'{from_language}-{to_language}'}
+        if_split_lines = kwargs.get('if_split_lines', False)
+        params = self.get_translate_params(query_text, from_language, to_language, if_split_lines)
         data = self.get_request_data(ss=self.session, method='translate', params=params, timeout=timeout)
         time.sleep(sleep_seconds)
-        self.query_count += 1
-        return data if is_detail_result else data['text'][0]
+        self.add_query_count()
+        return data if is_detail_result else self.join_lines(query_text, data['text'], if_split_lines)
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -424,7 +464,7 @@ class YandexV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
             self.language_map = await self.get_language_map_async(ss=self.async_session, timeout=timeout,
@@ -443,9 +483,10 @@ class YandexV2(Tse):
             if not from_language:
                 from_language = self.warning_auto_lang('yandex', self.default_from_language, if_print_warning)
 
-        params = {'text': query_text, 'lang': f'{from_language}-{to_language}'}
+        if_split_lines = kwargs.get('if_split_lines', False)
+        params = self.get_translate_params(query_text, from_language, to_language, if_split_lines)
         data = await self.get_request_data_async(ss=self.async_session, method='translate', params=params,
                                                  timeout=timeout)
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
-        return data if is_detail_result else data['text'][0]
+        self.add_query_count()
+        return data if is_detail_result else self.join_lines(query_text, data['text'], if_split_lines)
@@ -60,24 +60,23 @@ class YoudaoV1(Tse):
         try:
             if not self.get_sign_url:
                 self.get_sign_url = re.compile(self.get_sign_pattern).search(host_html).group()
-            r = ss.get(self.get_sign_url, headers=self.host_headers, timeout=timeout)
-            r.raise_for_status()
+            js_html = self.get_resource_text(ss, self.get_sign_url, self.host_headers, timeout, if_raise_for_status=True)
         except:
-            r = ss.get(self.get_sign_old_url, headers=self.host_headers, timeout=timeout)
-            r.raise_for_status()
-        sign = re.compile('md5\\("fanyideskweb" \\+ e \\+ i \\+ "(.*?)"\\)').findall(r.text)
+            js_html = self.get_resource_text(ss, self.get_sign_old_url, self.host_headers, timeout,
+                                             if_raise_for_status=True)
+        sign = re.compile('md5\\("fanyideskweb" \\+ e \\+ i \\+ "(.*?)"\\)').findall(js_html)
         return sign[0] if sign and sign != [''] else "Ygy_4c=r#e#4EX^NUGUc5"  # v1.1.10
 
     async def get_sign_key_async(self, host_html: str, ss: AsyncSessionType, timeout: Optional[float]) -> str:
         try:
             if not self.get_sign_url:
                 self.get_sign_url = re.compile(self.get_sign_pattern).search(host_html).group()
-            r = await ss.get(self.get_sign_url, headers=self.host_headers, timeout=timeout)
-            r.raise_for_status()
+            js_html = await self.get_resource_text_async(ss, self.get_sign_url, self.host_headers, timeout,
+                                                         if_raise_for_status=True)
         except:
-            r = await ss.get(self.get_sign_old_url, headers=self.host_headers, timeout=timeout)
-            r.raise_for_status()
-        sign = re.compile('md5\\("fanyideskweb" \\+ e \\+ i \\+ "(.*?)"\\)').findall(await r.text())
+            js_html = await self.get_resource_text_async(ss, self.get_sign_old_url, self.host_headers, timeout,
+                                                         if_raise_for_status=True)
+        sign = re.compile('md5\\("fanyideskweb" \\+ e \\+ i \\+ "(.*?)"\\)').findall(js_html)
         return sign[0] if sign and sign != [''] else "Ygy_4c=r#e#4EX^NUGUc5"
 
     def get_form(self, query_text: str, from_language: str, to_language: str, sign_key: str) -> dict:
@@ -105,8 +104,12 @@ class YoudaoV1(Tse):
         }
         return form
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.sign_key)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def youdao_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                    **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -145,7 +148,7 @@ class YoudaoV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.sign_key):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.sign_key = self.get_sign_key(host_html, self.session, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
@@ -161,12 +164,13 @@ class YoudaoV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(
             [' '.join([it['tgt'] for it in item]) for item in data['translateResult']])
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -205,7 +209,7 @@ class YoudaoV1(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.sign_key):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             host_html = await (
                 await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
             self.sign_key = await self.get_sign_key_async(host_html, self.async_session, timeout)
@@ -222,7 +226,7 @@ class YoudaoV1(Tse):
         r.raise_for_status()
         data = await  r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(
             [' '.join([it['tgt'] for it in item]) for item in data['translateResult']])
 
@@ -300,9 +304,13 @@ class YoudaoV2(Tse):
         _ciphertext = ''.join(list(map(lambda k: decrypt_dictionary[k], cipher_text)))
         return base64.b64decode(_ciphertext).decode()
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.secret_key)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def youdao_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                    **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -347,7 +355,7 @@ class YoudaoV2(Tse):
         if not (
                 self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.secret_key):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             _ = self.session.get(self.login_url, headers=self.host_headers, timeout=timeout)
             self.professional_field_map = \
@@ -385,12 +393,13 @@ class YoudaoV2(Tse):
         r.raise_for_status()  # raise TranslatorError('YoudaoV2 has not been completed.')  # TODO
         data = self.decrypt(r.text, decrypt_dictionary={})
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else str(data)  # TODO
 
     @Tse.uncertified_async
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -435,7 +444,7 @@ class YoudaoV2(Tse):
         if not (
                 self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time and self.secret_key):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             host_html = await (
                 await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
             _ = await self.async_session.get(self.login_url, headers=self.host_headers, timeout=timeout)
@@ -477,7 +486,7 @@ class YoudaoV2(Tse):
         r.raise_for_status()
         data = self.decrypt(await r.text(), decrypt_dictionary={})
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else str(data)
 
 
@@ -505,6 +514,7 @@ class YoudaoV3(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def youdao_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                    **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -543,7 +553,7 @@ class YoudaoV3(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
                                                        if_print_warning)
@@ -560,11 +570,12 @@ class YoudaoV3(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translation'][0]
 
     @Tse.time_stat_async
     @Tse.check_query_async
+    @Tse.single_flight_refresh_async
     async def trans_api_async(self, query_text: str, from_language: str = 'auto', to_language: str = 'en',
                               **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
@@ -603,7 +614,7 @@ class YoudaoV3(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.async_session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.async_session = Tse.get_async_client_session(proxies)
+            self.async_session = self.renew_async_session(proxies)
             host_html = await (
                 await self.async_session.get(self.host_url, headers=self.host_headers, timeout=timeout)).text()
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language,
@@ -621,5 +632,5 @@ class YoudaoV3(Tse):
         r.raise_for_status()
         data = await r.json()
         await asyncio.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translation'][0]
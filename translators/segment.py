@@ -0,0 +1,257 @@
+import re
+import threading
+from typing import Optional, List, Dict
+
+
+LENGTH_UNITS = ('code_point', 'utf16', 'byte')
+QUERY_LENGTH_BIAS = 10  # bias_of_length of `Tse.check_query`.
+MARKER_FORMAT = '[{}] '
+MARKER_PATTERN = re.compile(r'[\[［【]\s*(\d+)\s*[\]］】]\s*')  # full-width brackets of CJK translations too.
+BOUNDARY_PATTERNS = (
+    re.compile(r'\n[^\S\n]*\n\s*'),  # paragraph
+    re.compile(r'\n\s*'),  # line
+    re.compile('[。！？…]+[”’」』）)\\]"\']*\\s*|[.!?]+["\')\\]]*\\s+'),  # sentence
+    re.compile(r'[，、；：]\s*|[,;:]\s+'),  # clause
+    re.compile(r'\s+'),  # word
+)
+
+
+def get_text_length(text: str, length_unit: str = 'utf16') -> int:
+    """
+    Length of `text` counted in the unit of a translator's limit: code points(`len` of python), UTF-16 code units
+    (`length` of javascript, checked by most web front-ends) or UTF-8 bytes.
+    """
+    if length_unit == 'code_point':
+        return len(text)
+    if length_unit == 'utf16':
+        return len(text.encode('utf-16-le')) // 2
+    if length_unit == 'byte':
+        return len(text.encode('utf-8'))
+    raise ValueError(f'Unsupported length_unit: {length_unit}.')
+
+
+def get_segment_limit(input_limit: Optional[int], limit_of_length: int = 20000) -> int:
+    """The longest text accepted by both `Tse.check_input_limit` and `Tse.check_query`."""
+    query_limit = limit_of_length - QUERY_LENGTH_BIAS - 1
+    return query_limit if input_limit is None else min(input_limit, query_limit)
+
+
+class SegmentPacker:
+    def __init__(self, delimiter: str = '\n', max_segments: int = 50, length_unit: str = 'utf16'):
+        """
+        Pack short segments into as few requests as possible, joined by `delimiter` and each under the input limit of
+        the translator, then split the translation back. Each segment is sent after a numbered marker, eg: '[3] ', and
+        its translation is the text between its marker and the next one. A pack whose translation does not bring back
+        every marker in order, or has a segment translated into nothing, is not trusted, its segments are translated
+        one by one instead.
+        Segments are packed stripped, as translators strip a query anyway. Segments of whitespace only, or containing
+        `delimiter` or something like a marker inside, are always sent alone.
+        :param delimiter: str, default '\\n'. Line breaks are kept by nearly all translators.
+        :param max_segments: int, default 50. Max number of segments of a pack, ie: of a fallback after a failed split.
+        :param length_unit: str, default 'utf16'. Union['code_point', 'utf16', 'byte']
+        """
+        if length_unit not in LENGTH_UNITS:
+            raise ValueError(f'Unsupported length_unit: {length_unit}.')
+
+        self.delimiter = delimiter
+        self.max_segments = max_segments
+        self.length_unit = length_unit
+        self.length_units: Dict[str, str] = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def configure(self, delimiter: str = '\n', max_segments: int = 50, length_unit: str = 'utf16',
+                  length_units: Optional[Dict[str, str]] = None) -> None:
+        if {length_unit, *(length_units or {}).values()} - set(LENGTH_UNITS):
+            raise ValueError(f'Unsupported length_unit, choose from {LENGTH_UNITS}.')
+
+        with self._lock:
+            self.delimiter = delimiter
+            self.max_segments = max_segments
+            self.length_unit = length_unit
+            self.length_units = dict(length_units or {})
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def is_packable(self, segment: str) -> bool:
+        segment = segment.strip()
+        return bool(segment) and self.delimiter not in segment and not MARKER_PATTERN.search(segment)
+
+    @staticmethod
+    def get_marker(i: int) -> str:
+        return MARKER_FORMAT.format(i + 1)
+
+    def pack(self, translator: str, segments: List[str], limit: int) -> List[List[str]]:
+        """
+        Group `segments` in order, greedily, so that each joined group is at most `limit` long in the length unit of
+        `translator`. Segments not packable, or too long to share a request, make a group of their own.
+        """
+        length_unit = self.get_length_unit(translator)
+        delimiter_length = get_text_length(self.delimiter, length_unit)
+        max_marker_length = get_text_length(self.get_marker(self.max_segments - 1), length_unit)
+        groups, group, group_length = [], [], 0
+        for segment in segments:
+            length = get_text_length(segment.strip(), length_unit)
+            if not self.is_packable(segment) or delimiter_length + max_marker_length + length > limit:
+                groups.append([segment])
+                continue
+
+            marker_length = get_text_length(self.get_marker(len(group)), length_unit)
+            if group and (group_length + delimiter_length + marker_length + length > limit
+                          or len(group) >= self.max_segments):
+                groups.append(group)
+                group, group_length = [], 0
+                marker_length = get_text_length(self.get_marker(0), length_unit)
+            group_length += (delimiter_length if group else 0) + marker_length + length
+            group.append(segment)
+
+        if group:
+            groups.append(group)
+        return groups
+
+    def get_length_unit(self, translator: str) -> str:
+        return self.length_units.get(translator, self.length_unit)
+
+    def join(self, group: List[str]) -> str:
+        return self.delimiter.join(self.get_marker(i) + segment.strip() for i, segment in enumerate(group))
+
+    def _strip(self, part: str) -> str:
+        part, delimiter = part.strip(), self.delimiter.strip()
+        return part[:-len(delimiter)].strip() if delimiter and part.endswith(delimiter) else part
+
+    def split(self, translator: str, translated_text: str, n_segments: int) -> Optional[List[str]]:
+        """
+        Translations of a pack in order, or None if they can not be aligned with its `n_segments` segments: markers
+        missing, repeated or out of order, text before the first marker, or a segment translated into nothing.
+        """
+        matches = list(MARKER_PATTERN.finditer(translated_text))
+        is_aligned = [int(match.group(1)) for match in matches] == list(range(1, n_segments + 1)) \
+            and not self._strip(translated_text[:matches[0].start()] if matches else translated_text)
+        parts = []
+        if is_aligned:
+            ends = [match.start() for match in matches[1:]] + [len(translated_text)]
+            parts = [self._strip(translated_text[match.end():end]) for match, end in zip(matches, ends)]
+            is_aligned = all(parts)
+        self.record(translator, n_segments, is_aligned)
+        return parts if is_aligned else None
+
+    def record(self, translator: str, n_segments: int, is_aligned: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(translator, {'packs': 0, 'segments': 0, 'fallbacks': 0})
+            stats['packs'] += 1
+            stats['segments'] += n_segments
+            stats['fallbacks'] += 0 if is_aligned else 1
+
+    def info(self, translator: Optional[str] = None) -> dict:
+        with self._lock:
+            if translator is not None:
+                return dict(self._stats.get(translator, {}))
+            return {translator: dict(stats) for translator, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class TextChunker:
+    def __init__(self, concurrency: int = 8):
+        """
+        Split a text longer than the limit of a translator into chunks under it, at paragraph, line, sentence(CJK and
+        Latin), clause or word boundaries, in that order of preference, and join the translated chunks back with the
+        whitespace and line breaks of the text. Disabled until configured.
+        :param concurrency: int, default 8. Number of chunks of a text translated at a time.
+        """
+        self.concurrency = concurrency
+        self.is_enabled = False
+        self.n_texts = 0
+        self.n_chunks = 0
+        self._lock = threading.Lock()
+
+    def configure(self, concurrency: int = 8, is_enabled: bool = True) -> None:
+        self.concurrency = concurrency
+        self.is_enabled = is_enabled
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cut(text: str, pattern: re.Pattern) -> List[str]:
+        pieces, start = [], 0
+        for match in pattern.finditer(text):
+            if match.end() > start:
+                pieces.append(text[start:match.end()])
+                start = match.end()
+        if start < len(text):
+            pieces.append(text[start:])
+        return pieces
+
+    @staticmethod
+    def _cut_by_length(text: str, limit: int, length_unit: str) -> List[str]:
+        pieces, start, length = [], 0, 0
+        for i, char in enumerate(text):
+            char_length = get_text_length(char, length_unit)
+            if length + char_length > limit and i > start:
+                pieces.append(text[start:i])
+                start, length = i, 0
+            length += char_length
+        pieces.append(text[start:])
+        return pieces
+
+    def _split(self, text: str, limit: int, length_unit: str, level: int) -> List[str]:
+        if get_text_length(text.strip(), length_unit) <= limit:
+            return [text]
+        if level == len(BOUNDARY_PATTERNS):
+            return self._cut_by_length(text, limit, length_unit)
+
+        chunks = []
+        for piece in self._cut(text, BOUNDARY_PATTERNS[level]):
+            if get_text_length(piece.strip(), length_unit) > limit:
+                chunks.extend(self._split(piece, limit, length_unit, level + 1))
+            elif chunks and get_text_length((chunks[-1] + piece).strip(), length_unit) <= limit:
+                chunks[-1] += piece
+            else:
+                chunks.append(piece)
+        return chunks
+
+    def split(self, text: str, limit: int, length_unit: str = 'utf16') -> List[str]:
+        """Chunks of `text`, each at most `limit` long stripped, that concatenate to `text` exactly."""
+        chunks = self._split(text, limit, length_unit, level=0)
+        with self._lock:
+            self.n_texts += 1
+            self.n_chunks += len(chunks)
+        return chunks
+
+    @staticmethod
+    def join(chunks: List[str], translated_dict: Dict[str, str]) -> str:
+        """Replace the stripped content of each chunk by its translation, keeping the whitespace around it exactly."""
+        result = []
+        for chunk in chunks:
+            content = chunk.strip()
+            if not content:
+                result.append(chunk)
+                continue
+
+            leading, trailing = chunk[:len(chunk) - len(chunk.lstrip())], chunk[len(chunk.rstrip()):]
+            result.append(leading + translated_dict[content] + trailing)
+        return ''.join(result)
+
+    def info(self) -> dict:
+        return {'enabled': self.is_enabled, 'concurrency': self.concurrency, 'texts': self.n_texts,
+                'chunks': self.n_chunks}
+
+
+segment_packer = SegmentPacker()
+text_chunker = TextChunker()
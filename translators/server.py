@@ -36,10 +36,12 @@ import base64
 import random
 import hashlib
 import datetime
+import threading
 # import warnings
 import functools
 import urllib.parse
-from typing import Optional, Union, Tuple, List
+import concurrent.futures
+from typing import Optional, Union, Tuple, List, Callable, Any
 
 import tqdm
 import httpx
@@ -48,13 +50,21 @@ import requests
 import niquests
 import cloudscraper
 import lxml.etree as lxml_etree
-import pathos.multiprocessing as pathos_multiprocessing
 import cryptography.hazmat.primitives.ciphers as cry_ciphers
 import cryptography.hazmat.primitives.padding as cry_padding
 import cryptography.hazmat.primitives.hashes as cry_hashes
 import cryptography.hazmat.primitives.serialization as cry_serialization
 import cryptography.hazmat.primitives.asymmetric.padding as cry_asym_padding
 
+from translators.cache import TranslationMemory, ResultCache, language_map_snapshot, token_vault
+from translators.cache import resource_cache, negative_cache, session_lifetime, is_rejection_error
+from translators.concurrency import SingleFlight, RefreshGate, IdentityPool, BackgroundRefresher, EventLoopThread
+from translators.concurrency import get_flight_key
+from translators.transport import Transport, transport, endpoint_selector
+from translators.transport import stream_stats, read_text_until, DnsCache, dns_cache
+from translators.segment import segment_packer, get_segment_limit, text_chunker
+from translators.config import ConfigMixin
+
 
 LangMapKwargsType = Union[str, bool]
 ApiKwargsType = Union[str, int, float, bool, dict]
@@ -98,6 +108,14 @@ class Tse:
         self.transform_en_translator_pool = ('itranslate', 'lingvanex', 'myMemory', 'apertium', 'cloudTranslation', 'translateMe')
         self.auto_pool = ('auto', 'detect', 'auto-detect', 'all')
         self.zh_pool = ('zh', 'zh-CN', 'zh-cn', 'zh-CHS', 'zh-Hans', 'zh-Hans_CN', 'cn', 'chi', 'Chinese')
+        self.is_vault_restored = False
+        self.is_vault_deferred = False  # warming up in the background, see `take_over`.
+        self.deferred_vault_item: Optional[tuple] = None
+        self.is_temp_language_map = False
+        self.identity = 0
+        self.is_line_native = False  # lines of a query go as a list on the wire, and come back line for line.
+        self.refresh_gate = RefreshGate()
+        self.query_count_lock = threading.Lock()
 
     @staticmethod
     def time_stat(func):
@@ -191,6 +209,7 @@ class Tse:
                        if_check_lang_reverse: bool = True,
                        ) -> Tuple[str, str]:
 
+        raw_from_language, raw_to_language = from_language, to_language
         if output_en_translator:
             from_language, to_language = self.check_en_lang(from_language, to_language, output_en_translator, output_en)
 
@@ -199,14 +218,19 @@ class Tse:
         to_language = output_zh if to_language in self.zh_pool else to_language
 
         if from_language != output_auto and from_language not in language_map:
-            raise TranslatorError('Unsupported from_language[{}] in {}.'.format(from_language, sorted(language_map.keys())))
+            error = 'Unsupported from_language[{}] in {}.'.format(from_language, sorted(language_map.keys()))
         elif to_language not in language_map and if_check_lang_reverse:
-            raise TranslatorError('Unsupported to_language[{}] in {}.'.format(to_language, sorted(language_map.keys())))
+            error = 'Unsupported to_language[{}] in {}.'.format(to_language, sorted(language_map.keys()))
         elif from_language != output_auto and to_language not in language_map[from_language]:
-            raise TranslatorError('Unsupported translation: from [{0}] to [{1}]!'.format(from_language, to_language))
+            error = 'Unsupported translation: from [{0}] to [{1}]!'.format(from_language, to_language)
         elif from_language == to_language:
-            raise TranslatorError(f'from_language[{from_language}] and to_language[{to_language}] should not be same.')
-        return from_language, to_language
+            error = f'from_language[{from_language}] and to_language[{to_language}] should not be same.'
+        else:
+            return from_language, to_language
+
+        if not self.is_temp_language_map:
+            negative_cache.set_unsupported(type(self).__name__, raw_from_language, raw_to_language, error)
+        raise TranslatorError(error)
 
     @staticmethod
     def warning_auto_lang(translator: str, default_from_language: str, if_print_warning: bool = True) -> str:
@@ -241,12 +265,26 @@ class Tse:
 
         @functools.wraps(func)
         def _wrapper(*args, **kwargs):
+            snapshot_name = type(args[0]).__name__
+            args[0].is_temp_language_map = False
+            language_map = language_map_snapshot.get(snapshot_name)
+            if language_map:
+                return language_map
+
+            if negative_cache.is_language_map_failed(snapshot_name):
+                args[0].is_temp_language_map = True
+                return make_temp_language_map(kwargs.get('from_language'), kwargs.get('to_language'),
+                                              kwargs.get('default_from_language'))
+
             try:
                 language_map = func(*args, **kwargs)
                 if not language_map:
                     raise TranslatorError
+                language_map_snapshot.set(snapshot_name, language_map)
                 return language_map
             except Exception as e:
+                negative_cache.set_language_map_failure(snapshot_name)
+                args[0].is_temp_language_map = True
                 # if kwargs.get('if_print_warning', True):
                 #     warnings.warn(f'GetLanguageMapError: {str(e)}.\nThe function make_temp_language_map() works.')
                 return make_temp_language_map(kwargs.get('from_language'), kwargs.get('to_language'), kwargs.get('default_from_language'))
@@ -309,6 +347,88 @@ class Tse:
                 raise TranslatorError(f'{raise_tips1} {raise_tips2}')
         return _wrapper
 
+    def add_query_count(self) -> None:
+        with self.query_count_lock:
+            self.query_count += 1
+
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        """Whether the secrets the api needs besides the session(token, sign, key...) are acquired."""
+        return True
+
+    def is_session_ready(self, **kwargs: ApiKwargsType) -> bool:
+        update_session_after_freq = kwargs.get('update_session_after_freq', self.default_session_freq)
+        update_session_after_seconds = kwargs.get('update_session_after_seconds', self.default_session_seconds)
+        return bool(getattr(self, 'session', None) and getattr(self, 'language_map', None)
+                    and self.query_count % update_session_after_freq != 0
+                    and time.time() - self.begin_time < update_session_after_seconds
+                    and self.is_secrets_ready(**kwargs))
+
+    def is_session_expiring(self, lead_ratio: float = 0.8) -> bool:
+        if not getattr(self, 'session', None):
+            return False
+        return (time.time() - self.begin_time >= lead_ratio * self.default_session_seconds
+                or self.query_count % self.default_session_freq >= lead_ratio * self.default_session_freq)
+
+    @staticmethod
+    def single_flight_refresh(func):
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            self = args[0]
+            is_learned = 'update_session_after_freq' not in kwargs and 'update_session_after_seconds' not in kwargs
+            if is_learned:
+                session_lifetime.apply(self)
+            is_ready = self.is_session_ready(**kwargs)
+
+            t1 = time.time()
+            try:
+                result = self.refresh_gate.run(lambda: self.is_session_ready(**kwargs), func, *args, **kwargs)
+                endpoint_selector.observe(self, time.time() - t1, True)
+                session_lifetime.record_success(self)
+                return result
+            except Exception as e:
+                if not isinstance(e, TranslatorError):
+                    endpoint_selector.observe(self, time.time() - t1, False)
+                if not (is_ready and self.session and is_rejection_error(e)):
+                    raise
+                if is_learned:
+                    session_lifetime.record_rejection(self)
+                self.reset_rejected_session()
+                return self.refresh_gate.run(lambda: self.is_session_ready(**kwargs), func, *args, **kwargs)
+        return _wrapper
+
+    def select_host_url(self, default_host_url: str) -> str:
+        host_url = endpoint_selector.select(type(self).__name__, default_host_url)
+        if self.host_url and host_url != self.host_url:
+            self.session = None  # cookies and tokens belong to the previous host.
+        return host_url
+
+    def reset_rejected_session(self) -> None:
+        """
+        Re-acquire only what a rejection invalidates: session, cookies and tokens. `language_map` is kept, and its
+        snapshot spares scraping it again.
+        """
+        token_vault.invalidate(self.get_identity_name())
+        self.is_vault_restored = False
+        self.session = None
+
+    @staticmethod
+    def reacquire_secrets(func):
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except TranslatorError:
+                raise
+            except Exception:
+                self = args[0]
+                if not self.is_vault_restored:
+                    raise
+                token_vault.invalidate(self.get_identity_name())
+                self.is_vault_restored = False
+                self.session = None
+                return func(*args, **kwargs)
+        return _wrapper
+
     # @staticmethod
     # def certified(func):
     #     @functools.wraps(func)
@@ -320,26 +440,84 @@ class Tse:
     #     return _wrapper
 
     @staticmethod
-    def get_client_session(http_client: str = 'requests', proxies: Optional[dict] = None) -> SessionType:
+    def get_client_session(http_client: str = 'requests', proxies: Optional[dict] = None,
+                           name: Optional[str] = None) -> SessionType:
         if http_client not in ('requests', 'niquests', 'httpx', 'cloudscraper'):
             raise TranslatorError
 
-        if proxies is None:
-            proxies = {}
-
-        if http_client == 'requests':
-            session = requests.Session()
-            session.proxies = proxies
-        elif http_client == 'niquests':
-            session = niquests.Session(happy_eyeballs=True)
-            session.proxies = proxies
-        elif http_client == 'httpx':
-            proxy_url = proxies.get('http') or proxies.get('https')
-            session = httpx.Client(follow_redirects=True, proxy=proxy_url)
-        else:
-            session = cloudscraper.create_scraper()
-            session.proxies = proxies
-        return session
+        return transport.get_session(http_client, proxies, name)
+
+    def renew_session(self, http_client: str = 'requests', proxies: Optional[dict] = None) -> SessionType:
+        return self.get_client_session(http_client, proxies, name=type(self).__name__)
+
+    @staticmethod
+    def get_session_cookies(session: SessionType) -> dict:
+        if isinstance(session, httpx.Client):
+            return {cookie.name: cookie.value for cookie in session.cookies.jar}
+        return {cookie.name: cookie.value for cookie in session.cookies}
+
+    def get_identity_name(self) -> str:
+        return f'{type(self).__name__}#{self.identity}' if self.identity else type(self).__name__
+
+    def get_vault_secrets(self, session: SessionType) -> Optional[dict]:
+        item = None if self.is_vault_deferred else token_vault.get(self.get_identity_name())
+        self.is_vault_restored = bool(item)
+        if not item:
+            return None
+
+        session.cookies.update(item['cookies'])
+        return item['secrets']
+
+    def set_vault_secrets(self, secrets: dict, session: SessionType, ttl_seconds: Optional[float] = None) -> None:
+        if self.is_vault_deferred:
+            self.deferred_vault_item = (secrets, self.get_session_cookies(session), ttl_seconds)
+            return
+        token_vault.set(self.get_identity_name(), secrets, self.get_session_cookies(session), ttl_seconds)
+
+    def take_over(self, translator: 'Tse') -> None:
+        """
+        Take the session, secrets and language map of `translator`, a new instance of the same identity warmed up in
+        the background with `is_vault_deferred`, keeping the gates of this instance. Only then are the secrets of the
+        vault replaced by the new ones. Called while no request runs on this instance.
+        """
+        self.__dict__.update({k: v for k, v in translator.__dict__.items()
+                              if k not in ('refresh_gate', 'async_refresh_gate', 'query_count_lock')})
+        self.is_vault_deferred, deferred_vault_item, self.deferred_vault_item = False, self.deferred_vault_item, None
+        token_vault.invalidate(self.get_identity_name())
+        if deferred_vault_item:
+            token_vault.set(self.get_identity_name(), *deferred_vault_item)
+
+    def get_resource_text(self, session: SessionType, url: str, headers: dict, timeout: Optional[float],
+                          if_raise_for_status: bool = False) -> str:
+        cached = resource_cache.get(url)
+        if cached and resource_cache.is_immutable_url(url):
+            resource_cache.record(cached, 'hit')
+            return cached['text']
+
+        r = session.get(url, headers={**headers, **resource_cache.get_conditional_headers(cached)}, timeout=timeout)
+        if r.status_code == 304 and cached:
+            resource_cache.record(cached, 'revalidated')
+            return cached['text']
+        if if_raise_for_status:
+            r.raise_for_status()
+
+        resource_cache.record(cached, 'miss')
+        if r.status_code == 200:
+            resource_cache.set(url, r.text, r.headers.get('ETag'), r.headers.get('Last-Modified'))
+        return r.text
+
+    def is_language_map_cached(self) -> bool:
+        return bool(language_map_snapshot.get(type(self).__name__))
+
+    def get_host_text(self, session: SessionType, url: str, headers: dict, timeout: Optional[float],
+                      patterns: Optional[Tuple[str, ...]] = None) -> str:
+        """
+        GET a host page only until every one of `patterns`(the tokens needed) is found, then close the connection.
+        None means reading all of it, eg: its language map is needed, and () means reading none of it.
+        """
+        text, n_bytes, is_stopped, full_size = read_text_until(session, url, headers, timeout, patterns)
+        stream_stats.record(type(self).__name__, url, n_bytes, is_stopped, full_size)
+        return text
 
 
 class Region(Tse):
@@ -474,8 +652,12 @@ class GoogleV1(Tse):
     def get_tkk(self, host_html: str) -> str:
         return re.compile("tkk:'(.*?)'").findall(host_html)[0]
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.api_url)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def google_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://translate.google.com, https://translate.google.cn.
@@ -509,7 +691,7 @@ class GoogleV1(Tse):
             self.host_url = reset_host_url.strip('/')
         else:
             use_cn_condition = kwargs.get('if_use_cn_host', None) or self.server_region == 'CN'
-            self.host_url = self.cn_host_url if use_cn_condition else self.en_host_url
+            self.host_url = self.select_host_url(self.cn_host_url if use_cn_condition else self.en_host_url)
 
         if self.host_url[-2:] == 'cn':
             raise TranslatorError('Google service was offline in inland of China on Oct 2022.')
@@ -530,8 +712,8 @@ class GoogleV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.api_url):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            host_html = self.get_resource_text(self.session, self.host_url, self.host_headers, timeout)
 
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, self.session, timeout, **debug_lang_kwargs)
@@ -549,7 +731,7 @@ class GoogleV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join([item[0] for item in data[0] if isinstance(item[0], str)])
 
 
@@ -601,6 +783,7 @@ class GoogleV2(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def google_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://translate.google.com, https://translate.google.cn.
@@ -633,7 +816,7 @@ class GoogleV2(Tse):
             self.host_url = reset_host_url.strip('/')
         else:
             use_cn_condition = kwargs.get('if_use_cn_host', None) or self.server_region == 'CN'
-            self.host_url = self.cn_host_url if use_cn_condition else self.en_host_url
+            self.host_url = self.select_host_url(self.cn_host_url if use_cn_condition else self.en_host_url)
 
         if self.host_url[-2:] == 'cn':
             raise TranslatorError('Google service was offline in inland of China on Oct 2022.')
@@ -656,7 +839,7 @@ class GoogleV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             r = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             if urllib.parse.urlparse(self.consent_url).hostname == urllib.parse.urlparse(str(r.url)).hostname:
                 form_data = self.get_consent_data(r.text)
@@ -675,7 +858,7 @@ class GoogleV2(Tse):
         json_data = json.loads(r.text[6:])
         data = json.loads(json_data[0][2])
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return {'data': data} if is_detail_result else ' '.join([x[0] for x in (data[1][0][0][5] or data[1][0]) if x[0]])
 
 
@@ -703,7 +886,7 @@ class BaiduV1(Tse):
 
     @Tse.debug_language_map
     def get_language_map(self, lang_url: str, ss: SessionType, headers: dict, timeout: Optional[float], **kwargs: LangMapKwargsType) -> dict:
-        js_html = ss.get(lang_url, headers=headers, timeout=timeout).text
+        js_html = self.get_resource_text(ss, lang_url, headers, timeout)
         lang_str = re.compile('exports={auto:(.*?)}}}},').search(js_html).group()[8:-3]
         lang_list = re.compile('(\\w+):{zhName:').findall(lang_str)
         lang_list = sorted(list(set(lang_list)))
@@ -712,6 +895,7 @@ class BaiduV1(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def baidu_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://fanyi.baidu.com
@@ -749,9 +933,10 @@ class BaiduV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)  # must twice, send cookies.
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            _ = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, ())  # must twice, send cookies.
+            host_patterns = () if self.get_lang_url else (self.get_lang_url_pattern,)
+            host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, host_patterns)
 
             if not self.get_lang_url:
                 self.get_lang_url = re.compile(self.get_lang_url_pattern).search(host_html).group()
@@ -777,7 +962,7 @@ class BaiduV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([item['dst'] for item in data['data']])
 
 
@@ -800,6 +985,7 @@ class BaiduV2(Tse):
         self.token = None
         self.sign = None
         self.acs_token = None
+        self.host_patterns = ("""window.gtk = '(.*?)';|window.gtk = "(.*?)";""", """token: '(.*?)',|token: "(.*?)",""")
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(5e3)
@@ -807,7 +993,7 @@ class BaiduV2(Tse):
 
     @Tse.debug_language_map
     def get_language_map(self, lang_url: str, ss: SessionType, headers: dict, timeout: Optional[float], **kwargs: LangMapKwargsType) -> dict:
-        js_html = ss.get(lang_url, headers=headers, timeout=timeout).text
+        js_html = self.get_resource_text(ss, lang_url, headers, timeout)
         lang_str = re.compile('exports={auto:(.*?)}}}},').search(js_html).group()[8:-3]
         lang_list = re.compile('(\\w+):{zhName:').findall(lang_str)
         lang_list = sorted(list(set(lang_list)))
@@ -837,9 +1023,13 @@ class BaiduV2(Tse):
     # def get_acs_token(self):
     #     pass
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.token and self.sign)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def baidu_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://fanyi.baidu.com
@@ -882,9 +1072,10 @@ class BaiduV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.token and self.sign):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)  # must twice, reload token.
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            _ = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, ())  # must twice, reload token.
+            host_patterns = self.host_patterns + (() if self.get_lang_url else (self.get_lang_url_pattern,))
+            host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, host_patterns)
             self.token = self.get_tk(host_html)
             self.sign = self.get_sign(query_text, host_html, self.session, self.host_headers, timeout)
 
@@ -925,7 +1116,7 @@ class BaiduV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([x['dst'] for x in data['trans_result']['data']])
 
 
@@ -969,12 +1160,11 @@ class YoudaoV1(Tse):
         try:
             if not self.get_sign_url:
                 self.get_sign_url = re.compile(self.get_sign_pattern).search(host_html).group()
-            r = ss.get(self.get_sign_url, headers=self.host_headers, timeout=timeout)
-            r.raise_for_status()
+            js_html = self.get_resource_text(ss, self.get_sign_url, self.host_headers, timeout, if_raise_for_status=True)
         except:
-            r = ss.get(self.get_sign_old_url, headers=self.host_headers, timeout=timeout)
-            r.raise_for_status()
-        sign = re.compile('md5\\("fanyideskweb" \\+ e \\+ i \\+ "(.*?)"\\)').findall(r.text)
+            js_html = self.get_resource_text(ss, self.get_sign_old_url, self.host_headers, timeout,
+                                             if_raise_for_status=True)
+        sign = re.compile('md5\\("fanyideskweb" \\+ e \\+ i \\+ "(.*?)"\\)').findall(js_html)
         return sign[0] if sign and sign != [''] else "Ygy_4c=r#e#4EX^NUGUc5"  # v1.1.10
 
     def get_form(self, query_text: str, from_language: str, to_language: str, sign_key: str) -> dict:
@@ -1001,8 +1191,12 @@ class YoudaoV1(Tse):
         }
         return form
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.sign_key)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def youdao_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://fanyi.youdao.com
@@ -1040,7 +1234,7 @@ class YoudaoV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.sign_key):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.sign_key = self.get_sign_key(host_html, self.session, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
@@ -1053,7 +1247,7 @@ class YoudaoV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([' '.join([it['tgt'] for it in item]) for item in data['translateResult']])
 
 
@@ -1142,8 +1336,12 @@ class YoudaoV2(Tse):
         text = self.decrypt_by_aes128_cbc(text_bytes, key_bytes, iv_bytes)
         return text
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.secret_key)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def youdao_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://fanyi.youdao.com
@@ -1180,7 +1378,7 @@ class YoudaoV2(Tse):
         not_update_cond_freq = 1 if self.query_count % update_session_after_freq != 0 else 0
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.secret_key):
-            self.session = requests.Session()
+            self.session = self.renew_session()
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout, proxies=proxies).text
             _ = self.session.get(self.login_url, headers=self.host_headers, timeout=timeout, proxies=proxies)
             self.professional_field_map = self.session.get(self.domain_url, headers=self.host_headers, timeout=timeout, proxies=proxies).json()['data']
@@ -1216,7 +1414,7 @@ class YoudaoV2(Tse):
         data = self.decrypt_result(text=r.text, key=self.decode_key, iv=self.decode_iv)
         data = exejs.evaluate(data)
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join([it['tgt'] for dt in data['translateResult'] for it in dt])
 
 
@@ -1245,6 +1443,7 @@ class YoudaoV3(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def youdao_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://ai.youdao.com/product-fanyi-text.s
@@ -1282,7 +1481,7 @@ class YoudaoV3(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
@@ -1297,7 +1496,7 @@ class YoudaoV3(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translation'][0]
 
 
@@ -1330,9 +1529,13 @@ class QQFanyi(Tse):
     def get_qt(self, ss: SessionType, timeout: Optional[float]) -> dict:
         return ss.post(self.get_qt_url, headers=self.qt_headers, json=self.qtv_qtk, timeout=timeout).json()
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.qtv_qtk)
+
     @Tse.uncertified  # todo: need ticket and randstr of TCaptcha.
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def qqFanyi_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://fanyi.qq.com
@@ -1370,7 +1573,7 @@ class QQFanyi(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.qtv_qtk):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.qtv_qtk = self.get_qt(self.session, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
@@ -1392,7 +1595,7 @@ class QQFanyi(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join(item['targetText'] for item in data['translate']['records'])  # auto whitespace
 
 
@@ -1432,6 +1635,7 @@ class QQTranSmart(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def qqTranSmart_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://transmart.qq.com
@@ -1469,7 +1673,7 @@ class QQTranSmart(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
 
             if not self.get_lang_url:
@@ -1513,7 +1717,7 @@ class QQTranSmart(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join(data['auto_translation'])
 
 
@@ -1561,8 +1765,12 @@ class AlibabaV1(Tse):
         language_dict = ss.get(lang_url, params=params, headers=self.host_headers, timeout=timeout).json()
         return dict(map(lambda x: x, [(x['sourceLuange'], x['targetLanguages']) for x in language_dict['languageMap']]))
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.dmtrack_pageid)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def alibaba_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://translate.alibaba.com
@@ -1605,7 +1813,7 @@ class AlibabaV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.dmtrack_pageid):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_response = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             self.dmtrack_pageid = self.get_dmtrack_pageid(host_response)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
@@ -1625,7 +1833,7 @@ class AlibabaV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['listTargetText'][0]
 
 
@@ -1667,8 +1875,12 @@ class AlibabaV2(Tse):
         lang_items = sorted([(k, v) for k, v in lang_items if _fn_filter(k, v)])
         return {k: v for k, v in lang_items}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.csrf_token)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def alibaba_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://translate.alibaba.com
@@ -1711,10 +1923,10 @@ class AlibabaV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.csrf_token):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.get_language_url = f'https:{re.compile(self.get_language_pattern).search(host_html).group()}'
-            lang_html = self.session.get(self.get_language_url, headers=self.host_headers, timeout=timeout).text
+            lang_html = self.get_resource_text(self.session, self.get_language_url, self.host_headers, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(lang_html, **debug_lang_kwargs)
             self.detail_language_map = self.get_d_lang_map(lang_html)
@@ -1735,7 +1947,7 @@ class AlibabaV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['data']['translateText']
 
 
@@ -1754,6 +1966,7 @@ class Bing(Tse):
         self.session = None
         self.tk = None
         self.ig_iid = None
+        self.host_patterns = ('IG:"(.*?)"', 'var params_AbusePreventionHelper = (.*?);', '<[^>]*id="tta_outGDCont"[^>]*>')
         self.query_count = 0
         self.output_auto = 'auto-detect'
         self.output_zh = 'zh-Hans'
@@ -1778,8 +1991,13 @@ class Bing(Tse):
         result = exejs.evaluate(result_str)
         return {'key': result[0], 'token': result[1]}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.tk and self.ig_iid)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.reacquire_secrets
+    @Tse.single_flight_refresh
     def bing_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://bing.com/Translator, https://cn.bing.com/Translator.
@@ -1805,7 +2023,7 @@ class Bing(Tse):
         """
 
         use_cn_condition = kwargs.get('if_use_cn_host', None) or self.server_region == 'CN'
-        self.host_url = self.cn_host_url if use_cn_condition else self.en_host_url
+        self.host_url = self.select_host_url(self.cn_host_url if use_cn_condition else self.en_host_url)
         self.api_url = self.host_url.replace('Translator', 'ttranslatev3')
         self.host_headers = self.get_headers(self.host_url, if_api=False)
         self.api_headers = self.get_headers(self.host_url, if_api=True)
@@ -1824,12 +2042,20 @@ class Bing(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.tk and self.ig_iid):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
-            self.tk = self.get_tk(host_html)
-            self.ig_iid = self.get_ig_iid(host_html)
-            debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
-            self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
+            self.session = self.renew_session(http_client, proxies)
+            vault_secrets = self.get_vault_secrets(self.session)
+            if vault_secrets and vault_secrets['host_url'] == self.host_url:
+                self.tk, self.ig_iid = vault_secrets['tk'], vault_secrets['ig_iid']
+                self.language_map = vault_secrets['language_map']
+            else:
+                host_patterns = self.host_patterns if self.is_language_map_cached() else None
+                host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, host_patterns)
+                self.tk = self.get_tk(host_html)
+                self.ig_iid = self.get_ig_iid(host_html)
+                debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
+                self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
+                vault_secrets = {'host_url': self.host_url, 'tk': self.tk, 'ig_iid': self.ig_iid, 'language_map': self.language_map}
+                self.set_vault_secrets(vault_secrets, self.session, update_session_after_seconds)
 
         from_language, to_language = self.check_language(from_language, to_language, self.language_map,
                                                          output_zh=self.output_zh, output_auto=self.output_auto)
@@ -1846,7 +2072,7 @@ class Bing(Tse):
         r = self.session.post(api_url, headers=self.host_headers, data=payload, timeout=timeout)
         r.raise_for_status()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
 
         try:
             data = r.json()
@@ -1906,8 +2132,12 @@ class Sogou(Tse):
         }
         return form
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.uuid)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def sogou_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://fanyi.sogou.com/text
@@ -1946,7 +2176,7 @@ class Sogou(Tse):
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.uuid):
             self.uuid = str(uuid.uuid4())
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, self.get_language_old_url, self.session, timeout, **debug_lang_kwargs)
@@ -1958,7 +2188,7 @@ class Sogou(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['data']['translate']['dit']
 
 
@@ -1985,6 +2215,7 @@ class Caiyun(Tse):
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(5e3)
+        self.is_line_native = True
         self.default_from_language = self.output_zh
 
     # @Tse.debug_language_map
@@ -2022,8 +2253,13 @@ class Caiyun(Tse):
         _ciphertext = ''.join(list(map(lambda k: self.decrypt_dictionary[k], cipher_text)))
         return base64.b64decode(_ciphertext).decode()
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.tk and self.jwt)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.reacquire_secrets
+    @Tse.single_flight_refresh
     def caiyun_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://fanyi.caiyunapp.com
@@ -2062,8 +2298,12 @@ class Caiyun(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.tk and self.jwt):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            vault_secrets = self.get_vault_secrets(self.session)
+            if vault_secrets:
+                self.browser_id = vault_secrets['browser_id']
+            else:
+                host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             # js_url_path = re.compile(self.get_js_pattern).search(host_html).group()
             # self.get_js_url = ''.join([self.host_url, js_url_path])
             # js_html = self.session.get(self.get_js_url, headers=self.host_headers, timeout=timeout).text
@@ -2081,9 +2321,14 @@ class Caiyun(Tse):
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(self.get_language_url, self.session, self.api_headers, timeout, **debug_lang_kwargs)
 
-            jwt_payload = {'browser_id': self.browser_id}
-            jwt_r = self.session.post(self.get_jwt_url, json=jwt_payload, headers=self.api_headers, timeout=timeout)
-            self.jwt = jwt_r.json()['jwt']
+            if vault_secrets:
+                self.jwt = vault_secrets['jwt']
+            else:
+                jwt_payload = {'browser_id': self.browser_id}
+                jwt_r = self.session.post(self.get_jwt_url, json=jwt_payload, headers=self.api_headers, timeout=timeout)
+                self.jwt = jwt_r.json()['jwt']
+                vault_secrets = {'browser_id': self.browser_id, 'jwt': self.jwt}
+                self.set_vault_secrets(vault_secrets, self.session, update_session_after_seconds)
             self.api_headers.update({"T-Authorization": self.jwt})
 
         from_language, to_language = self.check_language(from_language, to_language, self.language_map, output_zh=self.output_zh)
@@ -2109,7 +2354,7 @@ class Caiyun(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([self.decrypt(item) for item in data['target']])
 
 
@@ -2129,6 +2374,7 @@ class Deepl(Tse):
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(5e3)
+        self.is_line_native = True
         self.default_from_language = self.output_zh
 
     @Tse.debug_language_map
@@ -2193,8 +2439,15 @@ class Deepl(Tse):
         }
         return {**self.params['handle'], **data}
 
+    @staticmethod
+    def join_lines(data: dict, n_chunks_list: List[int]) -> str:
+        """Translated sentences of a line joined by ' ', and lines(`texts` of LMT_split_text) by '\\n'."""
+        sentences = iter(item['beams'][0]['sentences'][0]['text'] for item in data['result']['translations'])
+        return '\n'.join(' '.join(next(sentences) for _ in range(n_chunks)) for n_chunks in n_chunks_list)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def deepl_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.deepl.com
@@ -2232,8 +2485,8 @@ class Deepl(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            host_html = self.get_resource_text(self.session, self.host_url, self.host_headers, timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
             _ = self.session.get(self.login_url, headers=self.host_headers, timeout=timeout)
@@ -2248,6 +2501,7 @@ class Deepl(Tse):
         s_data = r_s.json()
         from_language = s_data['result']['lang']['detected']
         s_sentences = [it['sentences'][0]['text'] for item in s_data['result']['texts'] for it in item['chunks']]
+        n_chunks_list = [len(item['chunks']) for item in s_data['result']['texts']]
 
         h_data = self.context_sentences_param(s_sentences, from_language, to_language)
         r_cs = self.session.post(self.api_url, params=self.params['handle'], json=h_data, headers=self.api_headers, timeout=timeout)
@@ -2255,8 +2509,8 @@ class Deepl(Tse):
         data = r_cs.json()
         time.sleep(sleep_seconds)
         self.request_id += 3
-        self.query_count += 1
-        return data if is_detail_result else ' '.join(item['beams'][0]['sentences'][0]["text"] for item in data['result']['translations'])  # either ' ' or '\n'.
+        self.add_query_count()
+        return data if is_detail_result else self.join_lines(data, n_chunks_list)
 
 
 class YandexV1(Tse):
@@ -2274,6 +2528,8 @@ class YandexV1(Tse):
         self.language_map = None
         self.session = None
         self.sid = None
+        self.host_patterns = ("SID: '(.*?)',",)
+        self.lang_pattern = 'TRANSLATOR_LANGS: {(.*?)},'
         self.yu = None
         self.yum = None
         self.sprvk = None
@@ -2321,9 +2577,13 @@ class YandexV1(Tse):
         lang = r.json().get('lang')
         return lang if lang else 'en'
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.sid and self.yu)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def yandex_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://translate.yandex.com
@@ -2369,10 +2629,11 @@ class YandexV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.sid and self.yu):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            _ = self.session.get(self.home_url, headers=self.host_headers, timeout=timeout)
-            _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            _ = self.get_host_text(self.session, self.home_url, self.host_headers, timeout, ())
+            _ = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, ())
+            host_patterns = self.host_patterns + (() if self.is_language_map_cached() else (self.lang_pattern,))
+            host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, host_patterns)
 
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
@@ -2404,7 +2665,7 @@ class YandexV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(data['text'])
 
 
@@ -2425,16 +2686,42 @@ class YandexV2(Tse):
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(1e4)  # ten thousand.
+        self.is_line_native = True
         self.default_from_language = self.output_zh
 
-    def get_request_data(self, ss: SessionType, method: str, params: dict, timeout: Optional[float]) -> dict:
+    def get_request_data(self, ss: SessionType, method: str, params: Union[dict, list], timeout: Optional[float]) -> dict:
         url = f'{self.api_url}/{method}'
-        params = {**{'srv': self.srv}, **params}
+        params = [('srv', self.srv), *(params.items() if isinstance(params, dict) else params)]
         r = ss.post(url=url, params=params, data=self.api_payload, headers=self.api_headers, timeout=timeout)
         r.raise_for_status()
         data = r.json()
         return data
 
+    @staticmethod
+    def get_translate_params(query_text: str, from_language: str, to_language: str,
+                             if_split_lines: bool = False) -> Union[dict, list]:
+        """
+        A query goes as one `text` param. Lines of packed segments(`if_split_lines`) go as repeated `text` params
+        instead, except blank ones, so that they come back line for line.
+        """
+        if not if_split_lines:
+            return {'text': query_text, 'lang': f'{from_language}-{to_language}'}
+        lines = [line for line in query_text.split('\n') if line.strip()]
+        return [('lang', f'{from_language}-{to_language}'), *[('text', line) for line in lines]]
+
+    @staticmethod
+    def join_lines(query_text: str, translated_lines: List[str], if_split_lines: bool = False) -> str:
+        """Put blank lines back in place, after checking that every line sent came back."""
+        if not if_split_lines:
+            return translated_lines[0]
+
+        lines = query_text.split('\n')
+        n_lines = sum(1 for line in lines if line.strip())
+        if len(translated_lines) != n_lines:
+            raise TranslatorError(f'Yandex returned {len(translated_lines)} lines of {n_lines} lines sent.')
+        translated_lines = iter(translated_lines)
+        return '\n'.join(next(translated_lines) if line.strip() else line for line in lines)
+
     @Tse.debug_language_map
     def get_language_map(self, ss: SessionType, timeout: Optional[float], **kwargs: LangMapKwargsType) -> dict:
         lang_map = {}
@@ -2445,6 +2732,7 @@ class YandexV2(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def yandex_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://browser.translate.yandex.net
@@ -2482,7 +2770,7 @@ class YandexV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(ss=self.session, timeout=timeout, **debug_lang_kwargs)
             if not self.language_map.get('zh'):
@@ -2494,11 +2782,12 @@ class YandexV2(Tse):
             if not from_language:
                 from_language = self.warning_auto_lang('yandex', self.default_from_language, if_print_warning)
 
-        params = {'text': query_text, 'lang': f'{from_language}-{to_language}'}
+        if_split_lines = kwargs.get('if_split_lines', False)
+        params = self.get_translate_params(query_text, from_language, to_language, if_split_lines)
         data = self.get_request_data(ss=self.session, method='translate', params=params, timeout=timeout)
         time.sleep(sleep_seconds)
-        self.query_count += 1
-        return data if is_detail_result else data['text'][0]
+        self.add_query_count()
+        return data if is_detail_result else self.join_lines(query_text, data['text'], if_split_lines)
 
 
 class Argos(Tse):
@@ -2535,8 +2824,13 @@ class Argos(Tse):
         secret = base64.b64decode(api_secret.encode()).decode()
         return secret
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.secret)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.reacquire_secrets
+    @Tse.single_flight_refresh
     def argos_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://libretranslate.com
@@ -2574,9 +2868,14 @@ class Argos(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.secret):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
-            self.secret = self.get_secret(self.secret_url, self.session, self.host_headers, timeout)
+            self.session = self.renew_session(http_client, proxies)
+            vault_secrets = self.get_vault_secrets(self.session)
+            if vault_secrets:
+                self.secret = vault_secrets['secret']
+            else:
+                _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
+                self.secret = self.get_secret(self.secret_url, self.session, self.host_headers, timeout)
+                self.set_vault_secrets({'secret': self.secret}, self.session, update_session_after_seconds)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(self.language_url, self.session, self.language_headers, timeout, **debug_lang_kwargs)
 
@@ -2594,7 +2893,7 @@ class Argos(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translatedText']
 
 
@@ -2669,6 +2968,7 @@ class Iciba(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def iciba_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.iciba.com/fy
@@ -2706,7 +3006,7 @@ class Iciba(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(self.api_url, self.session, self.language_headers, timeout, **debug_lang_kwargs)
@@ -2730,7 +3030,7 @@ class Iciba(Tse):
         data = r.json()
         data = self.get_result(data)
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['out']
 
 
@@ -2772,6 +3072,7 @@ class IflytekV1(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def iflytek_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://saas.xfyun.cn/translate?tabKey=text
@@ -2809,7 +3110,7 @@ class IflytekV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             _ = self.session.get(self.cookies_url, headers=self.host_headers, timeout=timeout)
             _ = self.session.get(self.info_url, headers=self.host_headers, timeout=timeout)
@@ -2827,7 +3128,7 @@ class IflytekV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else json.loads(data['data'])['trans_result']['dst']
 
 
@@ -2866,6 +3167,7 @@ class IflytekV2(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def iflytek_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://fanyi.xfyun.cn/console/trans/text
@@ -2903,7 +3205,7 @@ class IflytekV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, self.session, self.host_headers, timeout, **debug_lang_kwargs)
@@ -2919,7 +3221,7 @@ class IflytekV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else json.loads(data['data'])['trans_result']['dst']
 
 
@@ -2940,6 +3242,7 @@ class Iflyrec(Tse):
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(2e3)
+        self.is_line_native = True
         self.default_from_language = self.output_zh
 
     @Tse.debug_language_map
@@ -2950,6 +3253,7 @@ class Iflyrec(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def iflyrec_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://fanyi.iflyrec.com
@@ -2987,7 +3291,7 @@ class Iflyrec(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(self.lang_index, **debug_lang_kwargs)
@@ -3011,7 +3315,7 @@ class Iflyrec(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([item['translateResult'] for item in data['biz']])
 
 
@@ -3046,8 +3350,12 @@ class Reverso(Tse):
         lang_dict = exejs.evaluate(lang_dict_str)
         return {k: v for v, k in lang_dict.items()}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.decrypt_language_map)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def reverso_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.reverso.net/text-translation
@@ -3085,7 +3393,7 @@ class Reverso(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.decrypt_language_map):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
             # self.language_url = re.compile(self.language_pattern).search(host_html).group()
@@ -3116,7 +3424,7 @@ class Reverso(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join(data['translation'])
 
 
@@ -3150,6 +3458,7 @@ class Itranslate(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def itranslate_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://itranslate.com/translate
@@ -3187,7 +3496,7 @@ class Itranslate(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
             if not self.language_url:
@@ -3212,7 +3521,7 @@ class Itranslate(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['target']['text']
 
 
@@ -3240,6 +3549,7 @@ class TranslateCom(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def translateCom_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.translate.com/machine-translation
@@ -3277,7 +3587,7 @@ class TranslateCom(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             lang_r = self.session.get(self.language_url, headers=self.host_headers, timeout=timeout)
             self.language_description = lang_r.json()
@@ -3301,7 +3611,7 @@ class TranslateCom(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translated_text']  # translation_source is microsoft, wtf!
 
 
@@ -3326,6 +3636,7 @@ class Utibet(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def utibet_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'ti', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         http://mt.utibet.edu.cn/mt
@@ -3363,7 +3674,7 @@ class Utibet(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
         if from_language == 'auto':
@@ -3379,7 +3690,7 @@ class Utibet(Tse):
         r.raise_for_status()
         data_html = r.text
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return {'data_html': data_html} if is_detail_result else self.parse_result(data_html)
 
 
@@ -3420,8 +3731,12 @@ class Papago(Tse):
         auth = hmac.new(key=auth_key.encode(), msg=f'{device_id}\n{url}\n{timestamp}'.encode(), digestmod='md5').digest()
         return f'PPG {device_id}:{base64.b64encode(auth).decode()}'
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.auth_key)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def papago_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://papago.naver.com
@@ -3460,7 +3775,7 @@ class Papago(Tse):
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.auth_key):
             self.device_id = str(uuid.uuid4())
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             url_path = re.compile(self.language_url_pattern).search(host_html).group()
             self.language_url = ''.join([self.host_url, url_path])
@@ -3496,7 +3811,7 @@ class Papago(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translatedText']
 
 
@@ -3538,8 +3853,12 @@ class LingvanexV1(Tse):
         js_html = ss.get(auth_url, headers=headers, timeout=timeout).text
         return {k: v for k, v in re.compile(',(.*?)="(.*?)"').findall(js_html)}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.auth_info) and self.mode == kwargs.get('lingvanex_mode', 'B2C')
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def lingvanex_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://lingvanex.com/translate/
@@ -3579,7 +3898,7 @@ class LingvanexV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.auth_info and self.mode == mode):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             self.auth_info = self.get_auth(self.auth_url, self.session, self.host_headers, timeout)
 
@@ -3615,7 +3934,7 @@ class LingvanexV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['result']
 
 
@@ -3646,8 +3965,12 @@ class LingvanexV2(Tse):
     def get_auth(self, host_html: str) -> str:
         return re.compile('const API_BEARER_TOKEN = "(.*?)"').findall(host_html)[0]
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.auth)
+
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def lingvanex_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://lingvanex.com/en/translate/
@@ -3685,7 +4008,7 @@ class LingvanexV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.auth):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.auth = self.get_auth(host_html)
             self.host_headers.update({'authorization': self.auth})
@@ -3709,7 +4032,7 @@ class LingvanexV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['result'].replace('\n ', '\n')
 
 
@@ -3757,9 +4080,13 @@ class NiutransV1(Tse):
         )).decode()
         return cipher_text  # TODO
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.account_info and self.api_headers)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def niutrans_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         http://display.niutrans.com
@@ -3797,7 +4124,7 @@ class NiutransV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.account_info and self.api_headers):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = self.session.options(self.cookie_url, headers=self.host_headers, timeout=timeout)
 
@@ -3833,7 +4160,7 @@ class NiutransV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join([' '.join([it['data'] for it in item['sentences']]) for item in data['data']])
 
 
@@ -3910,9 +4237,13 @@ class NiutransV2(Tse):
         self.geetest_verify_data = json.loads(r_gv.text[22:-1])['data']['seccode']
         return
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.captcha_id)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def niutrans_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://niutrans.com/trans?type=text
@@ -3950,7 +4281,7 @@ class NiutransV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.captcha_id):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = self.session.get(self.login_url, headers=self.host_headers, timeout=timeout)
             self.captcha_id = self.get_captcha_id(self.geetest_captcaha_url, self.session, self.host_headers, timeout)
@@ -3987,7 +4318,7 @@ class NiutransV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['tgt_text']
 
 
@@ -4009,6 +4340,7 @@ class Mglip(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def mglip_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'mon', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         http://fy.mglip.com/pc
@@ -4046,7 +4378,7 @@ class Mglip(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
 
         if from_language == 'auto':
@@ -4059,7 +4391,7 @@ class Mglip(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['datas'][0]['paragraph'] if data['datas'][0]['type'] == 'trans' else data['datas'][0]['data']
 
 
@@ -4109,6 +4441,7 @@ class VolcEngine(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def volcEngine_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://translate.volcengine.com
@@ -4151,7 +4484,7 @@ class VolcEngine(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
@@ -4175,7 +4508,7 @@ class VolcEngine(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translation']
 
 
@@ -4204,6 +4537,7 @@ class ModernMt(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def modernMt_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.modernmt.com/translate
@@ -4241,7 +4575,7 @@ class ModernMt(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(self.language_url, self.session, self.host_headers, timeout, **debug_lang_kwargs)
@@ -4261,7 +4595,7 @@ class ModernMt(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['data']['translation']
 
 
@@ -4298,6 +4632,7 @@ class MyMemory(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def myMemory_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://mymemory.translated.net
@@ -4337,7 +4672,7 @@ class MyMemory(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, self.get_matecat_language_url, self.session,
@@ -4359,7 +4694,7 @@ class MyMemory(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['responseData']['translatedText']
 
 
@@ -4394,9 +4729,13 @@ class Mirai(Tse):
         lang_pairs = re.compile('"/trial/(\\w{2})/(\\w{2})"').findall(js_html)
         return {f_lang: [v for k, v in lang_pairs if k == f_lang] for f_lang, t_lang in lang_pairs}
 
+    def is_secrets_ready(self, **kwargs: ApiKwargsType) -> bool:
+        return bool(self.tran_key)
+
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def mirai_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'ja', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://miraitranslate.com/en/trial/
@@ -4434,7 +4773,7 @@ class Mirai(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time and self.tran_key):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             # _ = self.session.get(self.home_url, headers=self.host_headers, timeout=timeout)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.tran_key = re.compile('var tran = "(.*?)";').search(host_html).group(1)
@@ -4477,7 +4816,7 @@ class Mirai(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['ouputs'][0]['output'][0]['translation']
 
 
@@ -4507,6 +4846,7 @@ class Apertium(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def apertium_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.apertium.org/
@@ -4544,7 +4884,7 @@ class Apertium(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(self.get_lang_url, self.session, self.host_headers, timeout, **debug_lang_kwargs)
@@ -4567,7 +4907,7 @@ class Apertium(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['responseData']['translatedText']
 
 
@@ -4606,6 +4946,7 @@ class Tilde(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def tilde_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://translate.tilde.com/
@@ -4643,7 +4984,7 @@ class Tilde(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             self.config_data = self.session.get(self.get_config_url, headers=self.host_headers, timeout=timeout).json()
             self.api_headers.update({'client-id': self.config_data['mt']['api']['clientId']})  # must lower keyword
@@ -4669,7 +5010,7 @@ class Tilde(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translation']
 
 
@@ -4708,6 +5049,7 @@ class cloudTranslationV1(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def cloudTranslation_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.cloudtranslation.com/#/translate
@@ -4747,7 +5089,7 @@ class cloudTranslationV1(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = self.session.get(self.get_cookie_url, headers=self.api_headers, timeout=timeout)
             d_lang_map = self.session.get(self.get_lang_url, headers=self.api_headers, timeout=timeout).json()
@@ -4781,7 +5123,7 @@ class cloudTranslationV1(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['data']['translation']
 
 
@@ -4819,6 +5161,7 @@ class cloudTranslationV2(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def cloudTranslation_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://online.cloudtranslation.com
@@ -4858,7 +5201,7 @@ class cloudTranslationV2(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             _ = self.session.get(self.get_cookie_url, headers=self.api_headers, timeout=timeout)
             d_lang_map = self.session.get(self.get_lang_url, headers=self.api_headers, timeout=timeout).json()
@@ -4893,7 +5236,7 @@ class cloudTranslationV2(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else json.loads(data['data']['data'])['translation']
 
 
@@ -4919,6 +5262,7 @@ class SysTran(Tse):
         self.query_count = 0
         self.output_zh = 'zh'
         self.input_limit = int(5e3)
+        self.is_line_native = True
         self.default_from_language = self.output_zh
 
     @Tse.debug_language_map
@@ -4950,6 +5294,7 @@ class SysTran(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def sysTran_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.systran.net/translate/, https://www.systransoft.com/translate/
@@ -4989,7 +5334,7 @@ class SysTran(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             self.client_data = self.get_client_data(self.get_client_url, self.session, self.host_headers, timeout)
             payload = urllib.parse.urlencode(self.client_data)
@@ -5035,7 +5380,7 @@ class SysTran(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(' '.join(it['alt_transes'][0]['target']['text'] for it in item['output']['documents'][0]['trans_units'][0]['sentences']) for item in data['outputs'])
 
 
@@ -5104,7 +5449,7 @@ class TranslateMe(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
@@ -5132,12 +5477,13 @@ class TranslateMe(Tse):
             data = r.json()
             data_list.append(data)
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return {'data': data_list} if is_detail_result else '\n'.join([item['to'] for item in data_list])
 
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def translateMe_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://translateme.network/
@@ -5175,7 +5521,7 @@ class TranslateMe(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(host_html, **debug_lang_kwargs)
@@ -5206,6 +5552,7 @@ class Elia(Tse):
         self.session = None
         self.language_map = None
         self.professional_field = None
+        self.host_patterns = ('"csrfmiddlewaretoken": "(.*?)"', 'var languagePairs = JSON.parse\\((.*?)\\);')
         self.langpair_domain = None
         self.token = None
         self.query_count = 0
@@ -5230,6 +5577,7 @@ class Elia(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def elia_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://elia.eus/translator
@@ -5269,8 +5617,8 @@ class Elia(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
-            host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
+            self.session = self.renew_session(http_client, proxies)
+            host_html = self.get_host_text(self.session, self.host_url, self.host_headers, timeout, self.host_patterns)
             self.token = re.compile('"csrfmiddlewaretoken": "(.*?)"').search(host_html).group(1)
             d_lang_str = re.compile('var languagePairs = JSON.parse\\((.*?)\\);').search(host_html).group()
             d_lang_map = json.loads(d_lang_str[43:-4].replace('&quot;', '"'))
@@ -5309,7 +5657,7 @@ class Elia(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translated_text'].replace('</div>', '\n').replace('<div>', '').replace('<span>', '').replace('</span>', '')
 
 
@@ -5356,6 +5704,7 @@ class LanguageWire(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def languageWire_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.languagewire.com/en/technology/languagewire-translate
@@ -5393,7 +5742,7 @@ class LanguageWire(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             self.lwt_data = self.get_lwt_data()
             self.api_headers.update(self.lwt_data)
@@ -5416,7 +5765,7 @@ class LanguageWire(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translation']
 
 
@@ -5444,6 +5793,7 @@ class Judic(Tse):
     @Tse.uncertified
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def judic_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://judic.io/en/translate
@@ -5481,7 +5831,7 @@ class Judic(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(self.lang_list, **debug_lang_kwargs)
@@ -5499,7 +5849,7 @@ class Judic(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['translation']
 
 
@@ -5528,6 +5878,7 @@ class Yeekit(Tse):
     @Tse.uncertified  # not code, but server.
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def yeekit_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://www.yeekit.com/site/translate
@@ -5565,7 +5916,7 @@ class Yeekit(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(self.lang_list, **debug_lang_kwargs)
@@ -5584,7 +5935,7 @@ class Yeekit(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else '\n'.join(' '.join(p) for p in json.loads(data[0])['translation'][0]['translated'][0]['translation list'])
 
 
@@ -5612,6 +5963,7 @@ class Hujiang(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def hujiang_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://dict.hjenglish.com/app/trans
@@ -5649,7 +6001,7 @@ class Hujiang(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             self.session.cookies.update({'HJ_UID': self.hj_uid, 'HJC_USRC': 'uzhi', 'HJC_NUID': '1'})
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
@@ -5665,7 +6017,7 @@ class Hujiang(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['data']['content']  # supported by baidu.
 
 class Xunjie(Tse):
@@ -5711,6 +6063,7 @@ class Xunjie(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def xunjie_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://app.xunjiepdf.com/linefanyi
@@ -5748,7 +6101,7 @@ class Xunjie(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             host_html = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout).text
             self.version = re.findall('version=(.*?)"', host_html)[0] or self.version
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
@@ -5811,7 +6164,7 @@ class Xunjie(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else data['txtcontent'].replace('\n ', '\n')
 
 
@@ -5839,6 +6192,7 @@ class Lara(Tse):
 
     @Tse.time_stat
     @Tse.check_query
+    @Tse.single_flight_refresh
     def lara_api(self, query_text: str, from_language: str = 'auto', to_language: str = 'en', **kwargs: ApiKwargsType) -> Union[str, dict]:
         """
         https://laratranslate.com/translate
@@ -5876,7 +6230,7 @@ class Lara(Tse):
         not_update_cond_time = 1 if time.time() - self.begin_time < update_session_after_seconds else 0
         if not (self.session and self.language_map and not_update_cond_freq and not_update_cond_time):
             self.begin_time = time.time()
-            self.session = Tse.get_client_session(http_client, proxies)
+            self.session = self.renew_session(http_client, proxies)
             _ = self.session.get(self.host_url, headers=self.host_headers, timeout=timeout)
             debug_lang_kwargs = self.debug_lang_kwargs(from_language, to_language, self.default_from_language, if_print_warning)
             self.language_map = self.get_language_map(self.get_language_url, self.session, self.host_headers, timeout, **debug_lang_kwargs)
@@ -5897,11 +6251,13 @@ class Lara(Tse):
         r.raise_for_status()
         data = r.json()
         time.sleep(sleep_seconds)
-        self.query_count += 1
+        self.add_query_count()
         return data if is_detail_result else ''.join(dt['translation'] for dt in data['content']['translations'])
 
 
-class TranslatorsServer:
+class TranslatorsServer(ConfigMixin):
+    translator_error = TranslatorError
+
     def __init__(self):
         self.cpu_cnt = os.cpu_count()
         self._region = Region()
@@ -5927,7 +6283,6 @@ class TranslatorsServer:
         self.elia = self._elia.elia_api
         self._google = GoogleV2(server_region=self.server_region)
         self.google = self._google.google_api
-        self.async_google = self._google.trans_api_async
         self._hujiang = Hujiang()
         self.hujiang = self._hujiang.hujiang_api
         self._iciba = Iciba()
@@ -6015,12 +6370,182 @@ class TranslatorsServer:
                                  'tilde', 'translateCom', 'translateMe', 'utibet', 'volcEngine', 'yandex', 'yeekit',
                                  'youdao']
         self.translators_pool = list(self.translators_dict.keys())
+        self.translation_memory: Optional[TranslationMemory] = None
+        self.result_cache = ResultCache(max_bytes=0)
+        self.single_flight = SingleFlight()
+        self.language_map_snapshot = language_map_snapshot
+        self.token_vault = token_vault
+        self.resource_cache = resource_cache
+        self.negative_cache = negative_cache
+        self.transport = transport
+        self.identity_pools = {}
+        self.session_lifetime = session_lifetime
+        self.endpoint_selector = endpoint_selector
+        self.stream_stats = stream_stats
+        self.dns_cache = dns_cache
+        self.segment_packer = segment_packer
+        self.text_chunker = text_chunker
+        self.background_refresher: Optional[BackgroundRefresher] = None
+        self.loop_thread = EventLoopThread()
+        for tran in self.translators_pool:
+            api_func = self.negative_cache.guarded(type(getattr(self, f'_{tran}')).__name__, self.translators_dict[tran],
+                                                   TranslatorError)
+            self.translators_dict[tran] = self.result_cache.cached(tran, api_func)
+            setattr(self, tran, self.translators_dict[tran])
         self.not_en_langs = {'utibet': 'ti', 'mglip': 'mon'}
         self.not_zh_langs = {'languageWire': 'fr', 'tilde': 'fr', 'elia': 'fr', 'apertium': 'spa', 'judic': 'de'}
         self.pre_acceleration_label = 0
         self.example_query_text = '你好。\n欢迎你！'
         self.success_translators_pool = []
         self.failure_translators_pool = []
+        self.readiness = {}
+
+    def set_transport(self, pool_connections: int = 10, pool_maxsize: int = 64, max_retries: int = 2,
+                      backoff_factor: float = 0.2, retry_status_list: Tuple[int, ...] = ()) -> Transport:
+        """
+        Configure the connection pools and retries of translator sessions. Takes effect when translators refresh.
+        Translators can be shared by threads, eg: `translate_text` called from a ThreadPoolExecutor, so `pool_maxsize`
+        should be at least the number of threads.
+        :param pool_connections: int, default 10. Number of hosts whose connection pools are kept.
+        :param pool_maxsize: int, default 64. Max connections kept to one host.
+        :param max_retries: int, default 2. Retries of failed connections(and of `retry_status_list`).
+        :param backoff_factor: float, default 0.2.
+        :param retry_status_list: Tuple[int, ...], default (). eg: (429, 502, 503, 504).
+        :return: Transport
+        """
+        self.transport.configure(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                 max_retries=max_retries, backoff_factor=backoff_factor,
+                                 retry_status_list=retry_status_list)
+        return self.transport
+
+    def set_dns_cache(self, ttl_seconds: Optional[float] = 300.0, max_size: int = 1000, address_preference: str = 'auto',
+                      happy_eyeballs_delay: Optional[float] = 0.25, if_use_dns_cache: bool = True) -> DnsCache:
+        """
+        Share resolved addresses of hosts between the sessions of all translators, so that neither refreshes nor new
+        connections wait for slow resolvers, and choose the address family and happy eyeballs behaviour. Resolver
+        timings are in `dns_cache.info()`. Takes effect on new connections, and on sessions of translators when they
+        refresh.
+        :param ttl_seconds: Optional[float], default 300.0. None means never expired.
+        :param max_size: int, default 1000.
+        :param address_preference: str, default 'auto'. Union['auto', 'ipv4', 'ipv6', 'ipv4_only', 'ipv6_only'],
+                'ipv4' means trying IPv4 addresses first.
+        :param happy_eyeballs_delay: Optional[float], default 0.25. None disables it, only `niquests` does it.
+        :param if_use_dns_cache: bool, default True.
+        :return: DnsCache
+        """
+        if address_preference not in ('auto', 'ipv4', 'ipv6', 'ipv4_only', 'ipv6_only'):
+            raise TranslatorError(f'Unsupported address_preference: {address_preference}.')
+
+        self.dns_cache.configure(ttl_seconds=ttl_seconds, max_size=max_size, address_preference=address_preference,
+                                 is_enabled=if_use_dns_cache)
+        self.transport.configure_dns(happy_eyeballs_delay=happy_eyeballs_delay)
+        return self.dns_cache
+
+    def _refresh_in_background(self, translator: str, lead_ratio: float, timeout: Optional[float]) -> int:
+        pool = self.identity_pools.get(translator) or self.set_session_pool(translator, pool_size=1)
+        n_swapped = 0
+        for old_translator in list(pool.translators):
+            if not old_translator.is_session_expiring(lead_ratio):
+                continue
+
+            new_translator = self._new_translator(old_translator, old_translator.identity)
+            new_translator.is_vault_deferred = True  # scrape new secrets, keep the vault until they work.
+            from_language, to_language = self._get_test_languages(translator)
+            try:
+                _ = getattr(new_translator, f'{translator}_api')(self.example_query_text, from_language, to_language,
+                                                                 if_print_warning=False, timeout=timeout)
+            except Exception:
+                continue  # the old session refreshes inline as before.
+
+            old_session = old_translator.session
+            # swapped inside the instance, which `translators_dict`, identity pools and module aliases are bound to.
+            if not old_translator.refresh_gate.swap(lambda: old_translator.take_over(new_translator), timeout=60):
+                old_session = new_translator.session
+            else:
+                n_swapped += 1
+            if old_session is not None:
+                old_session.close()
+        return n_swapped
+
+    def refresh_expiring_sessions(self, translators: Optional[Tuple[str, ...]] = None, lead_ratio: float = 0.8,
+                                  timeout: Optional[float] = None) -> int:
+        """
+        Prepare a new session and tokens for each translator(identity) in use whose session is close to expiry, and swap
+        them in at once. Requests never wait for the refresh, they use the old session until the swap.
+        :param translators: Optional[Tuple[str, ...]], default None. None means all translators.
+        :param lead_ratio: float, default 0.8. A session is close to expiry after `lead_ratio` of the default
+                `update_session_after_seconds` or `update_session_after_freq`.
+        :param timeout: Optional[float], default None.
+        :return: int, number of sessions swapped.
+        """
+        n_swapped = 0
+        for translator in translators or self.translators_pool:
+            if self._translators_dict[translator].is_session_expiring(lead_ratio) or translator in self.identity_pools:
+                n_swapped += self._refresh_in_background(translator, lead_ratio, timeout)
+        return n_swapped
+
+    def start_background_refresh(self, translators: Optional[Tuple[str, ...]] = None, interval_seconds: float = 10.0,
+                                 lead_ratio: float = 0.8, timeout: Optional[float] = None) -> BackgroundRefresher:
+        """
+        Run `refresh_expiring_sessions` every `interval_seconds` in a daemon thread, so that no request pays for a
+        session rollover. Only the default rollover(`update_session_after_freq`, `update_session_after_seconds`) is
+        anticipated.
+        :param translators: Optional[Tuple[str, ...]], default None. None means all translators.
+        :param interval_seconds: float, default 10.0.
+        :param lead_ratio: float, default 0.8.
+        :param timeout: Optional[float], default None.
+        :return: BackgroundRefresher
+        """
+        self.stop_background_refresh()
+        self.background_refresher = BackgroundRefresher(
+            lambda: self.refresh_expiring_sessions(translators, lead_ratio, timeout), interval_seconds).start()
+        return self.background_refresher
+
+    def stop_background_refresh(self) -> None:
+        if self.background_refresher is not None:
+            self.background_refresher.stop()
+            self.background_refresher = None
+
+    def set_session_pool(self, translator: str = 'bing', pool_size: int = 4,
+                         strategy: str = 'round_robin') -> IdentityPool:
+        """
+        Use `pool_size` independent session identities of a translator, each with its own session, cookies, tokens and
+        refresh clock, so that its traffic is not throttled as one browser. Requests are dispatched to them in turn
+        (`round_robin`) or to the one with the fewest requests running(`least_loaded`).
+        :param translator: str, default 'bing'.
+        :param pool_size: int, default 4. 1 means one identity, as by default.
+        :param strategy: str, default 'round_robin'. Union['round_robin', 'least_loaded']
+        :return: IdentityPool
+        """
+        if translator not in self.translators_pool or pool_size < 1:
+            raise TranslatorError
+
+        primary = self._translators_dict[translator]
+        translators = [primary] + [self._new_translator(primary, identity) for identity in range(1, pool_size)]
+
+        self.identity_pools[translator] = pool = IdentityPool(translators, strategy)
+        api_func = self.negative_cache.guarded(type(primary).__name__, pool.dispatch(f'{translator}_api'),
+                                               TranslatorError)
+        self.translators_dict[translator] = self.result_cache.cached(translator, api_func)
+        setattr(self, translator, self.translators_dict[translator])
+        return pool
+
+    def set_http2(self, translators: Union[str, Tuple[str, ...]] = ('google', 'deepl', 'bing'),
+                  if_use_http2: bool = True) -> Transport:
+        """
+        Enable or disable HTTP/2 mode of translators, whose concurrent requests to one host are then multiplexed over one
+        connection. Servers not negotiating h2 are spoken to in HTTP/1.1, and HTTP/2 needs the optional package `h2`
+        (`pip install httpx[http2]`), without which `niquests` is used. Takes effect when translators refresh.
+        :param translators: Union[str, Tuple[str, ...]], default ('google', 'deepl', 'bing').
+        :param if_use_http2: bool, default True.
+        :return: Transport
+        """
+        translators = (translators,) if isinstance(translators, str) else translators
+        if not set(translators) <= set(self.translators_pool):
+            raise TranslatorError(f'Unsupported translators: {set(translators) - set(self.translators_pool)}.')
+
+        self.transport.set_http2([type(getattr(self, f'_{tran}')).__name__ for tran in translators], if_use_http2)
+        return self.transport
 
     def translate_text(self,
                        query_text: str,
@@ -6056,6 +6581,10 @@ class TranslatorsServer:
                 :param if_print_warning: bool, default True.
                 :param lingvanex_model: str, default 'B2C', choose from ("B2C", "B2B").
                 :param myMemory_mode: str, default "web", choose from ("web", "api").
+                :param if_use_cache: bool, default True. Works after set_result_cache(), set_translation_memory() or set_fuzzy_memory().
+                :param if_use_negative_cache: bool, default True.
+                :param if_use_chunking: bool, default True. Works after set_text_chunking(). Split a text over the limit of the
+                        translator into chunks, instead of failing or truncating. Not work with `is_detail_result`.
         :return: str or dict
         """
 
@@ -6065,8 +6594,186 @@ class TranslatorsServer:
         if not self.pre_acceleration_label and if_use_preacceleration:
             _ = self.preaccelerate()
 
-        return self.translators_dict[translator](query_text=query_text, from_language=from_language,
-                                                 to_language=to_language, **kwargs)
+        chunk_limit = self._get_chunk_limit(translator, query_text, **kwargs)
+        if chunk_limit is not None:
+            chunks = self.text_chunker.split(query_text, chunk_limit, self.segment_packer.get_length_unit(translator))
+            contents = list(dict.fromkeys(chunk.strip() for chunk in chunks if chunk.strip()))
+            translated_list = [self.translate_text(content, translator=translator, from_language=from_language,
+                                                   to_language=to_language, **{**kwargs, 'if_use_chunking': False})
+                               for content in contents]  # callers may already be threads of an executor.
+            return self.text_chunker.join(chunks, dict(zip(contents, translated_list)))
+
+        if not isinstance(query_text, str):
+            return self.translators_dict[translator](query_text=query_text, from_language=from_language,
+                                                     to_language=to_language, **kwargs)
+
+        flight_key = get_flight_key(translator, query_text, from_language, to_language, **kwargs)
+        return self.single_flight.do(flight_key, self.translators_dict[translator], query_text=query_text,
+                                     from_language=from_language, to_language=to_language, **kwargs)
+
+    def translate_many(self,
+                       query_texts: List[str],
+                       translator: str = 'alibaba',
+                       from_language: str = 'auto',
+                       to_language: str = 'en',
+                       concurrency: int = 32,
+                       if_return_exceptions: bool = True,
+                       if_show_progress: bool = False,
+                       callback: Optional[Callable[[int, int], Any]] = None,
+                       total_timeout: Optional[float] = None,
+                       if_use_packing: Optional[bool] = False,
+                       **kwargs: ApiKwargsType,
+                       ) -> List[Union[str, dict, Exception]]:
+        """
+        Translate many texts concurrently from blocking code(eg: scripts, pandas jobs), by
+        `server_async.translate_batch()` on the event loop of `loop_thread`. Requests share its connection pools, and
+        up to `concurrency` of them are in flight. Results are in the order of `query_texts`. Texts in the result
+        cache of this server are not requested.
+        :param query_texts: List[str], must.
+        :param translator: str, default 'alibaba'.
+        :param from_language: str, default 'auto'.
+        :param to_language: str, default 'en'.
+        :param concurrency: int, default 32. Number of requests in flight at a time.
+        :param if_return_exceptions: bool, default True. If True, the exception of a failed text is returned in its
+                place, else the first exception is raised.
+        :param if_show_progress: bool, default False.
+        :param callback: Optional[Callable[[int, int], Any]], default None. Called on the event loop thread.
+        :param total_timeout: Optional[float], default None. None means waiting for all texts.
+        :param if_use_packing: Optional[bool], default False. None means packing for translators taking a list of
+                texts on the wire(`is_line_native`) only, True for all, see `set_segment_packing()`.
+        :param **kwargs: same as `translate_text()`.
+        :return: List[Union[str, dict, Exception]]
+        """
+        async_tss = self._get_async_server()
+        if translator not in async_tss.translators_pool:
+            raise TranslatorError(f'Unsupported translator: {translator}.')
+
+        unique_texts = list(dict.fromkeys(query_texts))
+        if_use_cache = (self.result_cache.is_enabled and kwargs.get('if_use_cache', True)
+                        and not kwargs.get('is_detail_result', False))
+        cached_dict = {}
+        if if_use_cache:
+            cached_dict = self.result_cache.get_many(translator, unique_texts, from_language, to_language, **kwargs)
+            unique_texts = [text for text in unique_texts if text not in cached_dict]
+
+        result_list = []
+        if unique_texts:
+            coro = async_tss.translate_batch(unique_texts, translator=translator, from_language=from_language,
+                                             to_language=to_language, concurrency=concurrency,
+                                             if_return_exceptions=if_return_exceptions,
+                                             if_show_progress=if_show_progress, callback=callback,
+                                             if_use_packing=if_use_packing, **kwargs)
+            result_list = self.loop_thread.run(coro, timeout=total_timeout)
+
+        result_dict = dict(zip(unique_texts, result_list))
+        if if_use_cache:
+            self.result_cache.set_many(translator, {k: v for k, v in result_dict.items() if isinstance(v, str)},
+                                       from_language, to_language, **kwargs)
+        result_dict.update(cached_dict)
+        return [result_dict[text] for text in query_texts]
+
+    @staticmethod
+    def _get_async_server():
+        """`server_async` is imported on first use only, most users of this server never need it."""
+        import translators.server_async as server_async
+        return server_async.async_tss
+
+    def translate_text_future(self,
+                              query_text: str,
+                              translator: str = 'alibaba',
+                              from_language: str = 'auto',
+                              to_language: str = 'en',
+                              **kwargs: ApiKwargsType,
+                              ) -> concurrent.futures.Future:
+        """
+        Start a translation by `server_async.translate_text()` on the event loop of `loop_thread` and return at once.
+        `future.result(timeout)` blocks until it is done.
+        :param query_text: str, must.
+        :param translator: str, default 'alibaba'.
+        :param from_language: str, default 'auto'.
+        :param to_language: str, default 'en'.
+        :param **kwargs: same as `translate_text()`.
+        :return: concurrent.futures.Future
+        """
+        async_tss = self._get_async_server()
+        if translator not in async_tss.translators_pool:
+            raise TranslatorError(f'Unsupported translator: {translator}.')
+
+        return self.loop_thread.submit(async_tss.translate_text(
+            query_text, translator=translator, from_language=from_language, to_language=to_language, **kwargs))
+
+    def close_event_loop(self, timeout: Optional[float] = None) -> None:
+        """
+        Close the sessions and connection pools used by `translate_many()` and `translate_text_future()`, and stop
+        their event loop. It starts again on the next call.
+        """
+        if self.loop_thread.is_running():
+            self.loop_thread.run(self._get_async_server().aclose(), timeout=timeout)
+        self.loop_thread.stop(timeout)
+
+    def translate_segments(self,
+                           segments: List[str],
+                           translator: str = 'alibaba',
+                           from_language: str = 'auto',
+                           to_language: str = 'en',
+                           n_jobs: int = 1,
+                           if_use_packing: Optional[bool] = False,
+                           **kwargs: ApiKwargsType,
+                           ) -> List[str]:
+        """
+        Translate segments(eg: strings of a UI catalog, texts of html) by the fewest requests, in threads. With
+        `if_use_packing`, many of them go as the lines of one query, natively for translators taking a list of
+        segments on the wire(`is_line_native`: caiyun, deepl, iflyrec, sysTran, yandex).
+        :param segments: List[str], must.
+        :param translator: str, default 'alibaba'.
+        :param from_language: str, default 'auto'.
+        :param to_language: str, default 'en'.
+        :param n_jobs: int, default 1. Number of requests at a time. -1 means os.cpu_cnt().
+        :param if_use_packing: Optional[bool], default False. None means packing for `is_line_native` translators only,
+                True for all translators, see `set_segment_packing()`.
+        :param **kwargs: same as `translate_text()`, except `is_detail_result`, which must be False.
+        :return: List[str]
+        """
+        if translator not in self.translators_pool or kwargs.get('is_detail_result', False):
+            raise TranslatorError
+
+        unique_segments = list(dict.fromkeys(segments))
+        if_use_cache = self.result_cache.is_enabled and kwargs.get('if_use_cache', True)
+        result_dict = {}
+        if if_use_cache:
+            result_dict = self.result_cache.get_many(translator, unique_segments, from_language, to_language, **kwargs)
+
+        texts = [segment for segment in unique_segments if segment not in result_dict]
+        groups = [[text] for text in texts]
+        if self._is_packing(translator, if_use_packing, **kwargs):
+            limit = get_segment_limit(getattr(self._translators_dict[translator], 'input_limit', None),
+                                      kwargs.get('limit_of_length', 20000))
+            groups = self.segment_packer.pack(translator, texts, limit)
+
+        def _translate_group(group: List[str]) -> List[Tuple[str, str]]:
+            if len(group) > 1:
+                try:
+                    translated_text = self.translators_dict[translator](
+                        query_text=self.segment_packer.join(group), from_language=from_language,
+                        to_language=to_language, **{**kwargs, 'if_use_cache': False, 'if_split_lines': True})
+                    translated_list = self.segment_packer.split(translator, translated_text, len(group))
+                except Exception:
+                    self.segment_packer.record(translator, len(group), is_aligned=False)
+                    translated_list = None
+
+                if translated_list is not None:
+                    if if_use_cache:
+                        self.result_cache.set_many(translator, dict(zip(group, translated_list)), from_language,
+                                                   to_language, **kwargs)
+                    return list(zip(group, translated_list))
+            return [(text, self.translate_text(text, translator=translator, from_language=from_language,
+                                               to_language=to_language, **kwargs)) for text in group]
+
+        n_jobs = self.cpu_cnt if n_jobs <= 0 else n_jobs
+        with concurrent.futures.ThreadPoolExecutor(n_jobs) as executor:
+            for pairs in executor.map(_translate_group, groups):
+                result_dict.update(pairs)
+        return [result_dict[segment] for segment in segments]
 
     def translate_html(self,
                        html_text: str,
@@ -6074,6 +6781,7 @@ class TranslatorsServer:
                        from_language: str = 'auto',
                        to_language: str = 'en',
                        n_jobs: int = 1,
+                       if_use_packing: Optional[bool] = False,
                        if_use_preacceleration: bool = False,
                        **kwargs: ApiKwargsType,
                        ) -> str:
@@ -6083,7 +6791,10 @@ class TranslatorsServer:
         :param translator: str, default 'alibaba'.
         :param from_language: str, default 'auto'.
         :param to_language: str, default 'en'.
-        :param n_jobs: int, default 1. -1 means os.cpu_cnt().
+        :param n_jobs: int, default 1. Number of threads translating at a time. -1 means os.cpu_cnt(). For requests on
+                an event loop instead, see `translate_many()`.
+        :param if_use_packing: Optional[bool], default False. None means packing for translators taking a list of
+                texts on the wire(`is_line_native`) only, True for all, see `set_segment_packing()`.
         :param if_use_preacceleration: bool, default False.
         :param **kwargs:
                 :param is_detail_result: bool, default False, must False.
@@ -6105,36 +6816,48 @@ class TranslatorsServer:
                 :param if_print_warning: bool, default True.
                 :param lingvanex_model: str, default 'B2C', choose from ("B2C", "B2B").
                 :param myMemory_mode: str, default "web", choose from ("web", "api").
+                :param if_use_cache: bool, default True. Works after set_result_cache(), set_translation_memory() or set_fuzzy_memory().
+                :param if_use_negative_cache: bool, default True.
+                :param if_use_chunking: bool, default True. Works after set_text_chunking(). Split a text over the limit of the
+                        translator into chunks, instead of failing or truncating. Not work with `is_detail_result`.
         :return: str
         """
 
-        if translator not in self.translators_pool or kwargs.get('is_detail_result', False) or n_jobs > self.cpu_cnt:
+        if translator not in self.translators_pool or kwargs.get('is_detail_result', False):
             raise TranslatorError
 
         if not self.pre_acceleration_label and if_use_preacceleration:
             _ = self.preaccelerate()
 
-        def _translate_text(sentence: str) -> Tuple[str, str]:
-            return sentence, self.translators_dict[translator](query_text=sentence, from_language=from_language,
-                                                               to_language=to_language, **kwargs)
-
         pattern = re.compile('>([\\s\\S]*?)<')  # not perfect
         sentence_list = list(set(pattern.findall(html_text)))
 
-        n_jobs = self.cpu_cnt if n_jobs <= 0 else n_jobs
-        with pathos_multiprocessing.ProcessPool(n_jobs) as pool:
-            result_list = pool.map(_translate_text, sentence_list)
+        if_use_cache = self.result_cache.is_enabled and kwargs.get('if_use_cache', True)
+        cached_dict = {}
+        if if_use_cache:
+            cached_dict = self.result_cache.get_many(translator, sentence_list, from_language, to_language, **kwargs)
+            sentence_list = [sentence for sentence in sentence_list if sentence not in cached_dict]
+
+        result_list = []
+        if sentence_list:
+            translated_list = self.translate_segments(sentence_list, translator=translator, from_language=from_language,
+                                                      to_language=to_language, n_jobs=n_jobs,
+                                                      if_use_packing=if_use_packing,
+                                                      **{**kwargs, 'if_use_cache': False})
+            result_list = list(zip(sentence_list, translated_list))
+
+        if if_use_cache:
+            self.result_cache.set_many(translator, dict(result_list), from_language, to_language, **kwargs)
 
-        result_dict = {text: f'>{ts_text}<' for text, ts_text in result_list}
+        result_dict = {text: f'>{ts_text}<' for text, ts_text in [*cached_dict.items(), *result_list]}
         _get_result_func = lambda k: result_dict.get(k.group(1), '')
         return pattern.sub(repl=_get_result_func, string=html_text)
 
     def _test_translate(self, _ts: str, timeout: Optional[float] = None, if_show_time_stat: bool = False) -> str:
-        from_language = self.not_zh_langs[_ts] if _ts in self.not_zh_langs else 'auto'
-        to_language = self.not_en_langs[_ts] if _ts in self.not_en_langs else 'en'
-        result = self.translators_dict[_ts](
+        from_language, to_language = self._get_test_languages(_ts)
+        # the api itself, not `translators_dict`: a cached result or a negative cache hit would warm up nothing.
+        result = getattr(self._translators_dict[_ts], f'{_ts}_api')(
             query_text=self.example_query_text,
-            translator=_ts,
             from_language=from_language,
             to_language=to_language,
             if_print_warning=False,
@@ -6148,45 +6871,65 @@ class TranslatorsServer:
         if language_map:
             return language_map
 
-        _ = self._test_translate(_ts=translator)
-        return self._translators_dict[translator].language_map
-
-    def get_languages(self, translator: str = 'bing'):
-        language_map = self._translators_dict[translator].language_map
-        if language_map:
-            return language_map
-
-        _ = self._test_translate(_ts=translator)
-        return self._translators_dict[translator].language_map
-
-    def get_languages(self, translator: str = 'bing'):
-        language_map = self._translators_dict[translator].language_map
+        language_map = self.language_map_snapshot.get(type(self._translators_dict[translator]).__name__)
         if language_map:
             return language_map
 
         _ = self._test_translate(_ts=translator)
         return self._translators_dict[translator].language_map
 
-    def preaccelerate(self, timeout: Optional[float] = None, if_show_time_stat: bool = True, **kwargs: str) -> dict:
+    def preaccelerate(self, timeout: Optional[float] = None, if_show_time_stat: bool = True,
+                      translators: Optional[Tuple[str, ...]] = None, n_jobs: int = 16,
+                      total_timeout: Optional[float] = None, **kwargs: str) -> dict:
+        """
+        Warm up translators in parallel, ie: open connections, get sessions and tokens, and load language maps, by a
+        test translation each. It takes about as long as the slowest translator, or `total_timeout`. Translators not
+        ready by then count as failures here, but keep warming up in background, and the readiness of each one is kept
+        in `readiness` as soon as known.
+        :param timeout: Optional[float], default None. Timeout of each request.
+        :param if_show_time_stat: bool, default True.
+        :param translators: Optional[Tuple[str, ...]], default None. None means all translators.
+        :param n_jobs: int, default 16. Number of translators warmed up at a time.
+        :param total_timeout: Optional[float], default None. None means waiting for all translators.
+        :param **kwargs:
+                :param example_query_text: str, default '你好。\\n欢迎你！'.
+        :return: dict
+        """
         if self.pre_acceleration_label > 0:
             raise TranslatorError('Preacceleration can only be performed once.')
 
-        self.example_query_text = kwargs.get('example_query_text', self.example_query_text)
-
-        # sys.stderr.write('Preacceleration-Process will take a few minutes.\n')
-        # sys.stderr.write('Tips: The smaller `timeout` value, the fewer translators pass the test '
-        #                  'and the less time it takes to preaccelerate. However, the slow speed of '
-        #                  'preacceleration does not mean the slow speed of later translation.\n\n')
+        translators = translators or self.translators_pool
+        if not set(translators) <= set(self.translators_pool):
+            raise TranslatorError(f'Unsupported translators: {set(translators) - set(self.translators_pool)}.')
+        if n_jobs < 1:
+            raise TranslatorError('`n_jobs` must be positive.')
 
-        for i in tqdm.tqdm(range(len(self.translators_pool)), desc='Preacceleration Process', ncols=80):
-            _ts = self.translators_pool[i]
-            try:
-                _ = self._test_translate(_ts, timeout, if_show_time_stat)
-                self.success_translators_pool.append(_ts)
-            except:
-                self.failure_translators_pool.append(_ts)
+        self.example_query_text = kwargs.get('example_query_text', self.example_query_text)
+        self.readiness.update({_ts: 'pending' for _ts in translators})
+
+        executor = concurrent.futures.ThreadPoolExecutor(min(n_jobs, len(translators)),
+                                                         thread_name_prefix='translators-preacceleration')
+        future_dict = {}
+        for _ts in translators:
+            future = executor.submit(self._test_translate, _ts, timeout, if_show_time_stat)
+            future.add_done_callback(lambda f, _ts=_ts: self._set_readiness(_ts, f.exception()))
+            future_dict[future] = _ts
+        executor.shutdown(wait=False)
+
+        done_translators = set()
+        try:
+            with tqdm.tqdm(total=len(translators), desc='Preacceleration Process', ncols=80) as progress:
+                for future in concurrent.futures.as_completed(future_dict, timeout=total_timeout):
+                    if future.exception() is None:
+                        self.success_translators_pool.append(future_dict[future])
+                    else:
+                        self.failure_translators_pool.append(future_dict[future])
+                    done_translators.add(future_dict[future])
+                    progress.update()
+        except concurrent.futures.TimeoutError:
+            self.failure_translators_pool.extend(_ts for _ts in translators if _ts not in done_translators)
 
-            self.pre_acceleration_label += 1
+        self.pre_acceleration_label += len(translators)
         return {'success': self.success_translators_pool, 'failure': self.failure_translators_pool}
 
     def speedtest(self, **kwargs: dict[str, str]) -> None:
@@ -6294,9 +7037,36 @@ youdao = tss.youdao
 
 translate_text = tss.translate_text
 translate_html = tss.translate_html
+translate_many = tss.translate_many
+translate_segments = tss.translate_segments
+translate_text_future = tss.translate_text_future
+close_event_loop = tss.close_event_loop
 translators_pool = tss.translators_pool
 get_languages = tss.get_languages
 get_region_of_server = tss.get_region_of_server
+set_translation_memory = tss.set_translation_memory
+set_result_cache = tss.set_result_cache
+set_fuzzy_memory = tss.set_fuzzy_memory
+fuzzy_lookup = tss.fuzzy_lookup
+set_language_map_snapshot = tss.set_language_map_snapshot
+set_token_vault = tss.set_token_vault
+set_shared_cache = tss.set_shared_cache
+set_resource_cache = tss.set_resource_cache
+set_negative_cache = tss.set_negative_cache
+set_transport = tss.set_transport
+set_session_lifetime = tss.set_session_lifetime
+set_http2 = tss.set_http2
+set_dns_cache = tss.set_dns_cache
+set_segment_packing = tss.set_segment_packing
+set_text_chunking = tss.set_text_chunking
+set_endpoint_selection = tss.set_endpoint_selection
+set_session_pool = tss.set_session_pool
+refresh_expiring_sessions = tss.refresh_expiring_sessions
+start_background_refresh = tss.start_background_refresh
+stop_background_refresh = tss.stop_background_refresh
+stream_info = tss.stream_info
+cache_info = tss.cache_info
+cache_clear = tss.cache_clear
 
 preaccelerate = tss.preaccelerate
 speedtest = tss.speedtest
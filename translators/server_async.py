@@ -28,10 +28,18 @@ import asyncio
 import os
 import re
 import sys
-from typing import Optional, Union, Tuple
+import time
+from typing import Optional, Union, Tuple, List, Callable, Any
 import tqdm
 
 from translators.base import TranslatorError, ApiKwargsType
+from translators.cache import TranslationMemory, ResultCache, language_map_snapshot, token_vault
+from translators.cache import resource_cache, negative_cache, session_lifetime
+from translators.concurrency import AsyncSingleFlight, IdentityPool, AsyncBackgroundRefresher, get_flight_key
+from translators.transport import AsyncTransport, async_transport, endpoint_selector
+from translators.transport import stream_stats, DnsCache, dns_cache
+from translators.segment import segment_packer, get_segment_limit, text_chunker
+from translators.config import ConfigMixin
 from translators.providers import (
     AlibabaV2, Apertium, Argos, BaiduV1, Bing, Caiyun, cloudTranslationV2, Deepl, Elia,
     QQFanyi, GoogleV2, Hujiang, Iciba, IflytekV2, Iflyrec, Itranslate, Judic,
@@ -45,7 +53,7 @@ __all__ = [
 ]  # 37
 
 
-class TranslatorsServer:
+class TranslatorsServer(ConfigMixin):
     def __init__(self):
         self.cpu_cnt = os.cpu_count()
         self._region = Region()
@@ -114,8 +122,25 @@ class TranslatorsServer:
                                  'reverso', 'sogou', 'sysTran',
                                  'tilde', 'translateCom', 'translateMe', 'utibet', 'volcEngine', 'yandex', 'yeekit',
                                  'youdao']
+        self.translation_memory: Optional[TranslationMemory] = None
+        self.result_cache = ResultCache(max_bytes=0)
+        self.single_flight = AsyncSingleFlight()
+        self.language_map_snapshot = language_map_snapshot
+        self.token_vault = token_vault
+        self.resource_cache = resource_cache
+        self.negative_cache = negative_cache
+        self.async_transport = async_transport
+        self.identity_pools = {}
+        self.session_lifetime = session_lifetime
+        self.endpoint_selector = endpoint_selector
+        self.stream_stats = stream_stats
+        self.dns_cache = dns_cache
+        self.segment_packer = segment_packer
+        self.text_chunker = text_chunker
+        self.background_refresher: Optional[AsyncBackgroundRefresher] = None
         self.translators_dict = {
-            tran: getattr(self, f"_{tran}").trans_api_async
+            tran: self.result_cache.cached_async(tran, self.negative_cache.guarded_async(
+                type(getattr(self, f"_{tran}")).__name__, getattr(self, f"_{tran}").trans_api_async, TranslatorError))
             for tran in self.translators_list
         }
         for key, value in self.translators_dict.items():
@@ -128,6 +153,171 @@ class TranslatorsServer:
         self.example_query_text = '你好。\n欢迎你！'
         self.success_translators_pool = []
         self.failure_translators_pool = []
+        self.readiness = {}
+
+    def set_async_transport(self, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30.0,
+                            ttl_dns_cache: Optional[int] = 300, if_use_dns_cache: bool = True) -> AsyncTransport:
+        """
+        Configure the connection pool shared by the sessions of each translator. Takes effect after `aclose()`.
+        :param limit: int, default 100. Max connections of one translator.
+        :param limit_per_host: int, default 10. Max connections of one translator to one host.
+        :param keepalive_timeout: float, default 30.0.
+        :param ttl_dns_cache: Optional[int], default 300. None means dns cache never expires.
+        :param if_use_dns_cache: bool, default True.
+        :return: AsyncTransport
+        """
+        self.async_transport.configure(limit=limit, limit_per_host=limit_per_host,
+                                       keepalive_timeout=keepalive_timeout, ttl_dns_cache=ttl_dns_cache,
+                                       if_use_dns_cache=if_use_dns_cache)
+        return self.async_transport
+
+    def set_dns_cache(self, ttl_seconds: Optional[float] = 300.0, max_size: int = 1000, address_preference: str = 'auto',
+                      happy_eyeballs_delay: Optional[float] = 0.25, if_use_dns_cache: bool = True) -> DnsCache:
+        """
+        Share resolved addresses of hosts between the sessions of all translators, so that neither refreshes nor new
+        connections wait for slow resolvers, and choose the address family and happy eyeballs behaviour. Resolver
+        timings are in `dns_cache.info()`. Takes effect on new connections, and on connection pools after `aclose()`.
+        :param ttl_seconds: Optional[float], default 300.0. None means never expired.
+        :param max_size: int, default 1000.
+        :param address_preference: str, default 'auto'. Union['auto', 'ipv4', 'ipv6', 'ipv4_only', 'ipv6_only'],
+                'ipv4' means trying IPv4 addresses first.
+        :param happy_eyeballs_delay: Optional[float], default 0.25. None disables it.
+        :param if_use_dns_cache: bool, default True.
+        :return: DnsCache
+        """
+        if address_preference not in ('auto', 'ipv4', 'ipv6', 'ipv4_only', 'ipv6_only'):
+            raise TranslatorError(f'Unsupported address_preference: {address_preference}.')
+
+        self.dns_cache.configure(ttl_seconds=ttl_seconds, max_size=max_size, address_preference=address_preference,
+                                 is_enabled=if_use_dns_cache)
+        self.async_transport.configure_dns(happy_eyeballs_delay=happy_eyeballs_delay)
+        return self.dns_cache
+
+    async def _refresh_in_background(self, translator: str, lead_ratio: float, timeout: Optional[float]) -> int:
+        pool = self.identity_pools.get(translator) or self.set_session_pool(translator, pool_size=1)
+        n_swapped = 0
+        for old_translator in list(pool.translators):
+            if not old_translator.is_session_expiring(lead_ratio, is_async=True):
+                continue
+
+            new_translator = self._new_translator(old_translator, old_translator.identity)
+            new_translator.is_vault_deferred = True  # scrape new secrets, keep the vault until they work.
+            from_language, to_language = self._get_test_languages(translator)
+            try:
+                _ = await new_translator.trans_api_async(self.example_query_text, from_language, to_language,
+                                                         if_print_warning=False, timeout=timeout)
+            except Exception:
+                continue  # the old session refreshes inline as before.
+
+            old_session = getattr(old_translator, 'async_session', None)
+            # swapped inside the instance, which `translators_dict`, identity pools and module aliases are bound to.
+            if not await old_translator.async_refresh_gate.swap(lambda: old_translator.take_over(new_translator),
+                                                                timeout=60):
+                old_session = getattr(new_translator, 'async_session', None)
+            else:
+                n_swapped += 1
+            self.async_transport.discard(old_session)
+        return n_swapped
+
+    async def refresh_expiring_sessions(self, translators: Optional[Tuple[str, ...]] = None, lead_ratio: float = 0.8,
+                                        timeout: Optional[float] = None) -> int:
+        """
+        Prepare a new session and tokens for each translator(identity) in use whose session is close to expiry, and swap
+        them in at once. Requests never wait for the refresh, they use the old session until the swap.
+        :param translators: Optional[Tuple[str, ...]], default None. None means all translators.
+        :param lead_ratio: float, default 0.8. A session is close to expiry after `lead_ratio` of the default
+                `update_session_after_seconds` or `update_session_after_freq`.
+        :param timeout: Optional[float], default None.
+        :return: int, number of sessions swapped.
+        """
+        translators = [tran for tran in translators or self.translators_pool if tran in self.identity_pools
+                       or self._translators_dict[tran].is_session_expiring(lead_ratio, is_async=True)]
+        n_swapped_list = await asyncio.gather(*[self._refresh_in_background(tran, lead_ratio, timeout)
+                                                for tran in translators])
+        return sum(n_swapped_list)
+
+    async def start_background_refresh(self, translators: Optional[Tuple[str, ...]] = None,
+                                       interval_seconds: float = 10.0, lead_ratio: float = 0.8,
+                                       timeout: Optional[float] = None) -> AsyncBackgroundRefresher:
+        """
+        Run `refresh_expiring_sessions` every `interval_seconds` in a task of the running event loop, so that no request
+        pays for a session rollover. Only the default rollover(`update_session_after_freq`,
+        `update_session_after_seconds`) is anticipated. `aclose()` stops it.
+        :param translators: Optional[Tuple[str, ...]], default None. None means all translators.
+        :param interval_seconds: float, default 10.0.
+        :param lead_ratio: float, default 0.8.
+        :param timeout: Optional[float], default None.
+        :return: AsyncBackgroundRefresher
+        """
+        await self.stop_background_refresh()
+        self.background_refresher = AsyncBackgroundRefresher(
+            lambda: self.refresh_expiring_sessions(translators, lead_ratio, timeout), interval_seconds).start()
+        return self.background_refresher
+
+    async def stop_background_refresh(self) -> None:
+        if self.background_refresher is not None:
+            await self.background_refresher.stop()
+            self.background_refresher = None
+
+    def set_session_pool(self, translator: str = 'bing', pool_size: int = 4,
+                         strategy: str = 'round_robin') -> IdentityPool:
+        """
+        Use `pool_size` independent session identities of a translator, each with its own session, cookies, tokens and
+        refresh clock, so that its traffic is not throttled as one browser. Requests are dispatched to them in turn
+        (`round_robin`) or to the one with the fewest requests running(`least_loaded`).
+        :param translator: str, default 'bing'.
+        :param pool_size: int, default 4. 1 means one identity, as by default.
+        :param strategy: str, default 'round_robin'. Union['round_robin', 'least_loaded']
+        :return: IdentityPool
+        """
+        if translator not in self.translators_pool or pool_size < 1:
+            raise TranslatorError
+
+        primary = self._translators_dict[translator]
+        translators = [primary] + [self._new_translator(primary, identity) for identity in range(1, pool_size)]
+
+        self.identity_pools[translator] = pool = IdentityPool(translators, strategy)
+        api_func = self.negative_cache.guarded_async(type(primary).__name__, pool.dispatch_async('trans_api_async'),
+                                                     TranslatorError)
+        self.translators_dict[translator] = self.result_cache.cached_async(translator, api_func)
+        setattr(self, translator, self.translators_dict[translator])
+        return pool
+
+    def set_http2(self, translators: Union[str, Tuple[str, ...]] = ('google', 'deepl', 'bing'),
+                  if_use_http2: bool = True) -> AsyncTransport:
+        """
+        Enable or disable HTTP/2 mode of translators, whose concurrent requests to one host are then multiplexed over one
+        connection. Servers not negotiating h2 are spoken to in HTTP/1.1, and HTTP/2 needs the optional package `h2`
+        (`pip install httpx[http2]`), without which aiohttp is used. Takes effect when translators refresh.
+        :param translators: Union[str, Tuple[str, ...]], default ('google', 'deepl', 'bing').
+        :param if_use_http2: bool, default True.
+        :return: AsyncTransport
+        """
+        translators = (translators,) if isinstance(translators, str) else translators
+        if not set(translators) <= set(self.translators_pool):
+            raise TranslatorError(f'Unsupported translators: {set(translators) - set(self.translators_pool)}.')
+
+        self.async_transport.set_http2([type(getattr(self, f'_{tran}')).__name__ for tran in translators], if_use_http2)
+        return self.async_transport
+
+    async def aclose(self) -> None:
+        """
+        Stop the background refresh, and close the sessions and connection pools of all translators on the running
+        event loop. Translators open new ones on their next request.
+        """
+        await self.stop_background_refresh()
+        await self.async_transport.aclose()
+        translators = list(self._translators_dict.values())
+        translators += [tran for pool in self.identity_pools.values() for tran in pool.translators[1:]]
+        for translator in translators:
+            if hasattr(translator, 'async_session'):
+                translator.async_session = None
+
+    async def __aenter__(self) -> 'TranslatorsServer':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
 
     async def translate_text(self,
                                    query_text: str,
@@ -162,6 +352,10 @@ class TranslatorsServer:
                 :param if_print_warning: bool, default True.
                 :param lingvanex_model: str, default 'B2C', choose from ("B2C", "B2B").
                 :param myMemory_mode: str, default "web", choose from ("web", "api").
+                :param if_use_cache: bool, default True. Works after set_result_cache(), set_translation_memory() or set_fuzzy_memory().
+                :param if_use_negative_cache: bool, default True.
+                :param if_use_chunking: bool, default True. Works after set_text_chunking(). Split a text over the limit of the
+                        translator into chunks, instead of failing or truncating. Not work with `is_detail_result`.
         :return: str or dict
         """
 
@@ -171,8 +365,172 @@ class TranslatorsServer:
         if not self.pre_acceleration_label and if_use_preacceleration:
             _ = await self.preaccelerate()
 
-        return await self.translators_dict[translator](query_text=query_text, from_language=from_language,
-                                                             to_language=to_language, **kwargs)
+        chunk_limit = self._get_chunk_limit(translator, query_text, **kwargs)
+        if chunk_limit is not None:
+            chunks = self.text_chunker.split(query_text, chunk_limit, self.segment_packer.get_length_unit(translator))
+            contents = list(dict.fromkeys(chunk.strip() for chunk in chunks if chunk.strip()))
+            translated_list = await self.translate_batch(contents, translator=translator, from_language=from_language,
+                                                         to_language=to_language,
+                                                         concurrency=self.text_chunker.concurrency,
+                                                         if_return_exceptions=False,
+                                                         **{**kwargs, 'if_use_chunking': False})
+            return self.text_chunker.join(chunks, dict(zip(contents, translated_list)))
+
+        if not isinstance(query_text, str):
+            return await self.translators_dict[translator](query_text=query_text, from_language=from_language,
+                                                           to_language=to_language, **kwargs)
+
+        flight_key = get_flight_key(translator, query_text, from_language, to_language, **kwargs)
+        return await self.single_flight.do(flight_key, self.translators_dict[translator], query_text=query_text,
+                                           from_language=from_language, to_language=to_language, **kwargs)
+
+    async def translate_batch(self,
+                              query_texts: List[str],
+                              translator: str = 'alibaba',
+                              from_language: str = 'auto',
+                              to_language: str = 'en',
+                              concurrency: int = 32,
+                              if_return_exceptions: bool = True,
+                              if_show_progress: bool = False,
+                              callback: Optional[Callable[[int, int], Any]] = None,
+                              if_use_packing: Optional[bool] = False,
+                              if_use_preacceleration: bool = False,
+                              **kwargs: ApiKwargsType,
+                              ) -> List[Union[str, dict, Exception]]:
+        """
+        Translate many texts by `translate_text()`. Duplicated texts are translated once. At most `concurrency`
+        requests are in flight, a new one starts as soon as one finishes, so that only `concurrency` tasks exist at a
+        time however many texts there are. Results are in the order of `query_texts`. The progress is passed to
+        `callback(n_done, n_total)` as unique texts finish.
+        With `if_use_packing`, short texts are packed into requests up to the input limit of the translator by
+        `segment_packer`, natively for translators taking a list of texts on the wire(`is_line_native`).
+        :param query_texts: List[str], must.
+        :param translator: str, default 'alibaba'.
+        :param from_language: str, default 'auto'.
+        :param to_language: str, default 'en'.
+        :param concurrency: int, default 32. Number of requests in flight at a time.
+        :param if_return_exceptions: bool, default True. If True, the exception of a failed text is returned in its
+                place, else the first exception is raised and the remaining requests are cancelled.
+        :param if_show_progress: bool, default False.
+        :param callback: Optional[Callable[[int, int], Any]], default None.
+        :param if_use_packing: Optional[bool], default False. None means packing for `is_line_native` translators only,
+                True for all translators, see `set_segment_packing()`. Not work with `is_detail_result`.
+        :param if_use_preacceleration: bool, default False.
+        :param **kwargs: same as `translate_text()`.
+        :return: List[Union[str, dict, Exception]]
+        """
+        if translator not in self.translators_pool:
+            raise TranslatorError(f'Unsupported translator: {translator}.')
+        if concurrency < 1:
+            raise TranslatorError('`concurrency` must be positive.')
+
+        if not self.pre_acceleration_label and if_use_preacceleration:
+            _ = await self.preaccelerate()
+
+        unique_texts = list(dict.fromkeys(query_texts))
+        result_dict = {}
+        if_use_cache = (self.result_cache.is_enabled and kwargs.get('if_use_cache', True)
+                        and not kwargs.get('is_detail_result', False))
+        if if_use_cache:
+            result_dict = self.result_cache.get_many(translator, unique_texts, from_language, to_language, **kwargs)
+
+        texts = [query_text for query_text in unique_texts if query_text not in result_dict]
+        if self._is_packing(translator, if_use_packing, **kwargs):
+            limit = get_segment_limit(getattr(self._translators_dict[translator], 'input_limit', None),
+                                      kwargs.get('limit_of_length', 20000))
+            group_iter = iter(self.segment_packer.pack(translator, texts, limit))
+        else:
+            group_iter = iter([query_text] for query_text in texts)
+
+        async def _translate_one(query_text: str) -> Union[str, dict, Exception]:
+            try:
+                return await self.translate_text(query_text, translator=translator, from_language=from_language,
+                                                 to_language=to_language, **kwargs)
+            except Exception as e:
+                return e
+
+        async def _translate_group(group: List[str]) -> dict:
+            if len(group) > 1:
+                try:
+                    translated_text = await self.translate_text(self.segment_packer.join(group), translator=translator,
+                                                                from_language=from_language, to_language=to_language,
+                                                                **{**kwargs, 'if_use_cache': False,
+                                                                   'if_split_lines': True})
+                    translated_list = self.segment_packer.split(translator, translated_text, len(group))
+                except Exception:
+                    self.segment_packer.record(translator, len(group), is_aligned=False)
+                    translated_list = None
+
+                if translated_list is not None:
+                    group_result_dict = dict(zip(group, translated_list))
+                    if if_use_cache:
+                        self.result_cache.set_many(translator, group_result_dict, from_language, to_language, **kwargs)
+                    return group_result_dict
+            return dict(zip(group, await asyncio.gather(*(_translate_one(query_text) for query_text in group))))
+
+        task_dict = {}
+
+        def _schedule() -> None:
+            for group in group_iter:
+                task_dict[asyncio.ensure_future(_translate_group(group))] = group
+                if len(task_dict) >= concurrency:
+                    break
+
+        progress = tqdm.tqdm(total=len(unique_texts), initial=len(result_dict), desc='Translation Process', ncols=80,
+                             disable=not if_show_progress)
+        try:
+            _schedule()
+            while task_dict:
+                done, _ = await asyncio.wait(task_dict, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    group_result_dict = task.result()
+                    del task_dict[task]
+                    error = next((v for v in group_result_dict.values() if isinstance(v, Exception)), None)
+                    if error is not None and not if_return_exceptions:
+                        raise error
+                    result_dict.update(group_result_dict)
+                    progress.update(len(group_result_dict))
+                    if callback is not None:
+                        callback(len(result_dict), len(unique_texts))
+                _schedule()
+        finally:
+            progress.close()
+            for task in task_dict:
+                task.cancel()
+            _ = await asyncio.gather(*task_dict, return_exceptions=True)
+
+        return [result_dict[query_text] for query_text in query_texts]
+
+    async def translate_segments(self,
+                                 segments: List[str],
+                                 translator: str = 'alibaba',
+                                 from_language: str = 'auto',
+                                 to_language: str = 'en',
+                                 concurrency: int = 32,
+                                 if_use_packing: Optional[bool] = False,
+                                 **kwargs: ApiKwargsType,
+                                 ) -> List[str]:
+        """
+        Translate segments(eg: strings of a UI catalog, texts of html) by the fewest requests, by `translate_batch()`.
+        With `if_use_packing`, many of them go as the lines of one query, natively for translators taking a list of
+        segments on the wire(`is_line_native`: caiyun, deepl, iflyrec, sysTran, yandex).
+        The first error is raised.
+        :param segments: List[str], must.
+        :param translator: str, default 'alibaba'.
+        :param from_language: str, default 'auto'.
+        :param to_language: str, default 'en'.
+        :param concurrency: int, default 32. Number of requests in flight at a time.
+        :param if_use_packing: Optional[bool], default False. None means packing for `is_line_native` translators only,
+                True for all translators, see `set_segment_packing()`.
+        :param **kwargs: same as `translate_batch()`, `is_detail_result` must be False.
+        :return: List[str]
+        """
+        if kwargs.get('is_detail_result', False):
+            raise TranslatorError
+
+        return await self.translate_batch(segments, translator=translator, from_language=from_language,
+                                          to_language=to_language, concurrency=concurrency, if_return_exceptions=False,
+                                          if_use_packing=if_use_packing, **kwargs)
 
     async def translate_html(self,
                        html_text: str,
@@ -180,6 +538,7 @@ class TranslatorsServer:
                        from_language: str = 'auto',
                        to_language: str = 'en',
                        n_jobs: int = 1,
+                       if_use_packing: Optional[bool] = False,
                        if_use_preacceleration: bool = False,
                        **kwargs: ApiKwargsType,
                        ) -> str:
@@ -189,7 +548,9 @@ class TranslatorsServer:
         :param translator: str, default 'alibaba'.
         :param from_language: str, default 'auto'.
         :param to_language: str, default 'en'.
-        :param n_jobs: int, default 1. -1 means os.cpu_cnt().
+        :param n_jobs: int, default 1. Number of requests in flight at a time. -1 means os.cpu_cnt().
+        :param if_use_packing: Optional[bool], default False. None means packing for translators taking a list of
+                texts on the wire(`is_line_native`) only, True for all, see `set_segment_packing()`.
         :param if_use_preacceleration: bool, default False.
         :param **kwargs:
                 :param is_detail_result: bool, default False, must False.
@@ -210,39 +571,29 @@ class TranslatorsServer:
                 :param if_print_warning: bool, default True.
                 :param lingvanex_model: str, default 'B2C', choose from ("B2C", "B2B").
                 :param myMemory_mode: str, default "web", choose from ("web", "api").
+                :param if_use_cache: bool, default True. Works after set_result_cache(), set_translation_memory() or set_fuzzy_memory().
+                :param if_use_negative_cache: bool, default True.
+                :param if_use_chunking: bool, default True. Works after set_text_chunking(). Split a text over the limit of the
+                        translator into chunks, instead of failing or truncating. Not work with `is_detail_result`.
         :return: str
         """
 
-        if translator not in self.translators_pool or kwargs.get('is_detail_result', False) or n_jobs > self.cpu_cnt:
+        if translator not in self.translators_pool or kwargs.get('is_detail_result', False):
             raise TranslatorError
 
         if not self.pre_acceleration_label and if_use_preacceleration:
             _ = await self.preaccelerate()
 
-
-
         pattern = re.compile('>([\\s\\S]*?)<')  # not perfect
         sentence_list = list(set(pattern.findall(html_text)))
         if not sentence_list:
             return html_text
 
         n_jobs = self.cpu_cnt if n_jobs <= 0 else n_jobs
-        semaphore = asyncio.Semaphore(n_jobs)
-
-        async def _translate_text(sentence: str) -> Tuple[str, str]:
-            async with semaphore:
-                translated = await self.translators_dict[translator](
-                    query_text=sentence,
-                    from_language=from_language,
-                    to_language=to_language,
-                    **kwargs
-                )
-                return sentence, translated
-
-        result_list = await asyncio.gather(
-            *(_translate_text(sentence) for sentence in sentence_list)
-        )
-        result_dict = {src: f'>{dst}<' for src, dst in result_list}
+        result_list = await self.translate_batch(sentence_list, translator=translator, from_language=from_language,
+                                                 to_language=to_language, concurrency=n_jobs,
+                                                 if_return_exceptions=False, if_use_packing=if_use_packing, **kwargs)
+        result_dict = {src: f'>{dst}<' for src, dst in zip(sentence_list, result_list)}
 
         def _repl(match: re.Match):
             return result_dict.get(match.group(1), match.group(0))
@@ -253,9 +604,9 @@ class TranslatorsServer:
                                     if_show_time_stat: bool = False) -> str:
         from_language = self.not_zh_langs[_ts] if _ts in self.not_zh_langs else 'auto'
         to_language = "ar"# self.not_en_langs[_ts] if _ts in self.not_en_langs else 'en'
-        result = await self.translators_dict[_ts](
+        # the api itself, not `translators_dict`: a cached result or a negative cache hit would warm up nothing.
+        result = await self._translators_dict[_ts].trans_api_async(
             query_text=self.example_query_text,
-            translator=_ts,
             from_language=from_language,
             to_language=to_language,
             if_print_warning=False,
@@ -269,30 +620,96 @@ class TranslatorsServer:
         if language_map:
             return language_map
 
+        language_map = self.language_map_snapshot.get(type(self._translators_dict[translator]).__name__)
+        if language_map:
+            return language_map
+
         _ = await self._test_translate(_ts=translator)
         return self._translators_dict[translator].language_map
 
+    async def warmup(self, translators: Optional[Tuple[str, ...]] = None, timeout: Optional[float] = None,
+                     total_timeout: Optional[float] = None, n_jobs: int = 16, if_show_time_stat: bool = False,
+                     callback: Optional[Callable[[str, bool], Any]] = None) -> dict:
+        """
+        Warm up translators concurrently, ie: open connections, get sessions and tokens, and load language maps, by a
+        test translation each. It can run in background at service start, eg: `asyncio.create_task(warmup())`, while
+        requests are served. The readiness of each translator is kept in `readiness` and passed to
+        `callback(translator, is_ready)` as soon as known. Translators not ready within `total_timeout` are cancelled
+        and stay 'pending', they get ready on their first request.
+        :param translators: Optional[Tuple[str, ...]], default None. None means all translators.
+        :param timeout: Optional[float], default None. Timeout of each request.
+        :param total_timeout: Optional[float], default None. None means waiting for all translators.
+        :param n_jobs: int, default 16. Number of translators warmed up at a time.
+        :param if_show_time_stat: bool, default False.
+        :param callback: Optional[Callable[[str, bool], Any]], default None.
+        :return: dict
+        """
+        translators = translators or self.translators_pool
+        if not set(translators) <= set(self.translators_pool):
+            raise TranslatorError(f'Unsupported translators: {set(translators) - set(self.translators_pool)}.')
+        if n_jobs < 1:
+            raise TranslatorError('`n_jobs` must be positive.')
+
+        self.readiness.update({_ts: 'pending' for _ts in translators})
+        semaphore = asyncio.Semaphore(n_jobs)
+
+        async def _warmup(_ts: str) -> None:
+            async with semaphore:
+                _ = await self._test_translate(_ts, timeout, if_show_time_stat)
+
+        task_dict = {asyncio.ensure_future(_warmup(_ts)): _ts for _ts in translators}
+        result = {'success': [], 'failure': []}
+        pending = set(task_dict)
+        deadline = None if total_timeout is None else time.time() + total_timeout
+        try:
+            while pending:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    break
+
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    _ts, error = task_dict[task], task.exception()
+                    self._set_readiness(_ts, error)
+                    result['success' if error is None else 'failure'].append(_ts)
+                    if callback is not None:
+                        callback(_ts, error is None)
+        finally:
+            for task in pending:
+                task.cancel()
+            _ = await asyncio.gather(*pending, return_exceptions=True)
+
+        result['failure'].extend(task_dict[task] for task in pending)
+        return result
+
     async def preaccelerate(self, timeout: Optional[float] = None, if_show_time_stat: bool = True,
-                                  **kwargs: str) -> dict:
+                            translators: Optional[Tuple[str, ...]] = None, n_jobs: int = 16,
+                            total_timeout: Optional[float] = None, **kwargs: str) -> dict:
+        """
+        Warm up translators concurrently by `warmup()`, showing the progress. It takes about as long as the slowest
+        translator, or `total_timeout`.
+        :param timeout: Optional[float], default None. Timeout of each request.
+        :param if_show_time_stat: bool, default True.
+        :param translators: Optional[Tuple[str, ...]], default None. None means all translators.
+        :param n_jobs: int, default 16. Number of translators warmed up at a time.
+        :param total_timeout: Optional[float], default None. None means waiting for all translators.
+        :param **kwargs:
+                :param example_query_text: str, default '你好。\\n欢迎你！'.
+        :return: dict
+        """
         if self.pre_acceleration_label > 0:
             raise TranslatorError('Preacceleration can only be performed once.')
 
         self.example_query_text = kwargs.get('example_query_text', self.example_query_text)
 
-        sys.stderr.write('Preacceleration-Process will take a few minutes.\n')
-        sys.stderr.write('Tips: The smaller `timeout` value, the fewer translators pass the test '
-                         'and the less time it takes to preaccelerate. However, the slow speed of '
-                         'preacceleration does not mean the slow speed of later translation.\n\n')
-
-        for i in tqdm.tqdm(range(len(self.translators_pool)), desc='Preacceleration Process', ncols=80):
-            _ts = self.translators_pool[i]
-            try:
-                _ = await self._test_translate(_ts, timeout, if_show_time_stat)
-                self.success_translators_pool.append(_ts)
-            except:
-                self.failure_translators_pool.append(_ts)
+        translators = translators or self.translators_pool
+        with tqdm.tqdm(total=len(translators), desc='Preacceleration Process', ncols=80) as progress:
+            result = await self.warmup(translators, timeout=timeout, total_timeout=total_timeout, n_jobs=n_jobs,
+                                       if_show_time_stat=if_show_time_stat, callback=lambda *_: progress.update())
 
-            self.pre_acceleration_label += 1
+        self.success_translators_pool.extend(result['success'])
+        self.failure_translators_pool.extend(result['failure'])
+        self.pre_acceleration_label += len(translators)
         return {'success': self.success_translators_pool, 'failure': self.failure_translators_pool}
 
     async def speedtest(self, **kwargs: dict[str, str]) -> None:
@@ -320,11 +737,38 @@ class TranslatorsServer:
 async_tss = TranslatorsServer()
 translate_text = async_tss.translate_text
 translate_html = async_tss.translate_html
+translate_batch = async_tss.translate_batch
+translate_segments = async_tss.translate_segments
 translators_pool = async_tss.translators_pool
 get_languages = async_tss.get_languages
 get_region_of_server = async_tss.get_region_of_server
+set_translation_memory = async_tss.set_translation_memory
+set_result_cache = async_tss.set_result_cache
+set_fuzzy_memory = async_tss.set_fuzzy_memory
+fuzzy_lookup = async_tss.fuzzy_lookup
+set_language_map_snapshot = async_tss.set_language_map_snapshot
+set_token_vault = async_tss.set_token_vault
+set_shared_cache = async_tss.set_shared_cache
+set_resource_cache = async_tss.set_resource_cache
+set_negative_cache = async_tss.set_negative_cache
+set_async_transport = async_tss.set_async_transport
+set_session_lifetime = async_tss.set_session_lifetime
+set_http2 = async_tss.set_http2
+set_dns_cache = async_tss.set_dns_cache
+set_segment_packing = async_tss.set_segment_packing
+set_text_chunking = async_tss.set_text_chunking
+set_endpoint_selection = async_tss.set_endpoint_selection
+set_session_pool = async_tss.set_session_pool
+refresh_expiring_sessions = async_tss.refresh_expiring_sessions
+start_background_refresh = async_tss.start_background_refresh
+stop_background_refresh = async_tss.stop_background_refresh
+aclose = async_tss.aclose
+stream_info = async_tss.stream_info
+cache_info = async_tss.cache_info
+cache_clear = async_tss.cache_clear
 
 preaccelerate = async_tss.preaccelerate
+warmup = async_tss.warmup
 speedtest = async_tss.speedtest
 preaccelerate_and_speedtest = async_tss.preaccelerate_and_speedtest
 # sys.stderr.write(f'Support translators {translators_pool} only.\n')
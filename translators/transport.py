@@ -0,0 +1,970 @@
+import re
+import time
+import codecs
+import socket
+import asyncio
+import weakref
+import warnings
+import threading
+import functools
+import collections
+import ipaddress
+import http.cookies
+import importlib.util
+from typing import Optional, Union, Tuple, Iterable, List, Dict
+
+import yarl
+import httpx
+import aiohttp
+import requests
+import niquests
+import urllib3
+import cloudscraper
+import aiohttp.abc
+import requests.adapters
+
+from translators.concurrency import SingleFlight, AsyncSingleFlight
+
+
+SessionType = Union[requests.sessions.Session, niquests.sessions.Session, httpx.Client]
+
+
+@functools.lru_cache(maxsize=1)
+def is_http2_available() -> bool:
+    """HTTP/2 of httpx needs the optional package `h2`(`pip install httpx[http2]`)."""
+    return importlib.util.find_spec('h2') is not None
+
+
+def warn_http2_unavailable(fallback: str) -> None:
+    warnings.warn(f'HTTP/2 needs the package `h2`(`pip install httpx[http2]`), {fallback} is used instead.')
+
+
+@functools.lru_cache(maxsize=1)
+def get_accept_encoding() -> str:
+    """Compressions all http clients can decode, with `br` when the optional package `brotli` is installed."""
+    encodings = ['gzip', 'deflate']
+    if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+        encodings.append('br')
+    return ', '.join(encodings)
+
+
+class DnsCache:
+    def __init__(self, ttl_seconds: Optional[float] = 300.0, max_size: int = 1000, address_preference: str = 'auto'):
+        """
+        Addresses of hosts resolved once and shared by the sessions and connection pools of all translators, sync and
+        async, so that neither refreshes nor new connections wait for the resolver again. The system resolver does not
+        tell record TTLs, so entries are kept for at most `ttl_seconds`, and dropped at once when none of their
+        addresses can be connected to. Concurrent lookups of one host are coalesced.
+        :param ttl_seconds: Optional[float], default 300.0. None means never expired.
+        :param max_size: int, default 1000.
+        :param address_preference: str, default 'auto'. Union['auto', 'ipv4', 'ipv6', 'ipv4_only', 'ipv6_only'],
+                'ipv4' means trying IPv4 addresses first.
+        """
+        if address_preference not in ('auto', 'ipv4', 'ipv6', 'ipv4_only', 'ipv6_only'):
+            raise ValueError(f'Unsupported address_preference: {address_preference}.')
+
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.address_preference = address_preference
+        self.is_enabled = True
+        self.n_hits = 0
+        self.n_misses = 0
+        self.n_errors = 0
+        self.n_resolves = 0
+        self.resolve_seconds = 0.0
+        self.max_resolve_seconds = 0.0
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_entries': {}, '_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def configure(self, ttl_seconds: Optional[float] = 300.0, max_size: int = 1000, address_preference: str = 'auto',
+                  is_enabled: bool = True) -> None:
+        if address_preference not in ('auto', 'ipv4', 'ipv6', 'ipv4_only', 'ipv6_only'):
+            raise ValueError(f'Unsupported address_preference: {address_preference}.')
+
+        with self._lock:
+            self.ttl_seconds = ttl_seconds
+            self.max_size = max_size
+            self.address_preference = address_preference
+            self.is_enabled = is_enabled
+            self._entries.clear()
+
+    def get_family(self, family: int = socket.AF_UNSPEC) -> int:
+        if family == socket.AF_UNSPEC and self.address_preference == 'ipv4_only':
+            return socket.AF_INET
+        if family == socket.AF_UNSPEC and self.address_preference == 'ipv6_only':
+            return socket.AF_INET6
+        return family
+
+    def order(self, results: List[dict]) -> List[dict]:
+        if self.address_preference in ('ipv4', 'ipv6'):
+            first_family = socket.AF_INET if self.address_preference == 'ipv4' else socket.AF_INET6
+            return sorted(results, key=lambda result: result['family'] != first_family)  # stable.
+        return list(results)
+
+    def get(self, key: tuple) -> Optional[List[dict]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item and (item[0] is None or item[0] > time.time()):
+                self.n_hits += 1
+                return self.order(item[1])
+
+            self._entries.pop(key, None)
+            self.n_misses += 1
+            return None
+
+    def set(self, key: tuple, results: List[dict]) -> None:
+        with self._lock:
+            while len(self._entries) >= self.max_size:
+                self._entries.pop(next(iter(self._entries)))
+            expire_time = None if self.ttl_seconds is None else time.time() + self.ttl_seconds
+            self._entries[key] = (expire_time, list(results))
+
+    def invalidate(self, host: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == host]:
+                self._entries.pop(key)
+
+    def record(self, resolve_seconds: float, is_ok: bool) -> None:
+        with self._lock:
+            self.n_resolves += 1
+            self.n_errors += 0 if is_ok else 1
+            self.resolve_seconds += resolve_seconds
+            self.max_resolve_seconds = max(self.max_resolve_seconds, resolve_seconds)
+
+    @staticmethod
+    def is_ip_address(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host.strip('[]'))
+            return True
+        except ValueError:
+            return False
+
+    def _resolve(self, key: tuple) -> List[dict]:
+        host, port, family = key
+        t1 = time.time()
+        try:
+            infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+        except OSError:
+            self.record(time.time() - t1, False)
+            raise
+
+        self.record(time.time() - t1, True)
+        results = [{'hostname': host, 'host': address[0], 'port': port, 'family': af, 'proto': proto,
+                    'flags': socket.AI_NUMERICHOST | socket.AI_NUMERICSERV} for af, _, proto, _, address in infos]
+        self.set(key, results)
+        return results
+
+    def resolve(self, host: str, port: int = 0, family: int = socket.AF_UNSPEC) -> List[dict]:
+        """Resolve by the system resolver, in `aiohttp.abc.ResolveResult` format."""
+        key = (host, port, self.get_family(family))
+        results = self.get(key)
+        if results is None:
+            results = self.order(self._flight.do(key, self._resolve, key))
+        return results
+
+    async def _resolve_async(self, key: tuple, resolver: aiohttp.abc.AbstractResolver) -> List[dict]:
+        host, port, family = key
+        t1 = time.time()
+        try:
+            results = await resolver.resolve(host, port, family)
+        except OSError:
+            self.record(time.time() - t1, False)
+            raise
+
+        self.record(time.time() - t1, True)
+        self.set(key, results)
+        return results
+
+    async def resolve_async(self, host: str, port: int, family: int,
+                            resolver: aiohttp.abc.AbstractResolver) -> List[dict]:
+        key = (host, port, self.get_family(family))
+        results = self.get(key)
+        if results is None:
+            results = self.order(await self._async_flight.do(key, self._resolve_async, key, resolver))
+        return results
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                'enabled': self.is_enabled,
+                'entries': len(self._entries),
+                'hits': self.n_hits,
+                'misses': self.n_misses,
+                'resolves': self.n_resolves,
+                'errors': self.n_errors,
+                'resolve_ms_mean': round(1e3 * self.resolve_seconds / self.n_resolves, 2) if self.n_resolves else 0.0,
+                'resolve_ms_max': round(1e3 * self.max_resolve_seconds, 2),
+                'address_preference': self.address_preference,
+            }
+
+
+class CachingResolver(aiohttp.abc.AbstractResolver):
+    def __init__(self, cache: DnsCache):
+        """aiohttp resolver answering from the shared `DnsCache`, and from `aiohttp.DefaultResolver` on misses."""
+        self.cache = cache
+        self.resolver = aiohttp.DefaultResolver()
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[dict]:
+        return await self.cache.resolve_async(host, port, family, self.resolver)
+
+    async def close(self) -> None:
+        await self.resolver.close()
+
+
+class _DnsCachedAdapterMixin:
+    """
+    Connect to the cached addresses of a host in preferred order, instead of resolving it each time. Pools are keyed by
+    address through `build_connection_pool_key_attributes`, the hook `requests` offers for it, with the host kept as
+    `server_hostname` for SNI and certificate matching, and as header Host.
+    """
+    def build_connection_pool_key_attributes(self, request: requests.PreparedRequest, verify: Union[bool, str],
+                                             cert: Union[None, str, Tuple[str, str]] = None) -> Tuple[dict, dict]:
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        address = getattr(request, 'dns_address', None)
+        if address:
+            if host_params['scheme'] == 'https':
+                pool_kwargs['server_hostname'] = host_params['host']
+            host_params['host'] = address
+        return host_params, pool_kwargs
+
+    @staticmethod
+    def is_connect_error(error: requests.exceptions.ConnectionError) -> bool:
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, urllib3.exceptions.ConnectTimeoutError)  # incl. NewConnectionError.
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None,
+             verify: Union[bool, str] = True, cert=None, proxies: Optional[dict] = None) -> requests.Response:
+        send = functools.partial(super().send, request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                 proxies=proxies)
+        url = urllib3.util.parse_url(request.url)
+        if not dns_cache.is_enabled or not url.host or dns_cache.is_ip_address(url.host) \
+                or requests.utils.select_proxy(request.url, proxies or {}):
+            return send()
+
+        try:
+            results = dns_cache.resolve(url.host, url.port or (443 if url.scheme == 'https' else 80))
+        except OSError:
+            return send()  # raises the usual ConnectionError.
+
+        is_host_added = 'Host' not in request.headers
+        if is_host_added:
+            request.headers['Host'] = url.netloc
+        try:
+            error = None
+            for result in results:
+                request.dns_address = result['host']
+                try:
+                    return send()
+                except requests.exceptions.ConnectionError as e:
+                    if not self.is_connect_error(e):
+                        raise
+                    error = e
+        finally:
+            request.dns_address = None  # for this send only, redirects copy the request.
+            if is_host_added:
+                del request.headers['Host']
+
+        dns_cache.invalidate(url.host)
+        if error is None:
+            return send()
+        raise error
+
+
+class DnsCachedHTTPAdapter(_DnsCachedAdapterMixin, requests.adapters.HTTPAdapter):
+    pass
+
+
+class DnsCachedCipherSuiteAdapter(_DnsCachedAdapterMixin, cloudscraper.CipherSuiteAdapter):
+    pass
+
+
+class Transport:
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 64, max_retries: int = 2,
+                 backoff_factor: float = 0.2, retry_status_list: Tuple[int, ...] = ()):
+        """
+        Connection pool and retry settings of the sessions of sync translators.
+        The default pool of `requests`(10 connections) makes threads wait for each other when one translator is used by
+        many threads, so `pool_maxsize` should be at least the number of threads.
+        :param pool_connections: int, default 10. Number of hosts whose connection pools are kept.
+        :param pool_maxsize: int, default 64. Max connections kept to one host.
+        :param max_retries: int, default 2. Retries of failed connections(and of `retry_status_list`).
+        :param backoff_factor: float, default 0.2.
+        :param retry_status_list: Tuple[int, ...], default (). eg: (429, 502, 503, 504).
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.retry_status_list = retry_status_list
+        self.happy_eyeballs_delay: Optional[float] = 0.25
+        self.http2_names = set()
+        self.http_versions = collections.Counter()
+        self.n_sessions = 0
+
+    def configure(self, pool_connections: int = 10, pool_maxsize: int = 64, max_retries: int = 2,
+                  backoff_factor: float = 0.2, retry_status_list: Tuple[int, ...] = ()) -> None:
+        """Takes effect on sessions created afterwards, eg: when translators refresh."""
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.retry_status_list = retry_status_list
+
+    def get_retry(self) -> requests.adapters.Retry:
+        return requests.adapters.Retry(total=self.max_retries, connect=self.max_retries, read=0,
+                                       status=self.max_retries if self.retry_status_list else 0,
+                                       status_forcelist=self.retry_status_list, allowed_methods=None,
+                                       backoff_factor=self.backoff_factor, raise_on_status=False)
+
+    def configure_dns(self, happy_eyeballs_delay: Optional[float] = 0.25) -> None:
+        """
+        Happy eyeballs(connecting to IPv6 and IPv4 addresses in parallel) is done by `niquests` only, other clients try
+        the addresses of `dns_cache` one after another, in preferred order. None disables it.
+        """
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+
+    def get_adapter(self, adapter: Optional[requests.adapters.BaseAdapter] = None) -> requests.adapters.HTTPAdapter:
+        """An adapter sized by the settings, connecting by `dns_cache`, in place of `adapter` of a new session."""
+        kwargs = {'pool_connections': self.pool_connections, 'pool_maxsize': self.pool_maxsize,
+                  'max_retries': self.get_retry()}
+        if isinstance(adapter, cloudscraper.CipherSuiteAdapter):  # keep cloudscraper's cipher suite.
+            return DnsCachedCipherSuiteAdapter(ssl_context=adapter.ssl_context, source_address=adapter.source_address,
+                                               **kwargs)
+        return DnsCachedHTTPAdapter(**kwargs)
+
+    def mount_adapters(self, session: requests.Session) -> requests.Session:
+        """Mount adapters sized by the settings and connecting by `dns_cache` on a new session."""
+        for prefix, adapter in list(session.adapters.items()):
+            if isinstance(adapter, requests.adapters.HTTPAdapter):
+                session.mount(prefix, self.get_adapter(adapter))
+                adapter.close()
+        return session
+
+    def get_niquests_session(self, proxies: dict) -> niquests.Session:
+        session = niquests.Session(happy_eyeballs=self.happy_eyeballs_delay is not None,
+                                   disable_ipv4=dns_cache.address_preference == 'ipv6_only',
+                                   disable_ipv6=dns_cache.address_preference == 'ipv4_only',
+                                   pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                                   retries=self.get_retry())
+        session.proxies = proxies
+        return session
+
+    def get_httpx_transport(self, proxies: dict, http2: bool = False) -> httpx.HTTPTransport:
+        proxy_url = proxies.get('http') or proxies.get('https')
+        limits = httpx.Limits(max_connections=self.pool_maxsize * self.pool_connections,
+                              max_keepalive_connections=self.pool_maxsize)
+        local_address = {'ipv4_only': '0.0.0.0', 'ipv6_only': '::'}.get(dns_cache.address_preference)
+        return httpx.HTTPTransport(proxy=proxy_url, limits=limits, retries=self.max_retries, http2=http2,
+                                   local_address=local_address)
+
+    def set_http2(self, names: Iterable[str], is_enabled: bool = True) -> None:
+        """Enable or disable HTTP/2 mode of translators by class name, eg: 'GoogleV2'."""
+        self.http2_names = self.http2_names | set(names) if is_enabled else self.http2_names - set(names)
+
+    def record_http_version(self, response: httpx.Response) -> None:
+        self.http_versions[response.http_version] += 1
+
+    def get_http2_session(self, http_client: str, proxies: dict) -> SessionType:
+        """
+        HTTP/2 multiplexes the requests of all threads over one connection per host. Servers not negotiating h2 by
+        ALPN are spoken to in HTTP/1.1. `cloudscraper` stays HTTP/1.1, `niquests` is used without package `h2`.
+        """
+        if http_client in ('requests', 'httpx') and is_http2_available():
+            return httpx.Client(follow_redirects=True, transport=self.get_httpx_transport(proxies, http2=True),
+                                event_hooks={'response': [self.record_http_version]})
+
+        if http_client != 'niquests':
+            warn_http2_unavailable('niquests')
+        return self.get_niquests_session(proxies)
+
+    def get_session(self, http_client: str = 'requests', proxies: Optional[dict] = None,
+                    name: Optional[str] = None) -> SessionType:
+        if proxies is None:
+            proxies = {}
+
+        if name in self.http2_names and http_client != 'cloudscraper':
+            session = self.get_http2_session(http_client, proxies)
+        elif http_client == 'requests':
+            session = self.mount_adapters(requests.Session())
+            session.proxies = proxies
+        elif http_client == 'niquests':
+            session = self.get_niquests_session(proxies)
+        elif http_client == 'httpx':
+            session = httpx.Client(follow_redirects=True, transport=self.get_httpx_transport(proxies))
+        else:
+            session = self.mount_adapters(cloudscraper.create_scraper())
+            session.proxies = proxies
+        self.n_sessions += 1
+        return session
+
+    def info(self) -> dict:
+        return {'pool_connections': self.pool_connections, 'pool_maxsize': self.pool_maxsize,
+                'max_retries': self.max_retries, 'sessions_created': self.n_sessions,
+                'http2': sorted(self.http2_names), 'http_versions': dict(self.http_versions),
+                'happy_eyeballs_delay': self.happy_eyeballs_delay, 'dns': dns_cache.info()}
+
+
+class Http2CookieJar:
+    def __init__(self, cookies: httpx.Cookies):
+        """The part of `aiohttp.CookieJar` used by translators, over the cookies of an httpx client."""
+        self.cookies = cookies
+
+    def __iter__(self):
+        return iter(self._to_morsels(self.cookies.jar).values())
+
+    def __len__(self) -> int:
+        return len(self.cookies.jar)
+
+    @staticmethod
+    def _to_morsels(cookies: Iterable) -> http.cookies.SimpleCookie:
+        simple_cookie = http.cookies.SimpleCookie()
+        for cookie in cookies:
+            simple_cookie[cookie.name] = cookie.value
+        return simple_cookie
+
+    def update_cookies(self, cookies: dict, response_url: Optional[yarl.URL] = None) -> None:
+        for name, value in cookies.items():
+            self.cookies.set(name, value.value if isinstance(value, http.cookies.Morsel) else value)
+
+    def filter_cookies(self, request_url: yarl.URL) -> http.cookies.SimpleCookie:
+        host = yarl.URL(request_url).host or ''
+        return self._to_morsels(cookie for cookie in self.cookies.jar if not cookie.domain
+                                or host == cookie.domain.lstrip('.') or host.endswith('.' + cookie.domain.lstrip('.')))
+
+    def clear(self) -> None:
+        self.cookies.clear()
+
+
+class Http2Response:
+    def __init__(self, response: httpx.Response):
+        """The part of `aiohttp.ClientResponse` used by translators, over an httpx response."""
+        self.response = response
+        self.status = response.status_code
+        self.headers = response.headers
+        self.url = yarl.URL(str(response.url))
+        self.http_version = response.http_version
+
+    async def read(self) -> bytes:
+        return self.response.content
+
+    async def text(self, encoding: Optional[str] = None) -> str:
+        return self.response.content.decode(encoding) if encoding else self.response.text
+
+    async def json(self, content_type: Optional[str] = 'application/json', **kwargs):
+        return self.response.json(**kwargs)
+
+    def raise_for_status(self) -> None:
+        self.response.raise_for_status()
+
+    def release(self) -> None:
+        pass
+
+
+class _Http2RequestContext:
+    def __init__(self, coro):
+        self._coro = coro
+        self._response: Optional[Http2Response] = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self) -> Http2Response:
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+class Http2AsyncSession:
+    def __init__(self, http_transport: httpx.AsyncHTTPTransport, on_response=None):
+        """
+        The part of `aiohttp.ClientSession` used by translators, speaking HTTP/2 by httpx. Concurrent requests to one
+        host are multiplexed over one connection of `http_transport`, which is shared and not closed by the session.
+        """
+        self.client = httpx.AsyncClient(transport=http_transport, follow_redirects=True)
+        self.cookie_jar = Http2CookieJar(self.client.cookies)
+        self.on_response = on_response
+        self.closed = False
+
+    async def _request(self, method: str, url: str, data=None, **kwargs) -> Http2Response:
+        if self.closed:
+            raise RuntimeError('Session is closed')
+        if isinstance(data, (str, bytes)):
+            kwargs['content'] = data
+        elif data is not None:
+            kwargs['data'] = data
+        if isinstance(kwargs.get('timeout'), aiohttp.ClientTimeout):
+            kwargs['timeout'] = kwargs['timeout'].total
+        kwargs.pop('allow_redirects', None)
+        response = await self.client.request(method, str(url), **kwargs)
+        if self.on_response:
+            self.on_response(response)
+        return Http2Response(response)
+
+    def request(self, method: str, url: str, **kwargs) -> _Http2RequestContext:
+        return _Http2RequestContext(self._request(method, url, **kwargs))
+
+    def get(self, url: str, **kwargs) -> _Http2RequestContext:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _Http2RequestContext:
+        return self.request('POST', url, **kwargs)
+
+    def options(self, url: str, **kwargs) -> _Http2RequestContext:
+        return self.request('OPTIONS', url, **kwargs)
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def __aenter__(self) -> 'Http2AsyncSession':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+
+class AsyncTransport:
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30.0,
+                 ttl_dns_cache: Optional[int] = 300, if_use_dns_cache: bool = True):
+        """
+        Shared aiohttp transport of async translators: one `TCPConnector`(connection pool, keep-alive, dns cache) per
+        translator per event loop, reused by every session the translator creates when it refreshes.
+        Sessions do not own the connector, so a refresh closes the old session without closing warm connections.
+        :param limit: int, default 100. Max connections of one translator.
+        :param limit_per_host: int, default 10. Max connections of one translator to one host.
+        :param keepalive_timeout: float, default 30.0.
+        :param ttl_dns_cache: Optional[int], default 300. None means dns cache never expires. Of the `dns_cache`
+                shared by all translators.
+        :param if_use_dns_cache: bool, default True.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.if_use_dns_cache = if_use_dns_cache
+        self.happy_eyeballs_delay: Optional[float] = 0.25
+        self.http2_names = set()
+        self.http_versions = collections.Counter()
+        self.n_sessions = 0
+        self.n_connectors = 0
+        self._connectors = {}
+        self._http2_pools = {}
+        self._sessions = {}
+        self._closing = set()
+
+    def configure(self, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30.0,
+                  ttl_dns_cache: Optional[int] = 300, if_use_dns_cache: bool = True) -> None:
+        """Takes effect on connectors created afterwards, eg: after `aclose()`."""
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.if_use_dns_cache = if_use_dns_cache
+        dns_cache.ttl_seconds = ttl_dns_cache
+
+    def configure_dns(self, happy_eyeballs_delay: Optional[float] = 0.25) -> None:
+        """
+        Seconds before connecting to the next address of a host in parallel, alternating IPv6 and IPv4 from the
+        preferred family of `dns_cache`. None disables happy eyeballs. Takes effect after `aclose()`.
+        """
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+
+    @staticmethod
+    def get_proxy_url(proxies: Optional[dict] = None) -> Optional[str]:
+        if not proxies:
+            return None
+        return proxies.get('https') or proxies.get('http')
+
+    def get_connector(self, name: str) -> aiohttp.TCPConnector:
+        loop = asyncio.get_running_loop()
+        key = (id(loop), name)
+        item = self._connectors.get(key)
+        if item and item[0] is loop and not item[1].closed:
+            return item[1]
+
+        family = dns_cache.get_family(socket.AF_UNSPEC)
+        resolver = CachingResolver(dns_cache) if self.if_use_dns_cache and dns_cache.is_enabled else None
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                         keepalive_timeout=self.keepalive_timeout, use_dns_cache=False,
+                                         resolver=resolver, family=family,
+                                         happy_eyeballs_delay=self.happy_eyeballs_delay)
+        self._connectors[key] = (loop, connector)
+        self.n_connectors += 1
+        return connector
+
+    def set_http2(self, names: Iterable[str], is_enabled: bool = True) -> None:
+        """Enable or disable HTTP/2 mode of translators by class name, eg: 'GoogleV2'."""
+        self.http2_names = self.http2_names | set(names) if is_enabled else self.http2_names - set(names)
+
+    def record_http_version(self, response: httpx.Response) -> None:
+        self.http_versions[response.http_version] += 1
+
+    def get_http2_pool(self, name: str, proxies: Optional[dict] = None) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        proxy_url = self.get_proxy_url(proxies)
+        key = (id(loop), name, proxy_url)
+        item = self._http2_pools.get(key)
+        if item and item[0] is loop:
+            return item[1]
+
+        limits = httpx.Limits(max_connections=self.limit, max_keepalive_connections=self.limit_per_host,
+                              keepalive_expiry=self.keepalive_timeout)
+        pool = httpx.AsyncHTTPTransport(http2=True, limits=limits, proxy=proxy_url)
+        self._http2_pools[key] = (loop, pool)
+        self.n_connectors += 1
+        return pool
+
+    def get_session(self, name: str, proxies: Optional[dict] = None) -> Union[aiohttp.ClientSession, Http2AsyncSession]:
+        """
+        HTTP/2 mode falls back to aiohttp(HTTP/1.1) without package `h2`, and httpx speaks HTTP/1.1 to servers not
+        negotiating h2 by ALPN.
+        """
+        loop = asyncio.get_running_loop()
+        if name in self.http2_names and not is_http2_available():
+            self.http2_names = self.http2_names - {name}
+            warn_http2_unavailable('aiohttp')
+
+        if name in self.http2_names:
+            session = Http2AsyncSession(self.get_http2_pool(name, proxies), on_response=self.record_http_version)
+        else:
+            session = aiohttp.ClientSession(connector=self.get_connector(name), connector_owner=False,
+                                            proxy=self.get_proxy_url(proxies))
+        self._sessions.setdefault(id(loop), weakref.WeakSet()).add(session)
+        self.n_sessions += 1
+        return session
+
+    def discard(self, session: Optional[Union[aiohttp.ClientSession, Http2AsyncSession]]) -> None:
+        """Close a session replaced by a refresh. Its connector stays open for the new session."""
+        if session is None or session.closed:
+            return
+
+        task = asyncio.get_running_loop().create_task(session.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        """Close all sessions and connectors of the running event loop."""
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions.pop(id(loop), ())
+        await asyncio.gather(*[session.close() for session in list(sessions) if not session.closed])
+        if self._closing:
+            await asyncio.gather(*list(self._closing), return_exceptions=True)
+
+        keys = [key for key, item in self._connectors.items() if item[0] is loop]
+        await asyncio.gather(*[self._connectors.pop(key)[1].close() for key in keys])
+        keys = [key for key, item in self._http2_pools.items() if item[0] is loop]
+        await asyncio.gather(*[self._http2_pools.pop(key)[1].aclose() for key in keys])
+
+    def info(self) -> dict:
+        return {
+            'connectors': sum(1 for _, connector in self._connectors.values() if not connector.closed)
+                          + len(self._http2_pools),
+            'sessions': sum(1 for sessions in self._sessions.values() for session in sessions if not session.closed),
+            'connectors_created': self.n_connectors,
+            'sessions_created': self.n_sessions,
+            'http2': sorted(self.http2_names),
+            'http_versions': dict(self.http_versions),
+            'happy_eyeballs_delay': self.happy_eyeballs_delay,
+            'dns': dns_cache.info(),
+        }
+
+
+class EndpointSelector:
+    def __init__(self, probe_interval_seconds: float = 300.0, min_success_rate: float = 0.5, ewma_alpha: float = 0.3,
+                 probe_timeout: float = 5.0):
+        """
+        Choose the host of multi-host translators(eg: www.bing.com or cn.bing.com) by measurement instead of region:
+        round-trip time and success rate of each candidate, from probes every `probe_interval_seconds` and from real
+        requests. The fastest healthy host is chosen, and a chosen host whose success rate falls below
+        `min_success_rate` is failed over. Keyed by class name of translator, disabled until candidates are set.
+        :param probe_interval_seconds: float, default 300.
+        :param min_success_rate: float, default 0.5.
+        :param ewma_alpha: float, default 0.3. Weight of the newest measurement.
+        :param probe_timeout: float, default 5.
+        """
+        self.probe_interval_seconds = probe_interval_seconds
+        self.min_success_rate = min_success_rate
+        self.ewma_alpha = ewma_alpha
+        self.probe_timeout = probe_timeout
+        self.n_failovers = 0
+        self._candidates: Dict[str, List[str]] = {}
+        self._stats: Dict[str, dict] = {}
+        self._chosen: Dict[str, str] = {}
+        self._probed_at: Dict[str, float] = {}
+        self._probing = set()
+        self._tasks = set()
+        self._lock = threading.Lock()
+
+    def configure(self, probe_interval_seconds: float = 300.0, min_success_rate: float = 0.5, ewma_alpha: float = 0.3,
+                  probe_timeout: float = 5.0) -> None:
+        self.probe_interval_seconds = probe_interval_seconds
+        self.min_success_rate = min_success_rate
+        self.ewma_alpha = ewma_alpha
+        self.probe_timeout = probe_timeout
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update({'_probing': set(), '_tasks': set(), '_lock': None})
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def set_candidates(self, name: str, host_urls: Optional[List[str]]) -> None:
+        """None or fewer than 2 host urls disable the selection of the translator."""
+        with self._lock:
+            if host_urls and len(host_urls) > 1:
+                self._candidates[name] = [url.strip('/') for url in host_urls]
+            else:
+                self._candidates.pop(name, None)
+                self._chosen.pop(name, None)
+
+    def get_candidates(self, name: str) -> List[str]:
+        return self._candidates.get(name, [])
+
+    def record(self, host_url: str, rtt_seconds: Optional[float], is_ok: bool) -> None:
+        with self._lock:
+            stats = self._stats.get(host_url)
+            if stats is None:
+                stats = self._stats[host_url] = {'rtt': rtt_seconds, 'success_rate': float(is_ok), 'n': 0}
+            a = self.ewma_alpha
+            stats['success_rate'] = (1 - a) * stats['success_rate'] + a * float(is_ok)
+            if is_ok and rtt_seconds is not None:
+                stats['rtt'] = rtt_seconds if stats['rtt'] is None else (1 - a) * stats['rtt'] + a * rtt_seconds
+            stats['n'] += 1
+
+    def observe(self, translator, elapsed_seconds: float, is_ok: bool) -> None:
+        """Record a real request of a translator on its current host."""
+        host_url = getattr(translator, 'host_url', None)
+        if host_url and host_url in self.get_candidates(type(translator).__name__):
+            self.record(host_url, elapsed_seconds, is_ok)
+
+    def _is_probe_due(self, name: str) -> bool:
+        return name not in self._probing and time.time() - self._probed_at.get(name, 0) >= self.probe_interval_seconds
+
+    def probe(self, name: str) -> None:
+        with self._lock:
+            self._probing.add(name)
+        try:
+            session = requests.Session()
+            for host_url in self.get_candidates(name):
+                t1 = time.time()
+                try:
+                    r = session.head(host_url, timeout=self.probe_timeout, allow_redirects=False)
+                    self.record(host_url, time.time() - t1, r.status_code < 500)
+                except Exception:
+                    self.record(host_url, None, False)
+            session.close()
+        finally:
+            with self._lock:
+                self._probed_at[name] = time.time()
+                self._probing.discard(name)
+
+    async def probe_async(self, name: str) -> None:
+        with self._lock:
+            self._probing.add(name)
+        try:
+            async with aiohttp.ClientSession() as session:
+                for host_url in self.get_candidates(name):
+                    t1 = time.time()
+                    try:
+                        async with session.head(host_url, timeout=aiohttp.ClientTimeout(total=self.probe_timeout),
+                                                allow_redirects=False) as r:
+                            self.record(host_url, time.time() - t1, r.status < 500)
+                    except Exception:
+                        self.record(host_url, None, False)
+        finally:
+            with self._lock:
+                self._probed_at[name] = time.time()
+                self._probing.discard(name)
+
+    def _probe_in_background(self, name: str, is_async: bool) -> None:
+        with self._lock:
+            self._probing.add(name)
+        if is_async:
+            task = asyncio.get_running_loop().create_task(self.probe_async(name))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            threading.Thread(target=self.probe, args=(name,), name='translators-probe', daemon=True).start()
+
+    def _score(self, host_url: str) -> tuple:
+        stats = self._stats.get(host_url)
+        if stats is None:
+            return 1, 0.0  # unmeasured, after measured healthy hosts.
+        if stats['success_rate'] >= self.min_success_rate and stats['rtt'] is not None:
+            return 0, stats['rtt']
+        return 2, -stats['success_rate']
+
+    def select(self, name: str, default_host_url: str, is_async: bool = False) -> str:
+        """Return the host url to use, and probe the candidates in background when due. Never blocks on probes."""
+        candidates = self.get_candidates(name)
+        if not candidates:
+            return default_host_url
+        if self._is_probe_due(name):
+            self._probe_in_background(name, is_async)
+
+        ranked = sorted(candidates, key=lambda url: (self._score(url), url != default_host_url))
+        host_url = ranked[0]
+        with self._lock:
+            previous_host_url = self._chosen.get(name)
+            if previous_host_url and previous_host_url != host_url:
+                self.n_failovers += 1
+            self._chosen[name] = host_url
+        return host_url
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                'chosen': dict(self._chosen),
+                'hosts': {url: {'rtt': None if stats['rtt'] is None else round(stats['rtt'], 3),
+                                'success_rate': round(stats['success_rate'], 3), 'n': stats['n']}
+                          for url, stats in self._stats.items()},
+                'failovers': self.n_failovers,
+            }
+
+
+class TextScanner:
+    def __init__(self, patterns: Optional[Tuple[str, ...]], encoding: Optional[str] = None):
+        """
+        Decode a response body chunk by chunk, until every one of `patterns` is found in the text read so far.
+        None means reading all of it, and () means reading none of it, eg: a request only sending cookies.
+        """
+        self.patterns = None if patterns is None else [re.compile(pattern) for pattern in patterns]
+        self.decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        self.text = ''
+        self.n_bytes = 0
+
+    def is_done(self) -> bool:
+        if self.patterns is None:
+            return False
+        self.patterns = [pattern for pattern in self.patterns if not pattern.search(self.text)]
+        return not self.patterns
+
+    def feed(self, chunk: bytes) -> bool:
+        self.n_bytes += len(chunk)
+        self.text += self.decoder.decode(chunk)
+        return self.is_done()
+
+    def close(self) -> str:
+        self.text += self.decoder.decode(b'', final=True)
+        return self.text
+
+
+class StreamStats:
+    def __init__(self):
+        """Bytes of host pages read, and bytes saved by stopping once the needed tokens are found, per translator."""
+        self._stats = {}
+        self._full_sizes = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, url: str, n_bytes: int, is_stopped: bool, full_size: Optional[int] = None) -> None:
+        """Without `full_size`(Content-Length of an uncompressed body), the last complete read of `url` is used."""
+        with self._lock:
+            stats = self._stats.setdefault(name, {'requests': 0, 'stopped': 0, 'bytes_read': 0, 'bytes_saved': 0})
+            stats['requests'] += 1
+            stats['bytes_read'] += n_bytes
+            if not is_stopped:
+                self._full_sizes[url] = n_bytes
+                return
+
+            stats['stopped'] += 1
+            full_size = full_size or self._full_sizes.get(url)
+            if full_size:
+                stats['bytes_saved'] += max(0, full_size - n_bytes)
+
+    def info(self, name: Optional[str] = None) -> dict:
+        with self._lock:
+            if name is not None:
+                return dict(self._stats.get(name, {}))
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._full_sizes.clear()
+
+
+def get_full_size(headers) -> Optional[int]:
+    """Size of the decoded body, known from Content-Length only when it is not compressed."""
+    content_length = headers.get('Content-Length')
+    if content_length and content_length.isdigit() and headers.get('Content-Encoding', 'identity') == 'identity':
+        return int(content_length)
+    return None
+
+
+def read_text_until(session: SessionType, url: str, headers: dict, timeout: Optional[float],
+                    patterns: Optional[Tuple[str, ...]] = None,
+                    chunk_size: int = 16384) -> Tuple[str, int, bool, Optional[int]]:
+    """
+    GET `url` streaming, and close the connection once every one of `patterns` is found, instead of downloading the
+    whole page. Return the text read, its size in bytes, whether it stopped early, and the full size if known.
+    """
+    headers = {'Accept-Encoding': get_accept_encoding(), **headers}
+    if isinstance(session, httpx.Client):
+        r = session.send(session.build_request('GET', url, headers=headers, timeout=timeout), stream=True)
+        chunks = r.iter_bytes(chunk_size)
+    else:
+        r = session.get(url, headers=headers, timeout=timeout, stream=True)
+        chunks = r.iter_content(chunk_size)
+
+    try:
+        scanner = TextScanner(patterns, r.encoding)
+        is_stopped = scanner.is_done()
+        if not is_stopped:
+            for chunk in chunks:
+                if scanner.feed(chunk):
+                    is_stopped = True
+                    break
+        return scanner.text if is_stopped else scanner.close(), scanner.n_bytes, is_stopped, get_full_size(r.headers)
+    finally:
+        r.close()
+
+
+async def read_text_until_async(session, url: str, headers: dict, timeout: Optional[float],
+                                patterns: Optional[Tuple[str, ...]] = None,
+                                chunk_size: int = 16384) -> Tuple[str, int, bool, Optional[int]]:
+    """Async `read_text_until`. Sessions of HTTP/2 mode read whole responses, and never stop early."""
+    headers = {'Accept-Encoding': get_accept_encoding(), **headers}
+    async with session.get(url, headers=headers, timeout=timeout) as r:
+        if not isinstance(getattr(r, 'content', None), aiohttp.StreamReader):
+            body = await r.read()
+            return await r.text(), len(body), False, None
+
+        scanner = TextScanner(patterns, r.charset)
+        is_stopped = scanner.is_done()
+        if not is_stopped:
+            async for chunk in r.content.iter_chunked(chunk_size):
+                if scanner.feed(chunk):
+                    is_stopped = True
+                    break
+        return scanner.text if is_stopped else scanner.close(), scanner.n_bytes, is_stopped, get_full_size(r.headers)
+
+
+dns_cache = DnsCache()
+transport = Transport()
+async_transport = AsyncTransport()
+endpoint_selector = EndpointSelector()
+stream_stats = StreamStats()